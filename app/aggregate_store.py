@@ -0,0 +1,133 @@
+"""
+대시보드 집계 사전 계산 저장소
+precompute.py가 모든 이동번호의 대시보드 쿼리(배치 결과 리포트/제약조건 분석 집계) 결과를 미리 조회해
+이동번호별 gzip JSON 파일로 저장하고, query_rows()는 메모리 캐시 다음으로 이 저장소를 먼저 확인
+- 파일: {dir}/agg_{이동번호}.json.gz — 계산 시점의 변경 감지 서명(change_probe)과 쿼리별 바인드/결과 행
+- 변경 감지가 켜져 있으면 현재 서명과 같을 때만, 꺼져 있으면 max_age_sec 이내일 때만 사용
+"""
+import datetime
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+
+from change_probe import current_signature
+from config import PRECOMPUTE_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# 저장 형식 버전 (쿼리 결과 형식이 바뀌면 올려서 이전 파일을 무시하게 함)
+STORE_VERSION = 1
+
+
+def sql_key(sql: str) -> str:
+    """공백 차이를 무시한 SQL 식별자"""
+    return hashlib.sha1(re.sub(r"\s+", " ", sql).strip().encode("utf-8")).hexdigest()[:16]
+
+
+def _normalize_signature(signature) -> dict | None:
+    """JSON 왕복으로 list가 된 (scn, count)를 tuple로 맞춤"""
+    if signature is None:
+        return None
+    return {table: tuple(value) for table, value in signature.items()}
+
+
+class AggregateStore:
+    """이동번호별 사전 계산 결과 파일 저장소 (thread-safe)"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._lock = threading.Lock()
+
+    def _path(self, move_std_id) -> str:
+        return os.path.join(self.directory, f"agg_{int(move_std_id)}.json.gz")
+
+    def load(self, move_std_id) -> dict | None:
+        """저장된 사전 계산 결과 (없거나 버전이 다르면 None)"""
+        path = self._path(move_std_id)
+        if not os.path.exists(path):
+            return None
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                stored = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"사전 계산 결과 로드 실패 ({path}): {e}")
+            return None
+        if stored.get("version") != STORE_VERSION:
+            return None
+        stored["signature"] = _normalize_signature(stored.get("signature"))
+        return stored
+
+    def put(self, move_std_id, signature: dict | None, entries: dict):
+        """
+        이동번호의 사전 계산 결과 저장 (기존 파일 교체)
+
+        entries: {sql_key: {"name": 쿼리 이름, "params": 바인드, "rows": 결과 행, "elapsed_ms": 실행 시간}}
+        """
+        path = self._path(move_std_id)
+        stored = {
+            "version": STORE_VERSION,
+            "created_at": datetime.datetime.now().isoformat(timespec="seconds"),
+            "created_ts": time.time(),
+            "signature": signature,
+            "entries": entries,
+        }
+        with self._lock:
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                tmp_path = f"{path}.tmp"
+                with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+                    json.dump(stored, f, ensure_ascii=False)
+                os.replace(tmp_path, path)
+            except (OSError, TypeError) as e:
+                logger.warning(f"사전 계산 결과 저장 실패 ({path}): {e}")
+
+    def stats(self) -> dict:
+        """저장된 이동번호 수와 전체 크기(bytes)"""
+        if not os.path.isdir(self.directory):
+            return {"moves": 0, "bytes": 0}
+        files = [f for f in os.listdir(self.directory) if f.startswith("agg_") and f.endswith(".json.gz")]
+        size = sum(os.path.getsize(os.path.join(self.directory, f)) for f in files)
+        return {"moves": len(files), "bytes": size}
+
+
+_store = AggregateStore(PRECOMPUTE_CONFIG["dir"])
+
+
+def _is_current(stored: dict, move_std_id) -> bool:
+    """저장 결과가 지금 데이터와 같은지 (변경 감지 서명 비교, 감지가 꺼져 있으면 저장 시각 기준)"""
+    signature = current_signature(move_std_id)
+    if signature is not None:
+        return stored["signature"] == signature
+    return time.time() - stored.get("created_ts", 0) <= PRECOMPUTE_CONFIG["max_age_sec"]
+
+
+def precomputed_rows(move_std_id, sql: str, params: dict) -> list[tuple] | None:
+    """사전 계산된 쿼리 결과 (비활성화, 미계산, 바인드 불일치, 데이터 변경 시 None)"""
+    if not PRECOMPUTE_CONFIG["enabled"]:
+        return None
+    stored = _store.load(move_std_id)
+    if stored is None or not _is_current(stored, move_std_id):
+        return None
+    entry = stored["entries"].get(sql_key(sql))
+    if entry is None or entry["params"] != params:
+        return None
+    return [tuple(row) for row in entry["rows"]]
+
+
+def stored_signature(move_std_id) -> dict | None:
+    """마지막 사전 계산 시점의 변경 감지 서명 (미계산이면 None)"""
+    stored = _store.load(move_std_id)
+    return stored["signature"] if stored else None
+
+
+def save_precomputed(move_std_id, signature: dict | None, entries: dict):
+    _store.put(move_std_id, signature, entries)
+
+
+def get_precompute_stats() -> dict:
+    return _store.stats()
@@ -2,96 +2,83 @@
 HR Text2SQL Dashboard — Premium SaaS-style UI
 자연어로 Oracle HR DB에 질의하는 웹 인터페이스
 실행: python app.py
+      python app.py --prewarm-snapshots   (마감된 이동번호 리포트 스냅샷 미리 생성)
 """
+import asyncio
 import os
+import sys
+import time
 import datetime
 import re
-import tempfile
 import threading
 import concurrent.futures
-import html as _html_mod
 
 import gradio as gr
 import pandas as pd
 
-from text2sql_pipeline import generate_sql, execute_sql, generate_report, get_report_llm
-from config import GRADIO_HOST, GRADIO_PORT, DEFAULT_MODEL_KEY, MODEL_REGISTRY, TARGET_TABLES
+from text2sql_pipeline import (
+    agenerate_sql_stream, aexecute_sql, agenerate_report, get_report_llm, start_schema_refresher,
+    open_result_pages, afetch_page, acount_rows, export_result,
+    get_result_frame, release_result, release_session_results, get_session_result_usage,
+)
+from config import (
+    GRADIO_HOST, GRADIO_PORT, DEFAULT_MODEL_KEY, MODEL_REGISTRY, TARGET_TABLES, DASHBOARD_CONFIG, MOVE_CATALOG_CONFIG,
+    PAGING_CONFIG,
+)
 from model_registry import get_display_choices, get_available_models
+from db_pool import call_deadline
+from dashboard_data import fetch_cnst_summary, fetch_move_aggregates, fetch_penalty_facts
+from move_std import (
+    get_close_status, get_move_choices, get_move_catalog_version, get_move_stats,
+    refresh_move_catalog, start_move_catalog_refresher,
+)
+from report_snapshot import snapshot_key, load_report_snapshot, save_report_snapshot
+from change_probe import start_change_probe
+from result_export import available_formats as available_export_formats
+from frame_compact import compact_frame
+from table_render import render_cnst_table, render_result_grid, render_result_table
 from langchain_core.messages import HumanMessage, SystemMessage
 
 
-def _get_move_std_choices():
-    """DB에서 이동번호 목록을 조회하여 Dropdown choices 반환"""
-    try:
-        import oracledb
-        from config import DB_CONFIG
-        with oracledb.connect(
-            user=DB_CONFIG["user"],
-            password=DB_CONFIG["password"],
-            dsn=oracledb.makedsn(DB_CONFIG["host"], DB_CONFIG["port"], sid=DB_CONFIG["sid"])
-        ) as conn:
-            with conn.cursor() as cur:
-                cur.execute("""
-                    SELECT FTR_MOVE_STD_ID, STD_NM
-                    FROM HRAI_CON.FTR_MOVE_STD
-                    ORDER BY FTR_MOVE_STD_ID DESC
-                """)
-                choices = []
-                for row in cur.fetchall():
-                    ftr_id = int(row[0]) if row[0] is not None else 0
-                    std_nm = row[1] or str(ftr_id)
-                    label = f"{ftr_id} - {std_nm}"
-                    choices.append((label, str(ftr_id)))
-        if not choices:
-            choices = [("(이동번호 없음)", "0")]
-        return choices
-    except Exception as e:
-        print(f"이동번호 조회 실패: {e}")
-        return [("(DB 연결 실패)", "0")]
-
-
 def _get_move_std_stats(move_std_id):
-    """이동번호 선택 시 해당 이동의 핵심 통계를 조회하여 HTML로 반환"""
+    """이동번호 선택 시 해당 이동의 핵심 통계를 HTML로 반환 (통계는 카탈로그에서 TTL 캐시)"""
     if not move_std_id or move_std_id == "0":
         return ""
     try:
-        import oracledb
-        from config import DB_CONFIG
-        mid = int(move_std_id)
-        with oracledb.connect(
-            user=DB_CONFIG["user"],
-            password=DB_CONFIG["password"],
-            dsn=oracledb.makedsn(DB_CONFIG["host"], DB_CONFIG["port"], sid=DB_CONFIG["sid"])
-        ) as conn:
-            with conn.cursor() as cur:
-                cur.execute("""
-                    SELECT
-                        (SELECT COUNT(*) FROM HRAI_CON.move_item_master WHERE ftr_move_std_id = :mid) AS emp_cnt,
-                        (SELECT COUNT(*) FROM HRAI_CON.move_org_master WHERE ftr_move_std_id = :mid) AS org_cnt,
-                        (SELECT COUNT(*) FROM HRAI_CON.move_case_master WHERE ftr_move_std_id = :mid) AS case_cnt,
-                        (SELECT COUNT(*) FROM HRAI_CON.move_item_master WHERE ftr_move_std_id = :mid AND must_move_yn = 1) AS must_move,
-                        (SELECT COUNT(*) FROM HRAI_CON.move_item_master WHERE ftr_move_std_id = :mid AND must_stay_yn = 1) AS must_stay
-                    FROM dual
-                """, {"mid": mid})
-                row = cur.fetchone()
-                if row:
-                    emp, org, case_cnt, must_move, must_stay = row
-                    return (
-                        f'<div style="display:flex;gap:16px;padding:6px 12px;background:#f0f4ff;'
-                        f'border-radius:8px;font-size:13px;color:#374151;align-items:center;flex-wrap:wrap;">'
-                        f'<span>👥 직원 <b>{emp:,}</b>명</span>'
-                        f'<span>🏢 사업소 <b>{org:,}</b>개</span>'
-                        f'<span>📋 케이스 <b>{case_cnt:,}</b>개</span>'
-                        f'<span>➡️ 필수이동 <b>{must_move:,}</b>명</span>'
-                        f'<span>⛔ 필수유보 <b>{must_stay:,}</b>명</span>'
-                        f'</div>'
-                    )
-        return ""
+        st = get_move_stats(move_std_id)
+        return (
+            f'<div style="display:flex;gap:16px;padding:6px 12px;background:#f0f4ff;'
+            f'border-radius:8px;font-size:13px;color:#374151;align-items:center;flex-wrap:wrap;">'
+            f'<span>👥 직원 <b>{st["emp"]:,}</b>명</span>'
+            f'<span>🏢 사업소 <b>{st["org"]:,}</b>개</span>'
+            f'<span>📋 케이스 <b>{st["case"]:,}</b>개</span>'
+            f'<span>➡️ 필수이동 <b>{st["must_move"]:,}</b>명</span>'
+            f'<span>⛔ 필수유보 <b>{st["must_stay"]:,}</b>명</span>'
+            f'</div>'
+        )
     except Exception as e:
         print(f"이동번호 통계 조회 실패: {e}")
         return '<div style="padding:6px 12px;color:#ef4444;font-size:12px;">통계 조회 실패</div>'
 
 
+def _sync_move_choices(version, *selected):
+    """
+    카탈로그가 갱신되었으면 3개 이동번호 Dropdown의 choices를 교체 (gr.Timer 주기 호출)
+
+    선택값은 새 목록에 남아 있으면 유지하고, 없어졌으면 첫 항목으로 변경
+    """
+    current = get_move_catalog_version()
+    if current == version:
+        return (gr.update(),) * len(selected) + (version,)
+    choices = get_move_choices()
+    values = {c[1] for c in choices}
+    updates = tuple(
+        gr.update(choices=choices, value=value if value in values else choices[0][1])
+        for value in selected
+    )
+    return updates + (current,)
+
+
 
 # ===== 제약조건 분석 함수 =====
 
@@ -100,302 +87,246 @@ def _cnst_summary_html(move_std_id):
     if not move_std_id or move_std_id == "0":
         return '<div style="padding:20px;text-align:center;color:#9ca3af;">이동번호를 선택하세요.</div>'
     try:
-        import oracledb
-        from config import DB_CONFIG
         mid = int(move_std_id)
-        with oracledb.connect(user=DB_CONFIG["user"], password=DB_CONFIG["password"],
-                              dsn=oracledb.makedsn(DB_CONFIG["host"], DB_CONFIG["port"], sid=DB_CONFIG["sid"])) as conn:
-            with conn.cursor() as cur:
-                cur.execute("""
-                    SELECT c.cnst_cd, c.cnst_nm, c.cnst_gbn, c.use_yn, c.cnst_val, c.penalty_val,
-                           COUNT(DISTINCT c.org_id) AS org_cnt
-                    FROM HRAI_CON.MOVE_CASE_CNST_MASTER c
-                    WHERE c.ftr_move_std_id = :mid AND c.rev_id = '999'
-                      AND c.case_id = (SELECT MAX(case_id) FROM HRAI_CON.MOVE_CASE_MASTER WHERE ftr_move_std_id = :mid)
-                    GROUP BY c.cnst_cd, c.cnst_nm, c.cnst_gbn, c.use_yn, c.cnst_val, c.penalty_val
-                    ORDER BY c.use_yn DESC, c.cnst_cd
-                """, {"mid": mid})
-                rows = cur.fetchall()
+        rows = fetch_cnst_summary(mid)
         if not rows:
             return '<div style="padding:20px;text-align:center;color:#9ca3af;">제약조건 데이터 없음</div>'
-        df = pd.DataFrame(rows, columns=["제약코드", "제약조건명", "제약구분", "사용여부", "제약값", "패널티값", "적용사업소수"])
+        df = compact_frame(pd.DataFrame(rows, columns=["제약코드", "제약조건명", "제약구분", "사용여부", "제약값", "패널티값", "적용사업소수"]))
         return _cnst_df_to_html(df, title="제약조건 요약", badge_col="사용여부")
     except Exception as e:
         print(f"제약조건 요약 조회 실패: {e}")
         return f'<div style="padding:12px;color:#ef4444;">조회 오류</div>'
 
 
-def _penalty_top_html(move_std_id):
-    """감점 TOP 20"""
+def _penalty_top_html(move_std_id, facts):
+    """감점 TOP 20 (facts: _penalty_facts 결과)"""
     if not move_std_id or move_std_id == "0":
         return '<div style="padding:20px;text-align:center;color:#9ca3af;">이동번호를 선택하세요.</div>'
-    try:
-        import oracledb
-        from config import DB_CONFIG
-        mid = int(move_std_id)
-        with oracledb.connect(user=DB_CONFIG["user"], password=DB_CONFIG["password"],
-                              dsn=oracledb.makedsn(DB_CONFIG["host"], DB_CONFIG["port"], sid=DB_CONFIG["sid"])) as conn:
-            with conn.cursor() as cur:
-                cur.execute("""
-                    SELECT p.cnst_nm, SUM(p.penalty_cnt) AS total_vio,
-                           MAX(p.penalty_val) AS unit_pen, SUM(p.penalty_sum) AS total_pen
-                    FROM HRAI_CON.MOVE_CASE_PENALTY_INFO p
-                    WHERE p.ftr_move_std_id = :mid AND p.rev_id = '999' AND p.penalty_cnt > 0
-                      AND p.case_id = (SELECT MAX(case_id) FROM HRAI_CON.MOVE_CASE_MASTER WHERE ftr_move_std_id = :mid)
-                    GROUP BY p.cnst_nm
-                    ORDER BY SUM(p.penalty_sum) DESC
-                    FETCH FIRST 20 ROWS ONLY
-                """, {"mid": mid})
-                rows = cur.fetchall()
-        if not rows:
-            return '<div style="padding:20px;text-align:center;color:#9ca3af;">감점 데이터 없음</div>'
-        df = pd.DataFrame(rows, columns=["감점항목명", "총위반건수", "건당감점값", "총감점합계"])
-        return _cnst_df_to_html(df, title="감점 TOP 20", rank_col=True)
-    except Exception as e:
-        print(f"감점 TOP 조회 실패: {e}")
+    if "error" in facts:
         return f'<div style="padding:12px;color:#ef4444;">조회 오류</div>'
+    rows = facts["cnst"][:20]
+    if not rows:
+        return '<div style="padding:20px;text-align:center;color:#9ca3af;">감점 데이터 없음</div>'
+    df = compact_frame(pd.DataFrame(rows, columns=["감점항목명", "총위반건수", "건당감점값", "총감점합계"]))
+    return _cnst_df_to_html(df, title="감점 TOP 20", rank_col=True)
 
 
-def _org_violation_html(move_std_id):
-    """사업소별 제약 위반 현황"""
+def _org_violation_html(move_std_id, facts):
+    """사업소별 제약 위반 현황 (facts: _penalty_facts 결과)"""
     if not move_std_id or move_std_id == "0":
         return '<div style="padding:20px;text-align:center;color:#9ca3af;">이동번호를 선택하세요.</div>'
-    try:
-        import oracledb
-        from config import DB_CONFIG
-        mid = int(move_std_id)
-        with oracledb.connect(user=DB_CONFIG["user"], password=DB_CONFIG["password"],
-                              dsn=oracledb.makedsn(DB_CONFIG["host"], DB_CONFIG["port"], sid=DB_CONFIG["sid"])) as conn:
-            with conn.cursor() as cur:
-                cur.execute("""
-                    SELECT cn.org_nm AS org_name,
-                           COUNT(DISTINCT cn.cnst_cd) AS vio_cnst_cnt,
-                           SUM(p.penalty_cnt) AS total_vio,
-                           SUM(p.penalty_sum) AS total_pen
-                    FROM HRAI_CON.MOVE_CASE_PENALTY_INFO p
-                    JOIN HRAI_CON.MOVE_CASE_CNST_MASTER cn
-                        ON p.ftr_move_std_id = cn.ftr_move_std_id
-                        AND p.case_id = cn.case_id AND p.case_det_id = cn.case_det_id
-                        AND p.rev_id = cn.rev_id AND cn.org_id IS NOT NULL
-                    WHERE p.ftr_move_std_id = :mid AND p.rev_id = '999' AND p.penalty_cnt > 0
-                      AND p.case_id = (SELECT MAX(case_id) FROM HRAI_CON.MOVE_CASE_MASTER WHERE ftr_move_std_id = :mid)
-                    GROUP BY cn.org_nm
-                    ORDER BY SUM(p.penalty_sum) DESC
-                    FETCH FIRST 30 ROWS ONLY
-                """, {"mid": mid})
-                rows = cur.fetchall()
-        if not rows:
-            return '<div style="padding:20px;text-align:center;color:#9ca3af;">위반 데이터 없음</div>'
-        df = pd.DataFrame(rows, columns=["사업소명", "위반제약수", "총위반건수", "총감점합계"])
-        return _cnst_df_to_html(df, title="사업소별 위반 현황 TOP 30", rank_col=True)
-    except Exception as e:
-        print(f"사업소별 위반 조회 실패: {e}")
+    if "error" in facts:
         return f'<div style="padding:12px;color:#ef4444;">조회 오류</div>'
+    rows = facts["org"][:30]
+    if not rows:
+        return '<div style="padding:20px;text-align:center;color:#9ca3af;">위반 데이터 없음</div>'
+    df = compact_frame(pd.DataFrame(rows, columns=["사업소명", "위반제약수", "총위반건수", "총감점합계"]))
+    return _cnst_df_to_html(df, title="사업소별 위반 현황 TOP 30", rank_col=True)
+
 
+# ===== 대시보드 섹션 병렬 실행 =====
+# 섹션 쿼리는 서로 독립적이므로 공용 executor에서 동시에 실행 (작업 수는 연결 풀 크기 이내로 제한)
+_section_executor = concurrent.futures.ThreadPoolExecutor(
+    max_workers=DASHBOARD_CONFIG["max_workers"], thread_name_prefix="dashboard-section",
+)
 
-def _run_cnst_analysis(move_std_id):
-    """3개 분석을 실행하여 (summary, penalty, org) 반환"""
-    return _cnst_summary_html(move_std_id), _penalty_top_html(move_std_id), _org_violation_html(move_std_id)
+_SECTION_LOADING_HTML = '<div style="padding:20px;text-align:center;color:#9ca3af;">조회 중...</div>'
+_SECTION_TIMEOUT_HTML = '<div style="padding:12px;color:#ef4444;">조회 시간 초과</div>'
+_SECTION_ERROR_PREFIX = '<div style="padding:12px;color:#ef4444;">'  # 조회 오류/시간 초과 표시 공통 접두사
+
+
+def _is_section_error(html):
+    """섹션 결과가 오류/시간 초과 표시인지 (스냅샷 저장 제외 판단용)"""
+    return isinstance(html, str) and html.startswith(_SECTION_ERROR_PREFIX)
+
+
+def _run_section(deadline, fn, *args):
+    """섹션 1개 실행 — 섹션 안의 Oracle 쿼리는 call_timeout으로 마감 시각까지만 실행"""
+    with call_deadline(deadline - time.monotonic()):
+        return fn(*args)
+
+
+def _run_sections(tasks, timeout=None):
+    """
+    섹션 함수들을 동시에 실행하고 완료되는 순서대로 (이름, 결과) yield
+
+    timeout(초) 안에 끝나지 않은 섹션은 (이름, None)으로 반환하고 대기하지 않음
+    (아직 시작하지 않은 섹션은 취소, 실행 중인 섹션의 쿼리는 같은 마감 시각의 call_timeout으로 중단되어
+    작업 스레드와 풀 연결이 반환됨)
+    """
+    timeout = timeout or DASHBOARD_CONFIG["section_timeout_sec"]
+    deadline = time.monotonic() + timeout
+    futures = {_section_executor.submit(_run_section, deadline, fn, *args): name
+               for name, (fn, *args) in tasks.items()}
+    pending = set(futures)
+    # 호출 측이 결과를 화면에 반영하는 동안 끝난 섹션도 빠짐없이 돌려주도록 남은 시간 안에서 완료분을 반복 수집
+    while pending:
+        remaining = deadline - time.monotonic()
+        done, pending = concurrent.futures.wait(
+            pending, timeout=max(remaining, 0), return_when=concurrent.futures.FIRST_COMPLETED,
+        )
+        for future in done:
+            try:
+                yield futures[future], future.result()
+            except Exception as e:
+                print(f"섹션 실행 실패 ({futures[future]}): {e}")
+                yield futures[future], None
+        if not done and remaining <= 0:
+            break
+    for future in pending:
+        future.cancel()
+        print(f"섹션 조회 시간 초과 ({futures[future]}, {timeout}초)")
+        yield futures[future], None
+
+
+def _run_cnst_analysis(move_std_id, force_refresh=False):
+    """
+    요약 쿼리와 감점 집계를 동시에 실행하여 완료되는 대로 (summary, penalty, org) 갱신
+
+    마감된 이동번호는 저장된 스냅샷을 바로 표시 (force_refresh면 다시 조회하여 스냅샷 교체)
+    """
+    names = ["summary", "penalty", "org"]
+    yield (_SECTION_LOADING_HTML,) * len(names)
+    case_id = snapshot_key(move_std_id)
+    snapshot = None if force_refresh else load_report_snapshot("cnst", move_std_id, case_id)
+    if snapshot:
+        yield tuple(snapshot["outputs"][n] for n in names)
+        return
+
+    # 감점 TOP 20과 사업소별 위반은 같은 감점 집계 1회에서 잘라 표시
+    tasks = {
+        "summary": (_cnst_summary_html, move_std_id),
+        "penalty_facts": (_penalty_facts, move_std_id),
+    }
+    outputs = {}
+    for name, result in _run_sections(tasks):
+        if name == "summary":
+            outputs["summary"] = result if result is not None else _SECTION_TIMEOUT_HTML
+        elif result is None:
+            outputs["penalty"] = outputs["org"] = _SECTION_TIMEOUT_HTML
+        else:
+            outputs["penalty"] = _penalty_top_html(move_std_id, result)
+            outputs["org"] = _org_violation_html(move_std_id, result)
+        yield tuple(outputs.get(n, gr.update()) for n in names)
+
+    if len(outputs) == len(names) and not any(_is_section_error(h) for h in outputs.values()):
+        save_report_snapshot("cnst", move_std_id, case_id, {"outputs": outputs})
 
 
 
 # ===== 배치 결과 리포트 함수 =====
 
-def _report_summary_html(move_std_id):
-    """총 대상자/배치완료/미배치 요약 카드 HTML"""
+def _report_aggregates(move_std_id):
+    """요약/권역/직무/필수이동 4개 패널 집계를 GROUPING SETS 쿼리 1회로 조회 (실패 시 {"error": 메시지})"""
     if not move_std_id or move_std_id == "0":
-        return '<div style="padding:20px;text-align:center;color:#9ca3af;">이동번호를 선택하세요.</div>', {}
+        return {}
     try:
-        import oracledb
-        from config import DB_CONFIG
-        mid = int(move_std_id)
-        with oracledb.connect(user=DB_CONFIG["user"], password=DB_CONFIG["password"],
-                              dsn=oracledb.makedsn(DB_CONFIG["host"], DB_CONFIG["port"], sid=DB_CONFIG["sid"])) as conn:
-            with conn.cursor() as cur:
-                cur.execute("""
-                    SELECT 
-                        COUNT(*) AS total,
-                        SUM(CASE WHEN c.new_org_id IS NOT NULL AND c.new_org_id != m.lvl5_id THEN 1 ELSE 0 END) AS moved,
-                        SUM(CASE WHEN c.must_stay_yn = 1 THEN 1 ELSE 0 END) AS stayed,
-                        SUM(CASE WHEN c.new_org_id IS NULL THEN 1 ELSE 0 END) AS unplaced
-                    FROM HRAI_CON.move_item_master m
-                    LEFT JOIN HRAI_CON.move_case_item c 
-                        ON m.ftr_move_std_id = c.ftr_move_std_id AND m.emp_id = c.emp_id
-                        AND c.rev_id = '999'
-                        AND c.case_id = (SELECT MAX(case_id) FROM HRAI_CON.MOVE_CASE_MASTER WHERE ftr_move_std_id = :mid)
-                    WHERE m.ftr_move_std_id = :mid
-                """, {"mid": mid})
-                row = cur.fetchone()
-        if not row or row[0] == 0:
-            return '<div style="padding:20px;text-align:center;color:#9ca3af;">배치 결과 데이터가 없습니다.</div>', {}
-        total, moved, stayed, unplaced = (int(v or 0) for v in row)
-        move_rate = round(moved / total * 100, 1) if total > 0 else 0
-        stats = {"total": total, "moved": moved, "stayed": stayed, "unplaced": unplaced, "move_rate": move_rate}
-        cards = [
-            {"label": "총 대상자", "value": f"{total:,}명", "color": "#3b82f6", "icon": "👥"},
-            {"label": "배치완료(이동)", "value": f"{moved:,}명", "color": "#10b981", "icon": "✅"},
-            {"label": "필수유보", "value": f"{stayed:,}명", "color": "#f59e0b", "icon": "⛔"},
-            {"label": "이동율", "value": f"{move_rate}%", "color": "#8b5cf6", "icon": "📊"},
-        ]
-        html = '<div style="display:flex;gap:16px;flex-wrap:wrap;">'
-        for c in cards:
-            html += (
-                f'<div style="flex:1;min-width:180px;background:white;border-radius:12px;padding:18px 22px;'
-                f'box-shadow:0 2px 10px rgba(0,0,0,0.06);border-left:4px solid {c["color"]};">'
-                f'<div style="font-size:12px;color:#6b7280;margin-bottom:4px;">{c["icon"]} {c["label"]}</div>'
-                f'<div style="font-size:1.6em;font-weight:800;color:#111827;">{c["value"]}</div>'
-                f'</div>'
-            )
-        html += '</div>'
-        return html, stats
+        return fetch_move_aggregates(int(move_std_id))
+    except Exception as e:
+        print(f"배치 결과 집계 조회 실패: {e}")
+        return {"error": str(e)}
+
+
+def _penalty_facts(move_std_id):
+    """감점 TOP 20/TOP 10/사업소별 위반 패널 공용 감점 집계 (이동번호별 1회 조회 후 캐시, 실패 시 {"error": 메시지})"""
+    if not move_std_id or move_std_id == "0":
+        return {}
+    try:
+        return fetch_penalty_facts(int(move_std_id))
     except Exception as e:
-        print(f"배치 결과 요약 조회 실패: {e}")
+        print(f"감점 집계 조회 실패: {e}")
+        return {"error": str(e)}
+
+
+def _report_summary_html(move_std_id, agg):
+    """총 대상자/배치완료/미배치 요약 카드 HTML (agg: _report_aggregates 결과)"""
+    if not move_std_id or move_std_id == "0":
+        return '<div style="padding:20px;text-align:center;color:#9ca3af;">이동번호를 선택하세요.</div>', {}
+    if "error" in agg:
         return '<div style="padding:12px;color:#ef4444;">요약 조회 오류</div>', {}
+    row = agg["summary"]
+    if not row or row[0] == 0:
+        return '<div style="padding:20px;text-align:center;color:#9ca3af;">배치 결과 데이터가 없습니다.</div>', {}
+    total, moved, stayed, unplaced = (int(v or 0) for v in row)
+    move_rate = round(moved / total * 100, 1) if total > 0 else 0
+    stats = {"total": total, "moved": moved, "stayed": stayed, "unplaced": unplaced, "move_rate": move_rate}
+    cards = [
+        {"label": "총 대상자", "value": f"{total:,}명", "color": "#3b82f6", "icon": "👥"},
+        {"label": "배치완료(이동)", "value": f"{moved:,}명", "color": "#10b981", "icon": "✅"},
+        {"label": "필수유보", "value": f"{stayed:,}명", "color": "#f59e0b", "icon": "⛔"},
+        {"label": "이동율", "value": f"{move_rate}%", "color": "#8b5cf6", "icon": "📊"},
+    ]
+    html = '<div style="display:flex;gap:16px;flex-wrap:wrap;">'
+    for c in cards:
+        html += (
+            f'<div style="flex:1;min-width:180px;background:white;border-radius:12px;padding:18px 22px;'
+            f'box-shadow:0 2px 10px rgba(0,0,0,0.06);border-left:4px solid {c["color"]};">'
+            f'<div style="font-size:12px;color:#6b7280;margin-bottom:4px;">{c["icon"]} {c["label"]}</div>'
+            f'<div style="font-size:1.6em;font-weight:800;color:#111827;">{c["value"]}</div>'
+            f'</div>'
+        )
+    html += '</div>'
+    return html, stats
 
 
-def _report_region_html(move_std_id):
+def _report_region_html(move_std_id, agg):
     """권역별 이동현황 테이블"""
     if not move_std_id or move_std_id == "0":
         return '<div style="padding:20px;text-align:center;color:#9ca3af;">이동번호를 선택하세요.</div>', []
-    try:
-        import oracledb
-        from config import DB_CONFIG
-        mid = int(move_std_id)
-        with oracledb.connect(user=DB_CONFIG["user"], password=DB_CONFIG["password"],
-                              dsn=oracledb.makedsn(DB_CONFIG["host"], DB_CONFIG["port"], sid=DB_CONFIG["sid"])) as conn:
-            with conn.cursor() as cur:
-                cur.execute("""
-                    SELECT 
-                        NVL(m.lvl2_nm, '(미지정)') AS region,
-                        COUNT(*) AS total,
-                        SUM(CASE WHEN c.new_org_id IS NOT NULL AND c.new_org_id != m.lvl5_id THEN 1 ELSE 0 END) AS moved,
-                        SUM(CASE WHEN c.new_org_id IS NULL OR c.new_org_id = m.lvl5_id THEN 1 ELSE 0 END) AS stayed
-                    FROM HRAI_CON.move_item_master m
-                    LEFT JOIN HRAI_CON.move_case_item c 
-                        ON m.ftr_move_std_id = c.ftr_move_std_id AND m.emp_id = c.emp_id
-                        AND c.rev_id = '999'
-                        AND c.case_id = (SELECT MAX(case_id) FROM HRAI_CON.MOVE_CASE_MASTER WHERE ftr_move_std_id = :mid)
-                    WHERE m.ftr_move_std_id = :mid
-                    GROUP BY m.lvl2_nm
-                    ORDER BY m.lvl2_nm
-                """, {"mid": mid})
-                rows = cur.fetchall()
-        if not rows:
-            return '<div style="padding:20px;text-align:center;color:#9ca3af;">권역별 데이터 없음</div>', []
-        df = pd.DataFrame(rows, columns=["권역", "총원", "이동", "미이동"])
-        region_data = [{"region": r["권역"], "total": int(r["총원"]), "moved": int(r["이동"]), "stayed": int(r["미이동"])} for _, r in df.iterrows()]
-        return _cnst_df_to_html(df, title="권역별 이동현황"), region_data
-    except Exception as e:
-        print(f"권역별 이동현황 조회 실패: {e}")
+    if "error" in agg:
         return '<div style="padding:12px;color:#ef4444;">조회 오류</div>', []
+    rows = agg["region"]
+    if not rows:
+        return '<div style="padding:20px;text-align:center;color:#9ca3af;">권역별 데이터 없음</div>', []
+    df = compact_frame(pd.DataFrame(rows, columns=["권역", "총원", "이동", "미이동"]))
+    region_data = [{"region": r["권역"], "total": int(r["총원"]), "moved": int(r["이동"]), "stayed": int(r["미이동"])} for _, r in df.iterrows()]
+    return _cnst_df_to_html(df, title="권역별 이동현황"), region_data
 
 
 def _report_penalty_top10_html(move_std_id):
     """감점 상위 10개 항목"""
     if not move_std_id or move_std_id == "0":
         return '<div style="padding:20px;text-align:center;color:#9ca3af;">이동번호를 선택하세요.</div>', []
-    try:
-        import oracledb
-        from config import DB_CONFIG
-        mid = int(move_std_id)
-        with oracledb.connect(user=DB_CONFIG["user"], password=DB_CONFIG["password"],
-                              dsn=oracledb.makedsn(DB_CONFIG["host"], DB_CONFIG["port"], sid=DB_CONFIG["sid"])) as conn:
-            with conn.cursor() as cur:
-                cur.execute("""
-                    SELECT p.cnst_nm, SUM(p.penalty_cnt) AS total_vio,
-                           MAX(p.penalty_val) AS unit_pen, SUM(p.penalty_sum) AS total_pen
-                    FROM HRAI_CON.MOVE_CASE_PENALTY_INFO p
-                    WHERE p.ftr_move_std_id = :mid AND p.rev_id = '999' AND p.penalty_cnt > 0
-                      AND p.case_id = (SELECT MAX(case_id) FROM HRAI_CON.MOVE_CASE_MASTER WHERE ftr_move_std_id = :mid)
-                    GROUP BY p.cnst_nm
-                    ORDER BY SUM(p.penalty_sum) DESC
-                    FETCH FIRST 10 ROWS ONLY
-                """, {"mid": mid})
-                rows = cur.fetchall()
-        if not rows:
-            return '<div style="padding:20px;text-align:center;color:#9ca3af;">감점 데이터 없음</div>', []
-        df = pd.DataFrame(rows, columns=["감점항목명", "총위반건수", "건당감점값", "총감점합계"])
-        penalty_data = [{"name": r["감점항목명"], "vio": int(r["총위반건수"]), "pen": float(r["총감점합계"])} for _, r in df.iterrows()]
-        return _cnst_df_to_html(df, title="감점 TOP 10", rank_col=True), penalty_data
-    except Exception as e:
-        print(f"감점 TOP 10 조회 실패: {e}")
+    facts = _penalty_facts(move_std_id)
+    if "error" in facts:
         return '<div style="padding:12px;color:#ef4444;">조회 오류</div>', []
+    rows = facts["cnst"][:10]
+    if not rows:
+        return '<div style="padding:20px;text-align:center;color:#9ca3af;">감점 데이터 없음</div>', []
+    df = compact_frame(pd.DataFrame(rows, columns=["감점항목명", "총위반건수", "건당감점값", "총감점합계"]))
+    penalty_data = [{"name": r["감점항목명"], "vio": int(r["총위반건수"]), "pen": float(r["총감점합계"])} for _, r in df.iterrows()]
+    return _cnst_df_to_html(df, title="감점 TOP 10", rank_col=True), penalty_data
 
 
-def _report_must_move_html(move_std_id):
+def _report_must_move_html(move_std_id, agg):
     """필수이동/필수유보 처리현황"""
     if not move_std_id or move_std_id == "0":
         return '<div style="padding:20px;text-align:center;color:#9ca3af;">이동번호를 선택하세요.</div>', []
-    try:
-        import oracledb
-        from config import DB_CONFIG
-        mid = int(move_std_id)
-        with oracledb.connect(user=DB_CONFIG["user"], password=DB_CONFIG["password"],
-                              dsn=oracledb.makedsn(DB_CONFIG["host"], DB_CONFIG["port"], sid=DB_CONFIG["sid"])) as conn:
-            with conn.cursor() as cur:
-                cur.execute("""
-                    SELECT 
-                        CASE WHEN m.must_move_yn = 1 THEN '필수이동'
-                             WHEN m.must_stay_yn = 1 THEN '필수유보'
-                             ELSE '일반' END AS category,
-                        COUNT(*) AS cnt,
-                        SUM(CASE WHEN c.new_org_id IS NOT NULL AND c.new_org_id != m.lvl5_id THEN 1 ELSE 0 END) AS moved_cnt
-                    FROM HRAI_CON.move_item_master m
-                    LEFT JOIN HRAI_CON.move_case_item c 
-                        ON m.ftr_move_std_id = c.ftr_move_std_id AND m.emp_id = c.emp_id
-                        AND c.rev_id = '999'
-                        AND c.case_id = (SELECT MAX(case_id) FROM HRAI_CON.MOVE_CASE_MASTER WHERE ftr_move_std_id = :mid)
-                    WHERE m.ftr_move_std_id = :mid
-                    GROUP BY CASE WHEN m.must_move_yn = 1 THEN '필수이동'
-                                  WHEN m.must_stay_yn = 1 THEN '필수유보'
-                                  ELSE '일반' END
-                    ORDER BY 1
-                """, {"mid": mid})
-                rows = cur.fetchall()
-        if not rows:
-            return '<div style="padding:20px;text-align:center;color:#9ca3af;">필수이동/유보 데이터 없음</div>', []
-        df = pd.DataFrame(rows, columns=["구분", "인원수", "이동완료"])
-        must_data = [{"category": r["구분"], "cnt": int(r["인원수"]), "moved": int(r["이동완료"])} for _, r in df.iterrows()]
-        return _cnst_df_to_html(df, title="필수이동/유보 처리현황"), must_data
-    except Exception as e:
-        print(f"필수이동/유보 조회 실패: {e}")
+    if "error" in agg:
         return '<div style="padding:12px;color:#ef4444;">조회 오류</div>', []
+    rows = agg["must"]
+    if not rows:
+        return '<div style="padding:20px;text-align:center;color:#9ca3af;">필수이동/유보 데이터 없음</div>', []
+    df = compact_frame(pd.DataFrame(rows, columns=["구분", "인원수", "이동완료"]))
+    must_data = [{"category": r["구분"], "cnt": int(r["인원수"]), "moved": int(r["이동완료"])} for _, r in df.iterrows()]
+    return _cnst_df_to_html(df, title="필수이동/유보 처리현황"), must_data
 
 
-def _report_job_type_html(move_std_id):
+def _report_job_type_html(move_std_id, agg):
     """직무별 배치현황"""
     if not move_std_id or move_std_id == "0":
         return '<div style="padding:20px;text-align:center;color:#9ca3af;">이동번호를 선택하세요.</div>', []
-    try:
-        import oracledb
-        from config import DB_CONFIG
-        mid = int(move_std_id)
-        with oracledb.connect(user=DB_CONFIG["user"], password=DB_CONFIG["password"],
-                              dsn=oracledb.makedsn(DB_CONFIG["host"], DB_CONFIG["port"], sid=DB_CONFIG["sid"])) as conn:
-            with conn.cursor() as cur:
-                cur.execute("""
-                    SELECT 
-                        NVL(m.job_type1, '(미지정)') AS job_type,
-                        COUNT(*) AS total,
-                        SUM(CASE WHEN c.new_org_id IS NOT NULL AND c.new_org_id != m.lvl5_id THEN 1 ELSE 0 END) AS moved
-                    FROM HRAI_CON.move_item_master m
-                    LEFT JOIN HRAI_CON.move_case_item c 
-                        ON m.ftr_move_std_id = c.ftr_move_std_id AND m.emp_id = c.emp_id
-                        AND c.rev_id = '999'
-                        AND c.case_id = (SELECT MAX(case_id) FROM HRAI_CON.MOVE_CASE_MASTER WHERE ftr_move_std_id = :mid)
-                    WHERE m.ftr_move_std_id = :mid
-                    GROUP BY m.job_type1
-                    ORDER BY COUNT(*) DESC
-                """, {"mid": mid})
-                rows = cur.fetchall()
-        if not rows:
-            return '<div style="padding:20px;text-align:center;color:#9ca3af;">직무별 데이터 없음</div>', []
-        df = pd.DataFrame(rows, columns=["직무", "총원", "이동"])
-        job_data = [{"job": r["직무"], "total": int(r["총원"]), "moved": int(r["이동"])} for _, r in df.iterrows()]
-        return _cnst_df_to_html(df, title="직무별 배치현황"), job_data
-    except Exception as e:
-        print(f"직무별 배치현황 조회 실패: {e}")
+    if "error" in agg:
         return '<div style="padding:12px;color:#ef4444;">조회 오류</div>', []
+    rows = agg["job"]
+    if not rows:
+        return '<div style="padding:20px;text-align:center;color:#9ca3af;">직무별 데이터 없음</div>', []
+    df = compact_frame(pd.DataFrame(rows, columns=["직무", "총원", "이동"]))
+    job_data = [{"job": r["직무"], "total": int(r["총원"]), "moved": int(r["이동"])} for _, r in df.iterrows()]
+    return _cnst_df_to_html(df, title="직무별 배치현황"), job_data
+
+
+_LLM_FALLBACK_NOTE = "(LLM 요약 생성에 실패하여 기본 요약을 표시합니다.)"
 
 
 def _report_llm_summary(stats, region_data, penalty_data, must_data, job_data):
@@ -441,26 +372,77 @@ def _report_llm_summary(stats, region_data, penalty_data, must_data, job_data):
             return (f"총 {stats.get('total',0):,}명 중 {stats.get('moved',0):,}명이 이동 배치되어 "
                     f"이동율 {stats.get('move_rate',0)}%를 기록했습니다. "
                     f"필수유보 {stats.get('stayed',0):,}명, 미배치 {stats.get('unplaced',0):,}명입니다. "
-                    f"(LLM 요약 생성에 실패하여 기본 요약을 표시합니다.)")
+                    f"{_LLM_FALLBACK_NOTE}")
         return "(요약 생성 실패)"
 
-def _run_batch_report(move_std_id):
-    """배치 결과 리포트의 모든 섹션을 실행하여 6개 출력을 반환"""
-    # 섹션 1: 요약 카드
-    summary_html, stats = _report_summary_html(move_std_id)
-    # 섹션 2: 권역별 이동현황
-    region_html, region_data = _report_region_html(move_std_id)
-    # 섹션 3: 감점 TOP 10
-    penalty_html, penalty_data = _report_penalty_top10_html(move_std_id)
-    # 섹션 4: 필수이동/유보 처리현황
-    must_html, must_data = _report_must_move_html(move_std_id)
-    # 섹션 5: 직무별 배치현황
-    job_html, job_data = _report_job_type_html(move_std_id)
-    # 섹션 6: LLM 자연어 요약
-    llm_summary = _report_llm_summary(stats, region_data, penalty_data, must_data, job_data)
+def _run_batch_report(move_std_id, force_refresh=False):
+    """
+    배치 결과 리포트 5개 섹션을 동시에 조회하여 완료되는 대로 표시한 뒤 LLM 요약 생성
 
+    마감된 이동번호는 저장된 스냅샷(패널 HTML + 통계 + LLM 요약)을 바로 표시
+    (force_refresh면 다시 조회/요약하여 스냅샷 교체)
+    """
     # outputs 순서: summary, region, job, must, penalty, llm (event handler와 동일)
-    return summary_html, region_html, job_html, must_html, penalty_html, llm_summary
+    names = ["summary", "region", "job", "must", "penalty", "llm"]
+    yield (_SECTION_LOADING_HTML,) * 5 + ("*요약 대기 중...*",)
+    case_id = snapshot_key(move_std_id)
+    snapshot = None if force_refresh else load_report_snapshot("report", move_std_id, case_id)
+    if snapshot:
+        yield tuple(snapshot["outputs"][n] for n in names)
+        return
+
+    # 섹션 1/2/4/5는 같은 조인을 그룹 기준만 달리 집계하므로 GROUPING SETS 쿼리 1회로 함께 조회
+    panels = {
+        "summary": _report_summary_html,      # 섹션 1: 요약 카드
+        "region": _report_region_html,        # 섹션 2: 권역별 이동현황
+        "must": _report_must_move_html,       # 섹션 4: 필수이동/유보 처리현황
+        "job": _report_job_type_html,         # 섹션 5: 직무별 배치현황
+    }
+    tasks = {
+        "aggregate": (_report_aggregates, move_std_id),
+        "penalty": (_report_penalty_top10_html, move_std_id),  # 섹션 3: 감점 TOP 10
+    }
+    data = {"summary": {}, "region": [], "penalty": [], "must": [], "job": []}
+    outputs = {}
+    for name, result in _run_sections(tasks):
+        html = {}
+        if name == "aggregate":
+            for panel, render in panels.items():
+                if result is None:
+                    html[panel] = _SECTION_TIMEOUT_HTML
+                else:
+                    html[panel], data[panel] = render(move_std_id, result)
+        elif result is None:
+            html[name] = _SECTION_TIMEOUT_HTML
+        else:
+            html[name], data[name] = result
+        outputs.update(html)
+        yield tuple(html.get(n, gr.update()) for n in names)
+
+    # 섹션 6: LLM 자연어 요약 (앞 섹션 데이터 필요)
+    llm_summary = _report_llm_summary(data["summary"], data["region"], data["penalty"], data["must"], data["job"])
+    outputs["llm"] = llm_summary
+    yield tuple(llm_summary if n == "llm" else gr.update() for n in names)
+
+    # 모든 섹션이 정상 조회되고 LLM 요약도 성공한 경우에만 스냅샷 저장
+    if (len(outputs) == len(names) and not any(_is_section_error(h) for h in outputs.values())
+            and _LLM_FALLBACK_NOTE not in llm_summary):
+        save_report_snapshot("report", move_std_id, case_id, {"outputs": outputs, "data": data, "llm": llm_summary})
+
+
+def _prewarm_report_snapshots():
+    """마감된 모든 이동번호의 리포트/제약조건 분석 스냅샷을 새로 생성 (python app.py --prewarm-snapshots)"""
+    refresh_move_catalog()
+    move_ids = [mid for _, mid in get_move_choices() if mid != "0"]
+    closed = [mid for mid, is_closed in get_close_status(move_ids).items() if is_closed]
+    print(f"마감된 이동번호 {len(closed)}개 스냅샷 생성 시작")
+    for mid in sorted(closed, key=int, reverse=True):
+        t0 = time.time()
+        for _ in _run_cnst_analysis(mid, force_refresh=True):
+            pass
+        for _ in _run_batch_report(mid, force_refresh=True):
+            pass
+        print(f"  {mid}: {time.time() - t0:.1f}초")
 
 # ===== Google Fonts =====
 custom_head = '<link href="https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700;800&display=swap" rel="stylesheet">'
@@ -874,6 +856,87 @@ custom_css = """
     background: #fef2f2 !important;
     border-color: #dc2626 !important;
 }
+
+/* 조회 결과 가상 스크롤 그리드 (custom_js가 data-grid JSON으로 보이는 행만 렌더링) */
+.result-grid {
+    border-radius: 12px;
+    overflow: hidden;
+    border: 1px solid #e5e7eb;
+}
+.result-grid .rg-toolbar {
+    display: flex;
+    align-items: center;
+    gap: 10px;
+    padding: 6px 10px;
+    background: #f8fafc;
+    border-bottom: 1px solid #e5e7eb;
+}
+.result-grid .rg-filter {
+    flex: 0 1 260px;
+    padding: 4px 10px;
+    border: 1px solid #e5e7eb;
+    border-radius: 8px;
+    font-size: 12px;
+}
+.result-grid .rg-count {
+    color: #6b7280;
+    font-size: 12px;
+}
+.result-grid .rg-scroll {
+    max-height: 500px;
+    overflow: auto;
+}
+.result-grid table {
+    width: 100%;
+    border-collapse: collapse;
+    font-size: 13px;
+}
+.result-grid thead {
+    position: sticky;
+    top: 0;
+    z-index: 1;
+}
+.result-grid th {
+    background: #f8fafc;
+    padding: 10px 14px;
+    text-align: left;
+    font-weight: 600;
+    color: #374151;
+    border-bottom: 2px solid #e5e7eb;
+    white-space: nowrap;
+    position: relative;
+    min-width: 60px;
+    cursor: pointer;
+    user-select: none;
+}
+.result-grid td {
+    height: 34px;
+    box-sizing: border-box;
+    padding: 8px 14px;
+    border-bottom: 1px solid #f1f5f9;
+    color: #111827;
+    white-space: nowrap;
+    overflow: hidden;
+    text-overflow: ellipsis;
+}
+.result-grid td.rg-num {
+    text-align: right;
+    font-variant-numeric: tabular-nums;
+}
+.result-grid tr.rg-odd {
+    background: #f9fafb;
+}
+.result-grid tr.rg-spacer td {
+    padding: 0;
+    border: none;
+}
+.result-grid .rg-footer {
+    padding: 8px 14px;
+    background: #f8fafc;
+    color: #6b7280;
+    font-size: 12px;
+    border-top: 1px solid #e5e7eb;
+}
 """
 
 
@@ -933,6 +996,135 @@ function() {
         counterObserver.observe(statArea, { childList: true, subtree: true });
     }
 
+    // ---- Virtual Result Grid ----
+    // 조회 결과는 data-grid JSON({columns, numeric, rows, total, shown})으로 전달됨
+    // 보이는 행(+여유분)만 tbody에 그리고, 정렬(헤더 클릭)/검색은 서버 왕복 없이 브라우저에서 처리
+    var GRID_ROW_HEIGHT = 34;
+    var GRID_OVERSCAN = 10;
+
+    function escapeCell(v) {
+        return String(v).replace(/&/g, '&amp;').replace(/</g, '&lt;').replace(/>/g, '&gt;')
+                        .replace(/"/g, '&quot;').replace(/'/g, '&#x27;');
+    }
+
+    function initResultGrid(root) {
+        root.dataset.ready = 'true';
+        var data;
+        try {
+            data = JSON.parse(root.dataset.grid);
+        } catch (err) {
+            root.textContent = '결과를 표시할 수 없습니다.';
+            return;
+        }
+        var rows = data.rows;
+        var numeric = data.numeric;
+        var nCols = data.columns.length;
+        var view = rows.map(function(_, i) { return i; });
+        var sortCol = -1, sortDir = 0, filterText = '';
+
+        var headerHtml = data.columns.map(function(name, j) {
+            return '<th data-col="' + j + '">' + escapeCell(name) + '<span class="rg-sort"></span>' +
+                   '<div class="col-resize-handle" style="position:absolute;right:0;top:0;bottom:0;width:5px;' +
+                   'cursor:col-resize;background:transparent;z-index:2;"></div></th>';
+        }).join('');
+        var footer = data.total > data.shown
+            ? '<div class="rg-footer">전체 ' + data.total + '건 중 ' + data.shown + '건 표시</div>' : '';
+        root.innerHTML =
+            '<div class="rg-toolbar"><input class="rg-filter" type="search" placeholder="결과 내 검색">' +
+            '<span class="rg-count"></span></div>' +
+            '<div class="rg-scroll"><table><thead><tr>' + headerHtml + '</tr></thead><tbody></tbody></table></div>' +
+            footer;
+        var scroller = root.querySelector('.rg-scroll');
+        var tbody = root.querySelector('tbody');
+        var count = root.querySelector('.rg-count');
+
+        function renderRows() {
+            var height = scroller.clientHeight || 500;
+            var start = Math.max(0, Math.floor(scroller.scrollTop / GRID_ROW_HEIGHT) - GRID_OVERSCAN);
+            var end = Math.min(view.length, Math.ceil((scroller.scrollTop + height) / GRID_ROW_HEIGHT) + GRID_OVERSCAN);
+            var parts = [];
+            if (start > 0) {
+                parts.push('<tr class="rg-spacer"><td colspan="' + nCols + '" style="height:' + (start * GRID_ROW_HEIGHT) + 'px"></td></tr>');
+            }
+            for (var i = start; i < end; i++) {
+                var row = rows[view[i]];
+                var cells = '';
+                for (var j = 0; j < nCols; j++) {
+                    var v = row[j];
+                    cells += (numeric[j] ? '<td class="rg-num">' : '<td>') + (v === null ? '' : escapeCell(v)) + '</td>';
+                }
+                parts.push('<tr' + (i % 2 ? ' class="rg-odd"' : '') + '>' + cells + '</tr>');
+            }
+            if (end < view.length) {
+                parts.push('<tr class="rg-spacer"><td colspan="' + nCols + '" style="height:' + ((view.length - end) * GRID_ROW_HEIGHT) + 'px"></td></tr>');
+            }
+            tbody.innerHTML = parts.join('');
+        }
+
+        function compareCells(a, b) {
+            var x = rows[a][sortCol], y = rows[b][sortCol];
+            if (x === null || y === null) return x === y ? a - b : (x === null ? 1 : -1);  // 빈 값은 항상 마지막
+            var cmp;
+            if (numeric[sortCol]) {
+                cmp = parseFloat(x) - parseFloat(y);
+                if (isNaN(cmp)) cmp = x.localeCompare(y);
+            } else {
+                cmp = x.localeCompare(y, 'ko');
+            }
+            return cmp === 0 ? a - b : cmp * sortDir;
+        }
+
+        function rebuildView() {
+            var needle = filterText.toLowerCase();
+            view = [];
+            for (var i = 0; i < rows.length; i++) {
+                if (!needle || rows[i].some(function(v) { return v !== null && v.toLowerCase().indexOf(needle) !== -1; })) {
+                    view.push(i);
+                }
+            }
+            if (sortDir !== 0) view.sort(compareCells);
+            count.textContent = (view.length === rows.length ? '' : view.length.toLocaleString() + ' / ') +
+                                rows.length.toLocaleString() + '행';
+            root.querySelectorAll('th .rg-sort').forEach(function(el, j) {
+                el.textContent = j === sortCol ? (sortDir > 0 ? ' ▲' : ' ▼') : '';
+            });
+            scroller.scrollTop = 0;
+            renderRows();
+        }
+
+        var pending = false;
+        scroller.addEventListener('scroll', function() {
+            if (pending) return;
+            pending = true;
+            requestAnimationFrame(function() { pending = false; renderRows(); });
+        });
+        root.querySelector('thead').addEventListener('click', function(e) {
+            var th = e.target.closest('th');
+            if (!th || e.target.classList.contains('col-resize-handle')) return;
+            var col = parseInt(th.dataset.col, 10);
+            // 같은 열을 누를 때마다 오름차순 → 내림차순 → 정렬 해제
+            if (col !== sortCol) { sortCol = col; sortDir = 1; }
+            else if (sortDir === 1) { sortDir = -1; }
+            else { sortCol = -1; sortDir = 0; }
+            rebuildView();
+        });
+        var filterTimer = null;
+        root.querySelector('.rg-filter').addEventListener('input', function(e) {
+            if (filterTimer) clearTimeout(filterTimer);
+            filterTimer = setTimeout(function() { filterText = e.target.value; rebuildView(); }, 150);
+        });
+        rebuildView();
+    }
+
+    function initResultGrids() {
+        document.querySelectorAll('.result-grid[data-grid]:not([data-ready])').forEach(initResultGrid);
+    }
+    initResultGrids();
+    const gridObserver = new MutationObserver(initResultGrids);
+    if (statArea) {
+        gridObserver.observe(statArea, { childList: true, subtree: true });
+    }
+
     // ---- Column Resize ----
     document.addEventListener('mousedown', function(e) {
         if (!e.target.classList.contains('col-resize-handle')) return;
@@ -1333,113 +1525,40 @@ def _on_history_select(evt: gr.SelectData, sqls):
     return ""
 
 
-# ===== CSV 내보내기 =====
-def _export_csv(df):
-    """조회 결과를 CSV 파일로 내보내기 (한글 Excel 호환 BOM 포함)"""
-    if not isinstance(df, pd.DataFrame) or df.empty:
-        return gr.update(visible=False)
-    fd, path = tempfile.mkstemp(suffix=".csv", prefix="query_result_")
-    os.close(fd)
-    df.to_csv(path, index=False, encoding="utf-8-sig")
-    return gr.update(value=path, visible=True)
+# ===== 결과 전체 내보내기 =====
+_EXPORT_FORMAT_LABELS = {"csv": "CSV", "parquet": "Parquet", "xlsx": "Excel (XLSX)"}
+
+
+def _export_result(handle, fmt, progress=gr.Progress()):
+    """실행한 SQL의 전체 결과를 행 상한 없이 파일로 내보내기 (배치마다 진행률 표시)"""
+    if not handle:
+        return gr.update(visible=False), "내보낼 조회 결과가 없습니다. SQL을 먼저 실행해 주세요."
+
+    def on_progress(n_rows, total):
+        progress((n_rows, total), desc=f"내보내기 {n_rows:,}행", unit="행")
+
+    result = export_result(handle, fmt or "csv", on_progress=on_progress)
+    if result["error"]:
+        return gr.update(visible=False), result["error"]
+    return gr.update(value=result["path"], visible=True), f"내보내기 완료: {result['rows']:,}행"
 
 
 # ===== DataFrame → HTML 테이블 변환 =====
 def _df_to_html(df):
-    """DataFrame을 스타일된 HTML 테이블로 변환 (동적 높이)"""
-    if not isinstance(df, pd.DataFrame) or df.empty:
-        return '<div style="padding:20px;text-align:center;color:#9ca3af;">조회 결과가 없습니다.</div>'
-
-    max_display = 500  # Show scrollbar if more than this
-    total = len(df)
-
-    # Build HTML table
-    html = '<div style="border-radius:12px;overflow:hidden;border:1px solid #e5e7eb;">'
-
-    # If many rows, add scrollable container
-    if total > 30:
-        html += '<div style="max-height:500px;overflow:auto;">'
-
-    html += '<table style="width:100%;border-collapse:collapse;font-size:13px;">'
-
-    # Header
-    html += '<thead style="position:sticky;top:0;z-index:1;"><tr>'
-    for col in df.columns:
-        html += f'<th style="background:#f8fafc;padding:10px 14px;text-align:left;font-weight:600;color:#374151;border-bottom:2px solid #e5e7eb;white-space:nowrap;position:relative;min-width:60px;">{col}<div class="col-resize-handle" style="position:absolute;right:0;top:0;bottom:0;width:5px;cursor:col-resize;background:transparent;z-index:2;"></div></th>'
-    html += '</tr></thead>'
-
-    # Body (limit to max_display rows)
-    html += '<tbody>'
-    display_df = df.head(max_display)
-    for i, (_, row) in enumerate(display_df.iterrows()):
-        bg = '#ffffff' if i % 2 == 0 else '#f9fafb'
-        html += f'<tr style="background:{bg};">'
-        for val in row:
-            cell_val = '' if pd.isna(val) else _html_mod.escape(str(val))
-            html += f'<td style="padding:8px 14px;border-bottom:1px solid #f1f5f9;color:#111827;white-space:nowrap;">{cell_val}</td>'
-        html += '</tr>'
-    html += '</tbody></table>'
-
-    if total > 30:
-        html += '</div>'
-
-    # Footer with count
-    if total > max_display:
-        html += f'<div style="padding:8px 14px;background:#f8fafc;color:#6b7280;font-size:12px;border-top:1px solid #e5e7eb;">전체 {total}건 중 {max_display}건 표시</div>'
-
-    html += '</div>'
-    return html
+    """
+    조회 결과 DataFrame → HTML (최대 500행 표시)
 
+    그리드 사용 시 데이터만 JSON으로 보내고 브라우저(custom_js)가 보이는 행만 그림, 아니면 스타일된 HTML 표
+    """
+    if PAGING_CONFIG["grid"]:
+        return render_result_grid(df, max_display=500)
+    return render_result_table(df, max_display=500)
 
 
 def _cnst_df_to_html(df, title="", badge_col=None, rank_col=False):
     """제약조건 분석 전용 HTML 테이블 렌더러"""
-    if not isinstance(df, pd.DataFrame) or df.empty:
-        return '<div style="padding:20px;text-align:center;color:#9ca3af;">데이터 없음</div>'
-    header = ""
-    if title:
-        header = (f'<div style="padding:10px 16px 8px;font-weight:700;font-size:14px;'
-                  f'color:#374151;border-bottom:2px solid #667eea20;">{title}'
-                  f'<span style="margin-left:8px;font-size:12px;font-weight:400;color:#9ca3af;">({len(df)}건)</span></div>')
-    html = f'<div style="border-radius:12px;overflow:hidden;border:1px solid #e5e7eb;box-shadow:0 2px 8px rgba(0,0,0,0.04);">{header}'
-    if len(df) > 25:
-        html += '<div style="max-height:420px;overflow:auto;">'
-    html += '<table style="width:100%;border-collapse:collapse;font-size:13px;">'
-    html += '<thead style="position:sticky;top:0;z-index:1;"><tr>'
-    if rank_col:
-        html += '<th style="background:#f8fafc;padding:9px 10px;text-align:center;font-weight:600;color:#6b7280;border-bottom:2px solid #e5e7eb;width:36px;">#</th>'
-    for col in df.columns:
-        html += f'<th style="background:#f8fafc;padding:9px 14px;text-align:left;font-weight:600;color:#374151;border-bottom:2px solid #e5e7eb;white-space:nowrap;">{col}</th>'
-    html += '</tr></thead><tbody>'
-    for i, (_, row) in enumerate(df.iterrows()):
-        bg = '#ffffff' if i % 2 == 0 else '#f9fafb'
-        html += f'<tr style="background:{bg};">'
-        if rank_col:
-            rc = "#667eea" if i < 3 else "#9ca3af"
-            html += f'<td style="padding:8px 10px;text-align:center;color:{rc};font-weight:700;border-bottom:1px solid #f1f5f9;">{i+1}</td>'
-        for col in df.columns:
-            val = row[col]
-            import html as _html
-            cell = '' if pd.isna(val) else _html.escape(str(val))
-            style = "padding:8px 14px;border-bottom:1px solid #f1f5f9;color:#111827;"
-            if col == badge_col:
-                if cell == 'Y':
-                    cell = '<span style="background:#10b98120;color:#10b981;padding:2px 8px;border-radius:10px;font-size:12px;font-weight:600;">Y</span>'
-                else:
-                    cell = '<span style="background:#9ca3af20;color:#9ca3af;padding:2px 8px;border-radius:10px;font-size:12px;font-weight:600;">N</span>'
-            elif isinstance(val, (int, float)) and not pd.isna(val):
-                try:
-                    cell = f'{int(val):,}' if float(val) == int(float(val)) else f'{float(val):,.2f}'
-                except (ValueError, OverflowError):
-                    pass
-                style += "text-align:right;font-variant-numeric:tabular-nums;"
-            html += f'<td style="{style}">{cell}</td>'
-        html += '</tr>'
-    html += '</tbody></table>'
-    if len(df) > 25:
-        html += '</div>'
-    html += '</div>'
-    return html
+    return render_cnst_table(df, title=title, badge_col=badge_col, rank_col=rank_col)
+
 
 # ===== 모델 상태 텍스트 빌더 =====
 def _build_model_status(model_key):
@@ -1467,10 +1586,11 @@ def _on_model_change(model_key):
 
 
 # ===== SQL 생성 (실행하지 않음) =====
-def process_generate(question: str, model_key: str, move_std_id: str, progress=gr.Progress()):
-    """SQL만 생성 (실행하지 않음)"""
+async def process_generate(question: str, model_key: str, move_std_id: str, progress=gr.Progress()):
+    """SQL만 생성 (실행하지 않음) — 스트리밍으로 sql_output을 실시간 갱신"""
     if not question or not question.strip():
-        return "", "질문을 입력해주세요.", ""
+        yield "", "질문을 입력해주세요.", ""
+        return
     if model_key not in MODEL_REGISTRY:
         model_key = DEFAULT_MODEL_KEY
 
@@ -1481,69 +1601,171 @@ def process_generate(question: str, model_key: str, move_std_id: str, progress=g
             enhanced_question = f"[이동번호(FTR_MOVE_STD_ID)={move_std_id} 조건 필수] {enhanced_question}"
 
     progress(0.3, desc="SQL 생성 중...")
-    result = generate_sql(enhanced_question, model_key=model_key)
+    result = {}
+    async for result in agenerate_sql_stream(enhanced_question, model_key=model_key):
+        if not result["done"]:
+            if result["sql"]:
+                status = f"SQL 생성 중... ({len(result['sql'])}자)"
+            else:
+                status = "추론 중..." if result["reasoning"] else "SQL 생성 중..."
+            yield result["sql"], status, result["reasoning"]
     progress(1.0, desc="완료")
 
-    if result["error"]:
-        return result.get("sql", ""), f"오류: {result['error']}", result.get("reasoning", "")
-    return result["sql"], "SQL 생성 완료", result.get("reasoning", "")
+    if result.get("error"):
+        yield result.get("sql", ""), f"오류: {result['error']}", result.get("reasoning", "")
+        return
+    status = "SQL 생성 완료 (캐시)" if result.get("cached") else "SQL 생성 완료"
+    tokens = result.get("prompt_tokens")
+    if tokens and tokens["pruned"] < tokens["full"]:
+        status += f" — 프롬프트 {tokens['full']:,} → {tokens['pruned']:,} 토큰"
+    llm = result.get("llm")
+    if llm and llm["ttft"] is not None:
+        status += f" · 첫 토큰 {llm['ttft']:.2f}초"
+    if llm and llm["cached_tokens"]:
+        status += f" (접두사 캐시 {llm['cached_tokens']:,}/{llm['prompt_tokens']:,} 토큰)"
+    yield result["sql"], status, result.get("reasoning", "")
 
 
 # ===== SQL 실행 및 결과 반환 =====
-def process_execute(sql_text: str, question: str, model_key: str, reasoning: str, progress=gr.Progress()):
-    """생성된 SQL을 실행하고 결과 반환 (stat cards도 갱신)"""
+def _page_outputs(page_result):
+    """페이지 조회 결과 → (결과 HTML, 페이지 위치 문구, 이전 버튼, 다음 버튼, 현재 페이지)"""
+    df = page_result["result"]
+    page = page_result["page"]
+    if df.empty:
+        info = ""
+    else:
+        start = page * page_result["page_size"]
+        info = f"{start + 1:,}–{start + len(df):,}행 ({page + 1}페이지)"
+    return (
+        _df_to_html(df),
+        info,
+        gr.update(interactive=page > 0),
+        gr.update(interactive=page_result["has_next"]),
+        page,
+    )
+
+
+def _empty_page_outputs():
+    return _df_to_html(pd.DataFrame()), "", gr.update(interactive=False), gr.update(interactive=False), 0
+
+
+async def process_execute(sql_text: str, question: str, model_key: str, reasoning: str, prev_handle: str,
+                          request: gr.Request, progress=gr.Progress()):
+    """생성된 SQL을 실행하고 첫 페이지 결과 반환 (stat cards도 갱신)"""
+    # 결과 저장소 작업(dtype 압축, 디스크 기록/읽기/삭제)은 이벤트 루프 밖에서 실행
+    await asyncio.to_thread(release_result, prev_handle)  # 같은 세션의 이전 결과는 새 실행으로 대체됨
     if not sql_text or not sql_text.strip():
         total, rate, avg = _get_stat_values()
         return (
-            _df_to_html(pd.DataFrame()),
+            *_empty_page_outputs(),
             "실행할 SQL이 없습니다.",
             "",
             _get_history(),
             _get_history_sqls(),
             _build_stat_cards(total, rate, avg),
-            pd.DataFrame(),
+            "",
         )
     if model_key not in MODEL_REGISTRY:
         model_key = DEFAULT_MODEL_KEY
 
     progress(0.3, desc="SQL 실행 중...")
-    result = execute_sql(sql_text.strip())
+    result = await aexecute_sql(sql_text.strip())
 
     if result["error"]:
         _add_to_history(question or "(직접 실행)", model_key, "오류", 0, sql_text)
         _update_stats("오류", 0)
         total, rate, avg = _get_stat_values()
         return (
-            _df_to_html(pd.DataFrame()),
+            *_empty_page_outputs(),
             f"오류: {result['error']}",
             "",
             _get_history(),
             _get_history_sqls(),
             _build_stat_cards(total, rate, avg),
-            pd.DataFrame(),
+            "",
         )
 
     df = result["result"]
 
-    progress(0.7, desc="보고서 생성 중...")
-    report = generate_report(question or "", sql_text, df, reasoning, model_key=model_key)
-
+    # 첫 페이지만 먼저 표시 — 이후 페이지/전체 건수/보고서는 후속 이벤트에서 처리
+    session = request.session_hash if request else None
+    handle = await asyncio.to_thread(open_result_pages, sql_text, df, session)
+    first_page = await afetch_page(handle, 0)
     progress(1.0, desc="완료")
     _add_to_history(question or "(직접 실행)", model_key, "성공", len(df), sql_text)
     _update_stats("성공", len(df))
 
+    status = f"조회 완료: {len(df):,}건"
+    if result.get("truncated"):
+        status = f"조회 완료: {len(df):,}건 이상 — 페이지 이동으로 전체 결과 조회"
+        if not first_page.get("ordered", True):
+            status = (f"조회 완료: {len(df):,}건 이상 — ORDER BY가 없는 SQL은 상위 {len(df):,}건까지만 페이지 이동 가능"
+                      " (전체 결과는 ORDER BY 추가 후 재실행하거나 내보내기 이용)")
+    if result.get("cached"):
+        status += " (캐시)"
+    usage = get_session_result_usage(session)
+    status += f" · 세션 결과 메모리 {usage['memory_bytes'] / 1024 / 1024:.1f} MB"
+    if usage["disk_bytes"]:
+        status += f" (디스크 {usage['disk_bytes'] / 1024 / 1024:.1f} MB)"
+
     total, rate, avg = _get_stat_values()
     return (
-        _df_to_html(df),
-        f"조회 완료: {len(df)}건",
-        report,
+        *_page_outputs(first_page),
+        status,
+        "",
         _get_history(),
         _get_history_sqls(),
         _build_stat_cards(total, rate, avg),
-        df,
+        handle,
     )
 
 
+async def process_page(handle: str, page: int, delta: int):
+    """결과 핸들의 이전/다음 페이지 조회"""
+    if not handle:
+        return _empty_page_outputs()
+    page_result = await afetch_page(handle, page + delta)
+    if page_result["error"]:
+        gr.Warning(page_result["error"])
+    return _page_outputs(page_result)
+
+
+async def process_prev_page(handle: str, page: int):
+    return await process_page(handle, page, -1)
+
+
+async def process_next_page(handle: str, page: int):
+    return await process_page(handle, page, 1)
+
+
+async def process_count(handle: str):
+    """전체 건수를 늦게 계산하여 표시 (1000행 상한에 도달한 결과만 COUNT(*) 실행)"""
+    if not handle:
+        return ""
+    total = await acount_rows(handle)
+    return f"전체 {total:,}건" if total is not None else ""
+
+
+def _release_session(request: gr.Request):
+    """브라우저 탭이 닫히면 해당 세션의 결과를 저장소에서 해제"""
+    if request and request.session_hash:
+        release_session_results(request.session_hash)
+
+
+# ===== 결과 보고서 생성 (SQL 실행 후속 이벤트) =====
+async def process_report(sql_text: str, question: str, model_key: str, reasoning: str, handle: str,
+                         report_enabled: bool):
+    """조회 결과가 화면에 표시된 뒤 LLM 보고서를 생성하여 report_output에 반영 (결과는 저장소에서 핸들로 조회)"""
+    df = await asyncio.to_thread(get_result_frame, handle) if report_enabled else None
+    if df is None or df.empty:
+        yield ""
+        return
+    if model_key not in MODEL_REGISTRY:
+        model_key = DEFAULT_MODEL_KEY
+    yield "*보고서 생성 중...*"
+    yield await agenerate_report(question or "", sql_text, df, reasoning, model_key=model_key)
+
+
 # ===== Gradio UI 구성 =====
 with gr.Blocks(title="HR Text2SQL Dashboard") as demo:
 
@@ -1556,8 +1778,9 @@ with gr.Blocks(title="HR Text2SQL Dashboard") as demo:
     # Hidden state for reasoning (passed between generate and execute)
     reasoning_state = gr.State("")
 
-    # Hidden state for raw DataFrame (used by CSV export)
-    result_df_state = gr.State(pd.DataFrame())
+    # Hidden state for result paging (결과 핸들, 현재 페이지) — DataFrame은 서버 결과 저장소에 보관
+    result_handle_state = gr.State("")
+    page_state = gr.State(0)
 
     with gr.Tabs():
         # ===== 탭 1: SQL 질의 =====
@@ -1624,7 +1847,8 @@ with gr.Blocks(title="HR Text2SQL Dashboard") as demo:
                 refresh_btn = gr.Button("🔄", size="sm", scale=0, min_width=50)
 
             # Row 2: Move ID + Question input + Generate button (single line)
-            _move_choices = _get_move_std_choices()
+            # 이동번호 목록은 로컬 카탈로그에서 로드 (DB 갱신분은 move_catalog_timer가 반영)
+            _move_choices = get_move_choices()
             with gr.Row(equal_height=True):
                 move_std_dropdown = gr.Dropdown(
                     show_label=False,
@@ -1644,7 +1868,7 @@ with gr.Blocks(title="HR Text2SQL Dashboard") as demo:
                 )
 
             # 이동번호 통계 (auto-update on dropdown change)
-            move_std_stats = gr.HTML(value=_get_move_std_stats(_move_choices[0][1] if _move_choices else "0"))
+            move_std_stats = gr.HTML(value="")
 
             # Generated SQL
             sql_output = gr.Textbox(
@@ -1664,7 +1888,16 @@ with gr.Blocks(title="HR Text2SQL Dashboard") as demo:
                     min_width=120,
                     elem_classes=["execute-btn"],
                 )
-                download_btn = gr.Button("CSV 다운로드", size="sm", variant="secondary")
+                export_format = gr.Dropdown(
+                    show_label=False,
+                    choices=[(_EXPORT_FORMAT_LABELS[f], f) for f in available_export_formats()],
+                    value="csv",
+                    scale=0,
+                    min_width=130,
+                    container=False,
+                )
+                download_btn = gr.Button("전체 내보내기", size="sm", variant="secondary")
+                report_toggle = gr.Checkbox(label="결과 보고서 생성", value=True, scale=0, min_width=160)
 
             # Status (moved below execute row)
             status_output = gr.Textbox(
@@ -1679,6 +1912,13 @@ with gr.Blocks(title="HR Text2SQL Dashboard") as demo:
             gr.Markdown("**조회 결과**")
             result_output = gr.HTML(value="")
 
+            # 결과 페이지 이동 (1000행 상한 이후도 서버에서 페이지 단위로 조회)
+            with gr.Row(equal_height=True):
+                prev_page_btn = gr.Button("◀ 이전", size="sm", scale=0, min_width=80, interactive=False)
+                page_info = gr.Markdown(value="")
+                total_info = gr.Markdown(value="")
+                next_page_btn = gr.Button("다음 ▶", size="sm", scale=0, min_width=80, interactive=False)
+
             with gr.Accordion("결과 보고서", open=True, elem_classes=["report-accordion"]):
                 report_output = gr.Markdown(value="")
 
@@ -1718,6 +1958,7 @@ with gr.Blocks(title="HR Text2SQL Dashboard") as demo:
                     value=_move_choices[0][1] if _move_choices else "0",
                     scale=2, min_width=200, container=False,
                 )
+                cnst_force_refresh = gr.Checkbox(label="새로 조회", value=False, scale=0, min_width=120)
                 cnst_analyze_btn = gr.Button("분석 실행", variant="primary", scale=0, min_width=120)
             gr.Markdown("**제약조건 요약**")
             cnst_summary_output = gr.HTML(value="")
@@ -1746,6 +1987,7 @@ with gr.Blocks(title="HR Text2SQL Dashboard") as demo:
                     value=_move_choices[0][1] if _move_choices else "0",
                     scale=2, min_width=200, container=False,
                 )
+                rpt_force_refresh = gr.Checkbox(label="새로 조회", value=False, scale=0, min_width=120)
                 rpt_generate_btn = gr.Button("리포트 생성", variant="primary", scale=0, min_width=120)
             gr.Markdown("**배치 요약**")
             rpt_summary_output = gr.HTML(value="")
@@ -1791,19 +2033,34 @@ with gr.Blocks(title="HR Text2SQL Dashboard") as demo:
         outputs=[model_dropdown, model_status],
     )
 
-    # 이동번호 변경 시 통계 자동 업데이트
+    # 이동번호 변경 시 통계 자동 업데이트 (첫 화면 로드 시에도 1회)
     move_std_dropdown.change(
         fn=_get_move_std_stats,
         inputs=[move_std_dropdown],
         outputs=[move_std_stats],
     )
+    demo.load(
+        fn=_get_move_std_stats,
+        inputs=[move_std_dropdown],
+        outputs=[move_std_stats],
+    )
+
+    # 이동번호 카탈로그 갱신분을 3개 Dropdown에 반영
+    move_catalog_version = gr.State(get_move_catalog_version())
+    move_catalog_timer = gr.Timer(MOVE_CATALOG_CONFIG["ui_poll_sec"])
+    move_catalog_timer.tick(
+        fn=_sync_move_choices,
+        inputs=[move_catalog_version, move_std_dropdown, cnst_move_dropdown, rpt_move_dropdown],
+        outputs=[move_std_dropdown, cnst_move_dropdown, rpt_move_dropdown, move_catalog_version],
+        show_progress="hidden",
+    )
 
     # SQL 생성 (버튼 클릭)
     generate_btn.click(
         fn=process_generate,
         inputs=[question_input, model_dropdown, move_std_dropdown],
         outputs=[sql_output, status_output, reasoning_state],
-        concurrency_limit=3,
+        concurrency_limit=None,  # 동시성은 백엔드별 세마포어/DB 풀이 제한
     )
 
     # SQL 생성 (Enter 키 제출)
@@ -1811,24 +2068,60 @@ with gr.Blocks(title="HR Text2SQL Dashboard") as demo:
         fn=process_generate,
         inputs=[question_input, model_dropdown, move_std_dropdown],
         outputs=[sql_output, status_output, reasoning_state],
-        concurrency_limit=3,
+        concurrency_limit=None,  # 동시성은 백엔드별 세마포어/DB 풀이 제한
     )
 
     # SQL 실행 (버튼 클릭) — now also updates stat_cards
-    execute_btn.click(
+    # 결과 표를 먼저 표시하고, 보고서는 후속 이벤트로 생성 (체크 해제 시 생략)
+    execute_event = execute_btn.click(
         fn=process_execute,
-        inputs=[sql_output, question_input, model_dropdown, reasoning_state],
-        outputs=[result_output, status_output, report_output, history_output, history_sqls_state, stat_cards, result_df_state],
-        concurrency_limit=3,
+        inputs=[sql_output, question_input, model_dropdown, reasoning_state, result_handle_state],
+        outputs=[result_output, page_info, prev_page_btn, next_page_btn, page_state,
+                 status_output, report_output, history_output, history_sqls_state, stat_cards,
+                 result_handle_state],
+        concurrency_limit=None,  # 동시성은 백엔드별 세마포어/DB 풀이 제한
+    )
+    execute_event.then(
+        fn=process_report,
+        inputs=[sql_output, question_input, model_dropdown, reasoning_state, result_handle_state, report_toggle],
+        outputs=[report_output],
+        concurrency_limit=None,
+        show_progress="minimal",
+    )
+    # 전체 건수는 보고서 생성과 별도로 늦게 계산
+    execute_event.then(
+        fn=process_count,
+        inputs=[result_handle_state],
+        outputs=[total_info],
+        concurrency_limit=None,
+        show_progress="hidden",
     )
 
-    # CSV 다운로드
+    # 결과 페이지 이동
+    prev_page_btn.click(
+        fn=process_prev_page,
+        inputs=[result_handle_state, page_state],
+        outputs=[result_output, page_info, prev_page_btn, next_page_btn, page_state],
+        concurrency_limit=None,
+    )
+    next_page_btn.click(
+        fn=process_next_page,
+        inputs=[result_handle_state, page_state],
+        outputs=[result_output, page_info, prev_page_btn, next_page_btn, page_state],
+        concurrency_limit=None,
+    )
+
+    # 결과 전체 내보내기 (CSV/Parquet/XLSX)
     download_btn.click(
-        fn=_export_csv,
-        inputs=[result_df_state],
-        outputs=[download_file],
+        fn=_export_result,
+        inputs=[result_handle_state, export_format],
+        outputs=[download_file, status_output],
+        concurrency_limit=None,  # 동시성은 DB 풀이 제한
     )
 
+    # 세션 종료 시 결과 저장소 정리
+    demo.unload(_release_session)
+
     # 이력 행 선택 시 SQL 표시
     history_output.select(
         fn=_on_history_select,
@@ -1846,7 +2139,7 @@ with gr.Blocks(title="HR Text2SQL Dashboard") as demo:
     # 제약조건 분석 실행
     cnst_analyze_btn.click(
         fn=_run_cnst_analysis,
-        inputs=[cnst_move_dropdown],
+        inputs=[cnst_move_dropdown, cnst_force_refresh],
         outputs=[cnst_summary_output, cnst_penalty_output, cnst_org_output],
         concurrency_limit=3,
     )
@@ -1854,7 +2147,7 @@ with gr.Blocks(title="HR Text2SQL Dashboard") as demo:
     # 배치 결과 리포트 생성
     rpt_generate_btn.click(
         fn=_run_batch_report,
-        inputs=[rpt_move_dropdown],
+        inputs=[rpt_move_dropdown, rpt_force_refresh],
         outputs=[rpt_summary_output, rpt_region_output, rpt_job_output, rpt_must_output, rpt_penalty_output, rpt_llm_output],
         concurrency_limit=3,
     )
@@ -1863,11 +2156,22 @@ with gr.Blocks(title="HR Text2SQL Dashboard") as demo:
 
 # 서버 시작
 if __name__ == "__main__":
+    if "--prewarm-snapshots" in sys.argv:
+        _prewarm_report_snapshots()
+        sys.exit(0)
+
     gradio_user = os.environ.get("GRADIO_USER")
     gradio_password = os.environ.get("GRADIO_PASSWORD")
     if not gradio_user or not gradio_password:
         raise RuntimeError("GRADIO_USER and GRADIO_PASSWORD environment variables must be set")
 
+    # 스키마 스냅샷 백그라운드 갱신 (DDL 변경 시 SYSTEM_PROMPT 교체)
+    start_schema_refresher()
+    # 이동번호 목록 백그라운드 갱신 (새 이동번호는 재시작 없이 Dropdown에 반영)
+    start_move_catalog_refresher()
+    # 최근 조회한 이동번호의 케이스 결과 변경 감지 (대시보드/결과 캐시 무효화)
+    start_change_probe()
+
     demo.launch(
         server_name=GRADIO_HOST,
         server_port=GRADIO_PORT,
@@ -0,0 +1,96 @@
+"""
+DataFrame dtype 압축 벤치마크
+move_item_master 조회 결과 형태의 DataFrame에 compact_frame을 적용하여
+- 컬럼별 압축 전후 dtype/메모리 보고서를 출력하고
+- 렌더러(HTML 표/그리드/제약조건 패널)와 보고서 미리보기 출력이 압축 전과 같은지 확인
+실행: python bench_compact.py [--rows 1000]
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from frame_compact import compact_frame, compaction_report, format_report
+from table_render import render_cnst_table, render_result_table, result_grid_payload
+
+_ORGS = [f"{name}사업소" for name in ("서울", "부산", "대구", "인천", "광주", "대전", "울산", "세종", "경기", "강원")]
+_LVL2 = ["본부", "지사", "지점", "센터"]
+_POS_GRADES = ["1직급", "2직급", "3직급", "4직급", "5직급", "6직급"]
+_JOB_TYPES = ["사무", "기술", "영업", "전산", "연구"]
+
+
+def item_frame(n_rows: int = 1000, seed: int = 0) -> tuple[pd.DataFrame, list]:
+    """
+    move_item_master 조회 결과 형태 (fetch_engine 컬럼 단위 변환 결과와 같은 dtype)
+
+    Returns: (DataFrame, 컬럼별 NUMBER(p,0) 정밀도 — cursor.description에서 구하는 값)
+    """
+    rng = np.random.default_rng(seed)
+    tenure = rng.integers(0, 400, n_rows).astype(np.float64)
+    tenure[::17] = np.nan  # NULL이 있는 NUMBER(5,0) → float64
+    score = rng.normal(80, 5, n_rows).round(2)
+    score[::23] = np.nan
+    df = pd.DataFrame({
+        "emp_no": np.array([f"E{i:07d}" for i in range(n_rows)], dtype=object),
+        "emp_nm": np.array([f"직원{i}" for i in range(n_rows)], dtype=object),
+        "org_nm": np.array(rng.choice(_ORGS, n_rows), dtype=object),
+        "lvl2_nm": np.array(rng.choice(_LVL2, n_rows), dtype=object),
+        "pos_grd_nm": np.array(rng.choice(_POS_GRADES, n_rows), dtype=object),
+        "job_type1": np.array([None if i % 29 == 0 else rng.choice(_JOB_TYPES) for i in range(n_rows)], dtype=object),
+        "move_std_id": np.full(n_rows, 202401, dtype=np.int64),
+        "case_id": np.full(n_rows, 3, dtype=np.int64),
+        "age": rng.integers(25, 60, n_rows),
+        "tenure_month": tenure,
+        "eval_score": score,
+        "hire_ymd": pd.to_datetime("2000-01-01") + pd.to_timedelta(rng.integers(0, 9000, n_rows), unit="D"),
+    })
+    digits = [None, None, None, None, None, None, 10, 5, 3, 5, None, None]
+    return df, digits
+
+
+def penalty_frame() -> pd.DataFrame:
+    """대시보드 감점 TOP 20 패널 형태"""
+    rows = [(f"감점항목{i}", i * 13, 10 if i % 3 else None, i * 130.5) for i in range(20)]
+    return pd.DataFrame(rows, columns=["감점항목명", "총위반건수", "건당감점값", "총감점합계"])
+
+
+def _check_outputs(before: pd.DataFrame, after: pd.DataFrame) -> dict:
+    """압축 전후 하위 출력 비교 (True면 동일)"""
+    return {
+        "HTML 표": render_result_table(before) == render_result_table(after),
+        "그리드": result_grid_payload(before)["rows"] == result_grid_payload(after)["rows"],
+        "제약조건 패널": (render_cnst_table(before, title="t", rank_col=True)
+                   == render_cnst_table(after, title="t", rank_col=True)),
+        "보고서 미리보기": before.head(20).to_string(index=False) == after.head(20).to_string(index=False),
+    }
+
+
+def _print_report(name: str, before: pd.DataFrame, after: pd.DataFrame, elapsed_ms: float):
+    report = compaction_report(before, after)
+    print(f"\n[{name}] {len(before):,}행 — {format_report(report)}, 압축 {elapsed_ms:.2f} ms")
+    print(f"  {'컬럼':<14}{'변환 전':>16}{'변환 후':>16}{'전(KB)':>10}{'후(KB)':>10}")
+    for col in report["columns"]:
+        print(f"  {col['name']:<14}{col['before_dtype']:>16}{col['after_dtype']:>16}"
+              f"{col['before_bytes'] / 1024:>10.1f}{col['after_bytes'] / 1024:>10.1f}")
+    for check, same in _check_outputs(before, after).items():
+        print(f"  출력 동일 ({check}): {'예' if same else '아니오'}")
+
+
+def main(n_rows: int):
+    df, digits = item_frame(n_rows)
+    t0 = time.perf_counter()
+    compact = compact_frame(df, integer_digits=digits)
+    _print_report("조회 결과", df, compact, (time.perf_counter() - t0) * 1000)
+
+    df = penalty_frame()
+    t0 = time.perf_counter()
+    compact = compact_frame(df)
+    _print_report("감점 TOP 20", df, compact, (time.perf_counter() - t0) * 1000)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="DataFrame dtype 압축 벤치마크")
+    parser.add_argument("--rows", type=int, default=1000, help="조회 결과 행 수")
+    args = parser.parse_args()
+    main(args.rows)
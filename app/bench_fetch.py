@@ -0,0 +1,112 @@
+"""
+조회 결과 변환 마이크로 벤치마크
+기존 경로(pd.read_sql — 행 튜플 → DataFrame)와 fetch_engine 경로(컬럼 단위 변환 / Arrow)를 비교
+실행: python bench_fetch.py            (합성 1000행 × 76컬럼, DB 불필요)
+      python bench_fetch.py --live     (실제 Oracle에서 move_item_master 1000행 조회 비교)
+"""
+import argparse
+import datetime
+import random
+import statistics
+import time
+
+import pandas as pd
+
+from fetch_engine import rows_to_frame, pyarrow
+
+N_ROWS = 1000
+N_COLS = 76  # move_item_master 컬럼 수
+
+
+def make_synthetic(n_rows: int = N_ROWS, n_cols: int = N_COLS, seed: int = 42):
+    """move_item_master와 비슷한 타입 구성(숫자 ID/코드 문자열/한글 이름/실수/날짜, 일부 NULL)의 행 튜플 생성"""
+    rng = random.Random(seed)
+    names = ["김민수", "이영희", "박지훈", "최수진", "정우성", "강하늘"]
+    kinds = [("int", "str", "name", "float", "date")[i % 5] for i in range(n_cols)]
+    columns = [f"col_{i:02d}_{k}" for i, k in enumerate(kinds)]
+    base = datetime.datetime(2025, 1, 1)
+
+    def value(kind):
+        if kind != "int" and rng.random() < 0.1:
+            return None
+        if kind == "int":
+            return rng.randint(1, 999999)
+        if kind == "str":
+            return f"C{rng.randint(0, 9999):04d}"
+        if kind == "name":
+            return rng.choice(names)
+        if kind == "float":
+            return round(rng.uniform(0, 100), 2)
+        return base + datetime.timedelta(days=rng.randint(0, 365))
+
+    rows = [tuple(value(k) for k in kinds) for _ in range(n_rows)]
+    # fetch_engine이 cursor.description에서 얻는 컬럼 변환 방식과 동일하게 구성
+    fetch_kinds = [{"int": "number", "float": "number", "date": "date"}.get(k) for k in kinds]
+    return rows, columns, fetch_kinds
+
+
+def _time(fn, repeat: int) -> tuple[float, object]:
+    """repeat회 실행한 소요시간 중앙값(ms)과 마지막 결과"""
+    samples = []
+    result = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples), result
+
+
+def bench_synthetic(repeat: int):
+    print("=" * 50)
+    print(f"[합성] {N_ROWS}행 × {N_COLS}컬럼 변환 (중앙값, {repeat}회)")
+    print("=" * 50)
+    rows, columns, kinds = make_synthetic()
+
+    # pd.read_sql 내부와 동일한 행 단위 변환 (SQLAlchemy Row → from_records)
+    base_ms, base_df = _time(lambda: pd.DataFrame.from_records(rows, columns=columns, coerce_float=True), repeat)
+    print(f"  기존 (from_records):      {base_ms:8.2f} ms")
+
+    col_ms, col_df = _time(lambda: rows_to_frame(rows, columns, kinds), repeat)
+    print(f"  컬럼 단위 (rows_to_frame): {col_ms:8.2f} ms  (x{base_ms / col_ms:.1f})")
+    pd.testing.assert_frame_equal(base_df, col_df)
+
+    if pyarrow is not None:
+        # fetch_df_all은 드라이버가 Arrow 버퍼를 직접 채우므로 to_pandas 변환 비용만 측정
+        table = pyarrow.table({c: list(v) for c, v in zip(columns, zip(*rows))})
+        arrow_ms, _ = _time(table.to_pandas, repeat)
+        print(f"  Arrow (to_pandas):        {arrow_ms:8.2f} ms  (x{base_ms / arrow_ms:.1f})")
+    else:
+        print("  Arrow: pyarrow 미설치 — 생략")
+
+    # 네트워크 왕복 수: oracledb 기본 arraysize=100, prefetchrows=2
+    print(f"  fetch 왕복 수: 기본 {N_ROWS // 100 + 1}회 → arraysize={N_ROWS} 적용 시 1회\n")
+
+
+def bench_live(sql: str, repeat: int):
+    from sqlalchemy import text
+    from db_setup import get_engine
+    from fetch_engine import fetch_frame
+
+    print("=" * 50)
+    print(f"[실DB] {sql} (중앙값, {repeat}회)")
+    print("=" * 50)
+    engine = get_engine()
+    with engine.connect() as conn:
+        dbapi_conn = conn.connection.dbapi_connection
+        base_ms, base_df = _time(lambda: pd.read_sql(text(sql), conn), repeat)
+        new_ms, new_df = _time(lambda: fetch_frame(dbapi_conn, sql), repeat)
+    print(f"  기존 (pd.read_sql):  {base_ms:8.2f} ms  ({base_df.shape[0]}행 × {base_df.shape[1]}컬럼)")
+    print(f"  fetch_engine:        {new_ms:8.2f} ms  (x{base_ms / new_ms:.1f})")
+    print(f"  컬럼명 일치: {list(base_df.columns) == list(new_df.columns)}\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="조회 결과 변환 벤치마크")
+    parser.add_argument("--live", action="store_true", help="실제 Oracle 조회도 비교")
+    parser.add_argument("--sql", default="SELECT * FROM move_item_master WHERE ROWNUM <= 1000")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    bench_synthetic(args.repeat)
+    if args.live:
+        bench_live(args.sql, max(3, args.repeat // 4))
@@ -0,0 +1,71 @@
+"""
+프롬프트 접두사 캐시 효과 측정
+SQL 캐시를 끈 채로 예시 질문들을 순서대로 보내 요청별 TTFT와 vLLM 접두사 캐시 적중 토큰을 비교
+- 첫 요청(cold)은 고정 접두사 전체를 prefill, 이후 요청(warm)은 접두사 KV 캐시를 재사용
+- vLLM /metrics의 prefix_cache 카운터 증가분으로 서버 측 적중률도 함께 출력
+실행: python bench_prompt.py [--model gpt-oss-120b] [--rounds 2] [--move 202409]
+"""
+import argparse
+
+from config import DEFAULT_MODEL_KEY
+from llm_metrics import scrape_prefix_cache_counters
+from model_registry import get_model_config
+import text2sql_pipeline
+from text2sql_pipeline import ensure_schema, generate_sql_stream, get_llm_metrics, PROMPT_VERSION
+
+QUESTIONS = [
+    "직급별 인원 수를 구해줘",
+    "권역별 직원 수를 보여줘",
+    "위반 건수가 많은 제약조건 TOP 10",
+    "사업소별 정원과 현재 배치 인원을 비교해줘",
+    "근무 기간이 가장 긴 직원 TOP 10을 알려줘",
+]
+
+
+def run(model_key: str, rounds: int, move_std_id: str = ""):
+    base_url = get_model_config(model_key)["base_url"]
+    ensure_schema()  # 스냅샷이 없으면 DB에서 조회 (백그라운드 갱신 스레드 없이 실행)
+    state = text2sql_pipeline._prompt_state
+    print("=" * 50)
+    print(f"[접두사 캐시] 모델 {model_key}, 프롬프트 버전 {PROMPT_VERSION}, "
+          f"고정 접두사 {state['prefix_tokens']:,} 토큰 ({state['prefix_digest']})")
+    print("=" * 50)
+    before = scrape_prefix_cache_counters(base_url)
+
+    for r in range(rounds):
+        for q in QUESTIONS:
+            question = f"[이동번호(FTR_MOVE_STD_ID)={move_std_id} 조건 필수] {q}" if move_std_id else q
+            result = {}
+            for result in generate_sql_stream(question, model_key=model_key, use_cache=False):
+                pass
+            llm = result.get("llm") or {}
+            ttft = f"{llm['ttft']:.3f}s" if llm.get("ttft") is not None else "-"
+            cached = llm.get("cached_tokens")
+            prompt = llm.get("prompt_tokens")
+            usage = f"{cached:,}/{prompt:,}" if cached is not None and prompt else "-"
+            print(f"  [{r + 1}] TTFT {ttft:>8}  캐시/프롬프트 {usage:>13}  {q}")
+
+    stats = get_llm_metrics(model_key)
+    print(f"\n  TTFT p50 {stats['ttft_p50']}s, p95 {stats['ttft_p95']}s "
+          f"(전체 p50 {stats['latency_p50']}s, {stats['count']}건)")
+    if stats["prefix_hit_rate"] is not None:
+        print(f"  응답 usage 기준 접두사 캐시 적중률: {stats['prefix_hit_rate']}% ({stats['hit_rate_samples']}건 기준)")
+    else:
+        print("  응답 usage 기준 접두사 캐시 적중률: - (조기 종료로 캐시 토큰 수를 받은 요청 없음)")
+
+    after = scrape_prefix_cache_counters(base_url)
+    if before and after and after["queries"] > before["queries"]:
+        queries = after["queries"] - before["queries"]
+        hits = after["hits"] - before["hits"]
+        print(f"  vLLM /metrics 기준: 조회 {queries:,} 토큰 중 {hits:,} 적중 ({hits / queries * 100:.1f}%)")
+    else:
+        print("  vLLM /metrics 접두사 캐시 카운터를 읽지 못했습니다")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="프롬프트 접두사 캐시 효과 측정")
+    parser.add_argument("--model", default=DEFAULT_MODEL_KEY)
+    parser.add_argument("--rounds", type=int, default=2)
+    parser.add_argument("--move", default="", help="이동번호 조건 (예: 202409)")
+    args = parser.parse_args()
+    run(args.model, args.rounds, args.move)
@@ -0,0 +1,163 @@
+"""
+HTML 테이블 렌더러 벤치마크
+변경 전 app.py의 iterrows() 기반 렌더러와 table_render의 열 단위 렌더러를 비교
+- 1000행 × 76열 조회 결과(move_item_master 형태)와 30행 × 7열 제약조건 패널
+- 소요시간(중앙값)을 출력하고 두 구현의 출력이 바이트 단위로 같은지 확인
+실행: python bench_render.py [--repeat 5]
+"""
+import argparse
+import html as _html_mod
+import statistics
+import time
+
+import numpy as np
+import pandas as pd
+
+from table_render import render_cnst_table, render_result_table
+
+
+# ===== 변경 전 app.py 렌더러 (비교 기준) =====
+def legacy_df_to_html(df):
+    if not isinstance(df, pd.DataFrame) or df.empty:
+        return '<div style="padding:20px;text-align:center;color:#9ca3af;">조회 결과가 없습니다.</div>'
+    max_display = 500
+    total = len(df)
+    html = '<div style="border-radius:12px;overflow:hidden;border:1px solid #e5e7eb;">'
+    if total > 30:
+        html += '<div style="max-height:500px;overflow:auto;">'
+    html += '<table style="width:100%;border-collapse:collapse;font-size:13px;">'
+    html += '<thead style="position:sticky;top:0;z-index:1;"><tr>'
+    for col in df.columns:
+        html += f'<th style="background:#f8fafc;padding:10px 14px;text-align:left;font-weight:600;color:#374151;border-bottom:2px solid #e5e7eb;white-space:nowrap;position:relative;min-width:60px;">{col}<div class="col-resize-handle" style="position:absolute;right:0;top:0;bottom:0;width:5px;cursor:col-resize;background:transparent;z-index:2;"></div></th>'
+    html += '</tr></thead>'
+    html += '<tbody>'
+    display_df = df.head(max_display)
+    for i, (_, row) in enumerate(display_df.iterrows()):
+        bg = '#ffffff' if i % 2 == 0 else '#f9fafb'
+        html += f'<tr style="background:{bg};">'
+        for val in row:
+            cell_val = '' if pd.isna(val) else _html_mod.escape(str(val))
+            html += f'<td style="padding:8px 14px;border-bottom:1px solid #f1f5f9;color:#111827;white-space:nowrap;">{cell_val}</td>'
+        html += '</tr>'
+    html += '</tbody></table>'
+    if total > 30:
+        html += '</div>'
+    if total > max_display:
+        html += f'<div style="padding:8px 14px;background:#f8fafc;color:#6b7280;font-size:12px;border-top:1px solid #e5e7eb;">전체 {total}건 중 {max_display}건 표시</div>'
+    html += '</div>'
+    return html
+
+
+def legacy_cnst_df_to_html(df, title="", badge_col=None, rank_col=False):
+    if not isinstance(df, pd.DataFrame) or df.empty:
+        return '<div style="padding:20px;text-align:center;color:#9ca3af;">데이터 없음</div>'
+    header = ""
+    if title:
+        header = (f'<div style="padding:10px 16px 8px;font-weight:700;font-size:14px;'
+                  f'color:#374151;border-bottom:2px solid #667eea20;">{title}'
+                  f'<span style="margin-left:8px;font-size:12px;font-weight:400;color:#9ca3af;">({len(df)}건)</span></div>')
+    html = f'<div style="border-radius:12px;overflow:hidden;border:1px solid #e5e7eb;box-shadow:0 2px 8px rgba(0,0,0,0.04);">{header}'
+    if len(df) > 25:
+        html += '<div style="max-height:420px;overflow:auto;">'
+    html += '<table style="width:100%;border-collapse:collapse;font-size:13px;">'
+    html += '<thead style="position:sticky;top:0;z-index:1;"><tr>'
+    if rank_col:
+        html += '<th style="background:#f8fafc;padding:9px 10px;text-align:center;font-weight:600;color:#6b7280;border-bottom:2px solid #e5e7eb;width:36px;">#</th>'
+    for col in df.columns:
+        html += f'<th style="background:#f8fafc;padding:9px 14px;text-align:left;font-weight:600;color:#374151;border-bottom:2px solid #e5e7eb;white-space:nowrap;">{col}</th>'
+    html += '</tr></thead><tbody>'
+    for i, (_, row) in enumerate(df.iterrows()):
+        bg = '#ffffff' if i % 2 == 0 else '#f9fafb'
+        html += f'<tr style="background:{bg};">'
+        if rank_col:
+            rc = "#667eea" if i < 3 else "#9ca3af"
+            html += f'<td style="padding:8px 10px;text-align:center;color:{rc};font-weight:700;border-bottom:1px solid #f1f5f9;">{i+1}</td>'
+        for col in df.columns:
+            val = row[col]
+            cell = '' if pd.isna(val) else _html_mod.escape(str(val))
+            style = "padding:8px 14px;border-bottom:1px solid #f1f5f9;color:#111827;"
+            if col == badge_col:
+                if cell == 'Y':
+                    cell = '<span style="background:#10b98120;color:#10b981;padding:2px 8px;border-radius:10px;font-size:12px;font-weight:600;">Y</span>'
+                else:
+                    cell = '<span style="background:#9ca3af20;color:#9ca3af;padding:2px 8px;border-radius:10px;font-size:12px;font-weight:600;">N</span>'
+            elif isinstance(val, (int, float)) and not pd.isna(val):
+                try:
+                    cell = f'{int(val):,}' if float(val) == int(float(val)) else f'{float(val):,.2f}'
+                except (ValueError, OverflowError):
+                    pass
+                style += "text-align:right;font-variant-numeric:tabular-nums;"
+            html += f'<td style="{style}">{cell}</td>'
+        html += '</tr>'
+    html += '</tbody></table>'
+    if len(df) > 25:
+        html += '</div>'
+    html += '</div>'
+    return html
+
+
+# ===== 테스트 데이터 =====
+def result_frame(n_rows: int = 1000, n_cols: int = 76, seed: int = 0) -> pd.DataFrame:
+    """move_item_master 조회 결과 형태 (문자/정수/실수/날짜/결측 혼합, 이스케이프 대상 문자 포함)"""
+    rng = np.random.default_rng(seed)
+    data = {}
+    for j in range(n_cols):
+        kind = j % 5
+        if kind == 0:
+            data[f"COL_{j}"] = [f"조직<{i % 17}>&'{j}'" if i % 11 else None for i in range(n_rows)]
+        elif kind == 1:
+            data[f"COL_{j}"] = rng.integers(0, 100000, n_rows)
+        elif kind == 2:
+            values = rng.normal(0, 1000, n_rows)
+            values[::13] = np.nan
+            data[f"COL_{j}"] = values
+        elif kind == 3:
+            data[f"COL_{j}"] = pd.date_range("2024-01-01", periods=n_rows, freq="h")
+        else:
+            data[f"COL_{j}"] = rng.choice(["Y", "N", '"따옴표"'], n_rows)
+    return pd.DataFrame(data)
+
+
+def cnst_frame(n_rows: int = 30) -> pd.DataFrame:
+    """제약조건 요약 패널 형태 (7열)"""
+    return pd.DataFrame({
+        "제약코드": [f"C{i:03d}" for i in range(n_rows)],
+        "제약조건명": [f"제약 <{i}> & 조건" for i in range(n_rows)],
+        "제약구분": ["HARD" if i % 3 else "SOFT" for i in range(n_rows)],
+        "사용여부": ["Y" if i % 4 else "N" for i in range(n_rows)],
+        "제약값": [i * 1.5 if i % 5 else None for i in range(n_rows)],
+        "패널티값": [i * 1000 for i in range(n_rows)],
+        "적용사업소수": [i % 9 for i in range(n_rows)],
+    })
+
+
+def _median_ms(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(times)
+
+
+def main(repeat: int):
+    cases = [
+        ("조회 결과 1000x76", lambda df: legacy_df_to_html(df), lambda df: render_result_table(df), result_frame()),
+        ("제약조건 30x7", lambda df: legacy_cnst_df_to_html(df, title="제약조건 요약", badge_col="사용여부"),
+         lambda df: render_cnst_table(df, title="제약조건 요약", badge_col="사용여부"), cnst_frame()),
+        ("감점 TOP 30x7 (순위)", lambda df: legacy_cnst_df_to_html(df, title="감점 TOP", rank_col=True),
+         lambda df: render_cnst_table(df, title="감점 TOP", rank_col=True), cnst_frame()),
+    ]
+    print(f"{'케이스':<24}{'기존(ms)':>12}{'열 단위(ms)':>14}{'배율':>8}  출력 동일")
+    for name, legacy, vectorized, df in cases:
+        same = legacy(df) == vectorized(df)
+        legacy_ms = _median_ms(lambda: legacy(df), repeat)
+        new_ms = _median_ms(lambda: vectorized(df), repeat)
+        print(f"{name:<24}{legacy_ms:>12.2f}{new_ms:>14.2f}{legacy_ms / new_ms:>7.1f}x  {'예' if same else '아니오'}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="HTML 테이블 렌더러 벤치마크")
+    parser.add_argument("--repeat", type=int, default=5, help="반복 횟수 (중앙값 사용)")
+    args = parser.parse_args()
+    main(args.repeat)
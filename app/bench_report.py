@@ -0,0 +1,141 @@
+"""
+배치 결과 리포트 집계 벤치마크
+기존 패널별 쿼리 4회(요약/권역/필수이동·유보/직무)와 GROUPING SETS 쿼리 1회를 같은 세션에서 비교
+- 소요시간(중앙값)과 v$mystat 세션 통계 증분(논리 읽기, 물리 읽기, 스캔 행 수)을 출력
+- v$mystat 조회 권한이 없으면 소요시간만 비교
+실행: python bench_report.py --move 202409 [--repeat 5]
+"""
+import argparse
+import statistics
+import time
+
+from case_resolver import latest_case_id
+from dashboard_data import MOVE_AGGREGATE_SQL, split_move_aggregates
+from db_pool import pooled_connection
+
+_JOIN = """
+    FROM HRAI_CON.move_item_master m
+    LEFT JOIN HRAI_CON.move_case_item c
+        ON m.ftr_move_std_id = c.ftr_move_std_id AND m.emp_id = c.emp_id
+        AND c.rev_id = '999'
+        AND c.case_id = (SELECT MAX(case_id) FROM HRAI_CON.MOVE_CASE_MASTER WHERE ftr_move_std_id = :mid)
+    WHERE m.ftr_move_std_id = :mid
+"""
+_MOVED = "SUM(CASE WHEN c.new_org_id IS NOT NULL AND c.new_org_id != m.lvl5_id THEN 1 ELSE 0 END)"
+_MUST_CAT = """CASE WHEN m.must_move_yn = 1 THEN '필수이동'
+                    WHEN m.must_stay_yn = 1 THEN '필수유보'
+                    ELSE '일반' END"""
+
+# 변경 전 app.py 패널별 쿼리 (비교 기준)
+LEGACY_SQL = {
+    "summary": f"""
+        SELECT COUNT(*), {_MOVED},
+               SUM(CASE WHEN c.must_stay_yn = 1 THEN 1 ELSE 0 END),
+               SUM(CASE WHEN c.new_org_id IS NULL THEN 1 ELSE 0 END)
+        {_JOIN}""",
+    "region": f"""
+        SELECT NVL(m.lvl2_nm, '(미지정)'), COUNT(*), {_MOVED},
+               SUM(CASE WHEN c.new_org_id IS NULL OR c.new_org_id = m.lvl5_id THEN 1 ELSE 0 END)
+        {_JOIN}
+        GROUP BY m.lvl2_nm ORDER BY m.lvl2_nm""",
+    "must": f"""
+        SELECT {_MUST_CAT}, COUNT(*), {_MOVED}
+        {_JOIN}
+        GROUP BY {_MUST_CAT} ORDER BY 1""",
+    "job": f"""
+        SELECT NVL(m.job_type1, '(미지정)'), COUNT(*), {_MOVED}
+        {_JOIN}
+        GROUP BY m.job_type1 ORDER BY COUNT(*) DESC""",
+}
+
+_STAT_NAMES = ("session logical reads", "physical reads", "table scan rows gotten")
+_STAT_SQL = """
+    SELECT n.name, s.value
+    FROM v$mystat s JOIN v$statname n ON s.statistic# = n.statistic#
+    WHERE n.name IN ('session logical reads', 'physical reads', 'table scan rows gotten')
+"""
+
+
+def _session_stats(cur) -> dict | None:
+    """현재 세션 누적 통계 (권한 없으면 None)"""
+    try:
+        cur.execute(_STAT_SQL)
+        return dict(cur.fetchall())
+    except Exception:
+        return None
+
+
+def _run_legacy(cur, mid):
+    results = {}
+    for name, sql in LEGACY_SQL.items():
+        cur.execute(sql, {"mid": mid})
+        results[name] = cur.fetchall()
+    return {
+        "summary": results["summary"][0],
+        "region": [tuple(r) for r in results["region"]],
+        "job": [tuple(r) for r in results["job"]],
+        "must": [tuple(r) for r in results["must"]],
+    }
+
+
+def _run_grouping_sets(cur, mid):
+    # 운영 경로와 같이 최종 case_id는 캐시된 상수로 바인드 (첫 호출만 조회)
+    cur.execute(MOVE_AGGREGATE_SQL, {"mid": mid, "cid": latest_case_id(mid)})
+    return split_move_aggregates(cur.fetchall())
+
+
+def _measure(cur, fn, mid, repeat: int) -> tuple[float, dict | None, dict]:
+    """repeat회 실행한 소요시간 중앙값(ms), 1회당 세션 통계 증분, 마지막 결과"""
+    samples = []
+    before = _session_stats(cur)
+    result = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn(cur, mid)
+        samples.append((time.perf_counter() - t0) * 1000)
+    after = _session_stats(cur)
+    delta = None
+    if before and after:
+        # 통계 조회 자체의 증분은 무시할 수준이므로 보정하지 않음
+        delta = {name: (after.get(name, 0) - before.get(name, 0)) / repeat for name in _STAT_NAMES}
+    return statistics.median(samples), delta, result
+
+
+def run(mid: int, repeat: int):
+    print("=" * 50)
+    print(f"[배치 결과 리포트 집계] 이동번호 {mid} (중앙값, {repeat}회)")
+    print("=" * 50)
+    with pooled_connection() as conn:
+        with conn.cursor() as cur:
+            # 첫 실행은 하드 파싱/버퍼 캐시 적재가 섞이므로 양쪽 모두 1회씩 예열
+            _run_legacy(cur, mid)
+            _run_grouping_sets(cur, mid)
+            legacy_ms, legacy_stats, legacy = _measure(cur, _run_legacy, mid, repeat)
+            new_ms, new_stats, new = _measure(cur, _run_grouping_sets, mid, repeat)
+
+    print(f"  기존 (패널별 쿼리 4회):   {legacy_ms:8.2f} ms")
+    print(f"  GROUPING SETS (1회):     {new_ms:8.2f} ms  (x{legacy_ms / new_ms:.1f})")
+    if legacy_stats and new_stats:
+        for name in _STAT_NAMES:
+            old, cur_val = legacy_stats[name], new_stats[name]
+            ratio = f"{(1 - cur_val / old) * 100:5.1f}% 감소" if old else "-"
+            print(f"  {name:<24} {old:12,.0f} → {cur_val:12,.0f}  ({ratio})")
+    else:
+        print("  v$mystat 조회 권한 없음 — 세션 통계 비교 생략")
+
+    # 직무별은 총원 동률 행의 순서가 실행마다 달라질 수 있어 정렬 후 비교
+    same = (
+        tuple(legacy["summary"]) == tuple(new["summary"])
+        and legacy["region"] == new["region"]
+        and legacy["must"] == new["must"]
+        and sorted(legacy["job"]) == sorted(new["job"])
+    )
+    print(f"  패널 데이터 일치: {same}\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="배치 결과 리포트 집계 벤치마크")
+    parser.add_argument("--move", type=int, required=True, help="이동번호 (예: 202409)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(args.move, args.repeat)
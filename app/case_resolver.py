@@ -0,0 +1,143 @@
+"""
+이동번호별 최종 케이스 조회 캐시
+대시보드 쿼리와 few-shot SQL이 반복하는 (SELECT MAX(case_id) FROM move_case_master WHERE ftr_move_std_id = ...)
+서브쿼리 대신, 최종 case_id/case_det_id를 한 번 조회해 캐싱하고 바인드 상수로 넘김
+- 옵티마이저가 case_id를 상수로 알 수 있어 파티션/인덱스 접근 경로를 선택할 수 있음
+- TTL 만료 후 재조회 시 최종 케이스가 바뀌었으면 구독자(결과 캐시 등)에 변경 통지
+"""
+import logging
+import re
+import threading
+
+from change_probe import subscribe_changes
+from config import CASE_RESOLVER_CONFIG
+from db_pool import pooled_connection
+from result_cache import extract_move_ids
+from sql_cache import LRUTTLCache
+
+logger = logging.getLogger(__name__)
+
+_LATEST_CASE_SQL = """
+    SELECT cm.case_id,
+           (SELECT MAX(cd.case_det_id) FROM HRAI_CON.move_case_detail cd
+            WHERE cd.ftr_move_std_id = :mid AND cd.case_id = cm.case_id) AS case_det_id
+    FROM (SELECT MAX(case_id) AS case_id FROM HRAI_CON.move_case_master WHERE ftr_move_std_id = :mid) cm
+"""
+
+# (SELECT MAX(case_id) FROM [HRAI_CON.]move_case_master [별칭] WHERE [별칭.]ftr_move_std_id = <리터럴|컬럼|바인드>)
+_LATEST_CASE_SUBQUERY_RE = re.compile(
+    r"\(\s*SELECT\s+MAX\s*\(\s*(?:\w+\.)?case_id\s*\)\s+FROM\s+(?:HRAI_CON\.)?move_case_master(?:\s+\w+)?"
+    r"\s+WHERE\s+(?:\w+\.)?ftr_move_std_id\s*=\s*([\w.:]+)\s*\)",
+    re.IGNORECASE,
+)
+
+
+class CaseResolver:
+    """ftr_move_std_id -> {"case_id", "case_det_id"} 캐시 (thread-safe, 케이스가 없으면 둘 다 None)"""
+
+    def __init__(self, ttl: float = 60, max_entries: int = 1000):
+        self._cache = LRUTTLCache(max_entries=max_entries, ttl=ttl)
+        self._known = {}  # 변경 감지용 마지막 조회값 (TTL 만료와 무관하게 유지)
+        self._listeners = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, callback):
+        """최종 케이스 변경 시 callback(move_std_id: str, old: dict, new: dict) 호출"""
+        with self._lock:
+            self._listeners.append(callback)
+
+    def resolve(self, move_std_id) -> dict:
+        """이동번호의 최종 케이스 (캐시 우선, 만료/미조회 시 DB 조회)"""
+        key = str(int(move_std_id))
+        latest = self._cache.get(key)
+        if latest is not None:
+            return latest
+
+        with pooled_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(_LATEST_CASE_SQL, {"mid": int(key)})
+                row = cur.fetchone()
+        latest = {
+            "case_id": int(row[0]) if row and row[0] is not None else None,
+            "case_det_id": int(row[1]) if row and row[1] is not None else None,
+        }
+        self._cache.set(key, latest)
+
+        with self._lock:
+            previous = self._known.get(key)
+            self._known[key] = latest
+            listeners = list(self._listeners)
+        if previous is not None and previous != latest:
+            logger.info(f"이동번호 {key} 최종 케이스 변경: {previous} → {latest}")
+            for callback in listeners:
+                try:
+                    callback(key, previous, latest)
+                except Exception as e:
+                    logger.warning(f"최종 케이스 변경 통지 실패: {e}")
+        return latest
+
+    def invalidate(self, move_std_id=None):
+        """캐시 항목 제거 (None이면 전체) — 다음 조회 시 DB에서 다시 확인"""
+        if move_std_id is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(str(int(move_std_id)))
+
+    def stats(self) -> dict:
+        return self._cache.stats()
+
+
+_resolver = CaseResolver(ttl=CASE_RESOLVER_CONFIG["ttl_sec"])
+
+# 케이스 결과 테이블이 바뀌면 새 케이스가 생겼을 수 있으므로 TTL을 기다리지 않고 다시 확인
+subscribe_changes(lambda move_std_id, changed: _resolver.invalidate(move_std_id))
+
+
+def resolve_latest_case(move_std_id) -> dict:
+    return _resolver.resolve(move_std_id)
+
+
+def latest_case_id(move_std_id) -> int | None:
+    """이동번호의 최종 case_id (케이스가 없으면 None — 바인드하면 MAX 서브쿼리와 같이 0건)"""
+    return _resolver.resolve(move_std_id)["case_id"]
+
+
+def subscribe_case_changes(callback):
+    _resolver.subscribe(callback)
+
+
+def invalidate_latest_case(move_std_id=None):
+    _resolver.invalidate(move_std_id)
+
+
+def get_case_resolver_stats() -> dict:
+    return _resolver.stats()
+
+
+def rewrite_latest_case_sql(sql: str) -> str:
+    """
+    SQL의 최종 케이스 서브쿼리를 조회된 case_id 상수로 치환
+
+    - ftr_move_std_id = 123 (리터럴) 형태는 해당 이동번호로 치환
+    - ftr_move_std_id = m.ftr_move_std_id (상관 서브쿼리) 형태는 SQL 전체가 이동번호 리터럴 1개만
+      참조할 때만 치환 (여러 이동번호에 걸친 SQL은 행마다 최종 케이스가 다르므로 유지)
+    - 바인드 변수, 케이스가 없는 이동번호, 조회 실패 시에는 원문 유지
+    """
+    if not _LATEST_CASE_SUBQUERY_RE.search(sql):
+        return sql
+    move_ids = extract_move_ids(sql)
+    single_mid = next(iter(move_ids)) if len(move_ids) == 1 else None
+
+    def _replace(match):
+        target = match.group(1)
+        mid = target if target.isdigit() else (single_mid if not target.startswith(":") else None)
+        if mid is None:
+            return match.group(0)
+        try:
+            case_id = latest_case_id(mid)
+        except Exception as e:
+            logger.warning(f"최종 케이스 조회 실패 (이동번호 {mid}): {e}")
+            return match.group(0)
+        return match.group(0) if case_id is None else str(case_id)
+
+    return _LATEST_CASE_SUBQUERY_RE.sub(_replace, sql)
@@ -0,0 +1,165 @@
+"""
+이동번호 단위 변경 감지
+최적화 엔진이 새 리비전을 기록하는 케이스 결과 테이블(move_case_item, move_case_penalty_info,
+move_case_cnst_master)의 MAX(ORA_ROWSCN)과 행 수를 이동번호별로 한 번의 쿼리로 샘플링하여,
+이전 값과 다르면 구독한 캐시에 (이동번호, 변경 테이블)을 통지
+- ORA_ROWSCN은 ROWDEPENDENCIES가 없는 테이블에서 블록 단위라 실제 변경보다 넓게 감지될 수 있음 (누락은 없음)
+- ensure_fresh(): 캐시 조회 직전에 호출 — 이동번호별 min_interval_sec 안에서는 재조회하지 않음
+- start_change_probe(): 최근 조회된 이동번호를 poll_sec 주기로 확인하는 백그라운드 스레드
+"""
+import logging
+import threading
+import time
+
+from config import CHANGE_PROBE_CONFIG
+from db_pool import pooled_connection
+
+logger = logging.getLogger(__name__)
+
+PROBE_TABLES = ("move_case_item", "move_case_penalty_info", "move_case_cnst_master")
+
+
+def _probe_sql(n_moves: int) -> str:
+    placeholders = ", ".join(f":m{i}" for i in range(n_moves))
+    return "\nUNION ALL\n".join(
+        f"SELECT '{table}', ftr_move_std_id, MAX(ORA_ROWSCN), COUNT(*) FROM HRAI_CON.{table} "
+        f"WHERE ftr_move_std_id IN ({placeholders}) GROUP BY ftr_move_std_id"
+        for table in PROBE_TABLES
+    )
+
+
+def sample_signatures(move_std_ids) -> dict:
+    """
+    이동번호별 테이블 서명 조회 (테이블 수와 무관하게 쿼리 1회)
+
+    Returns: {"202409": {"move_case_item": (max_scn, row_count), ...}} — 행이 없는 테이블은 (None, 0)
+    """
+    move_ids = sorted({str(int(m)) for m in move_std_ids})
+    signatures = {mid: {t: (None, 0) for t in PROBE_TABLES} for mid in move_ids}
+    if not move_ids:
+        return signatures
+    with pooled_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(_probe_sql(len(move_ids)), {f"m{i}": int(m) for i, m in enumerate(move_ids)})
+            for table, mid, scn, count in cur.fetchall():
+                signatures[str(int(mid))][table] = (int(scn) if scn is not None else None, int(count))
+    return signatures
+
+
+class ChangeProbe:
+    """이동번호별 마지막 서명 보관 및 변경 통지 (thread-safe)"""
+
+    def __init__(self, min_interval: float = 10):
+        self.min_interval = min_interval
+        self._signatures = {}   # mid -> {table: (scn, count)}
+        self._checked_at = {}   # mid -> 마지막 확인 시각 (폴링 대상 목록 겸용)
+        self._listeners = []    # (callback, tables)
+        self._lock = threading.Lock()
+
+    def subscribe(self, callback, tables=None):
+        """
+        변경 통지 구독 — callback(move_std_id: str, changed_tables: set)
+
+        tables를 지정하면 그 테이블이 바뀐 경우에만 호출
+        """
+        with self._lock:
+            self._listeners.append((callback, set(tables) if tables else None))
+
+    def check(self, move_std_ids) -> dict:
+        """이동번호들을 즉시 확인하고 변경된 것만 {mid: 변경 테이블 set}으로 반환 (구독자 통지 포함)"""
+        fresh = sample_signatures(move_std_ids)
+        now = time.time()
+        changes = {}
+        with self._lock:
+            for mid, tables in fresh.items():
+                previous = self._signatures.get(mid)
+                self._signatures[mid] = tables
+                self._checked_at[mid] = now
+                if previous is None:
+                    continue  # 첫 확인은 기준값 기록만
+                changed = {t for t in PROBE_TABLES if tables[t] != previous.get(t)}
+                if changed:
+                    changes[mid] = changed
+            listeners = list(self._listeners)
+
+        for mid, changed in changes.items():
+            logger.info(f"이동번호 {mid} 데이터 변경 감지: {', '.join(sorted(changed))}")
+            for callback, tables in listeners:
+                if tables is None or tables & changed:
+                    try:
+                        callback(mid, changed)
+                    except Exception as e:
+                        logger.warning(f"변경 통지 실패 ({mid}): {e}")
+        return changes
+
+    def ensure_fresh(self, move_std_id) -> set:
+        """min_interval 이내에 확인한 적이 없으면 확인 (조회 실패 시 캐시를 그대로 쓰도록 빈 set)"""
+        mid = str(int(move_std_id))
+        with self._lock:
+            checked_at = self._checked_at.get(mid, 0)
+        if time.time() - checked_at < self.min_interval:
+            return set()
+        try:
+            return self.check([mid]).get(mid, set())
+        except Exception as e:
+            logger.warning(f"변경 감지 조회 실패 ({mid}): {e}")
+            return set()
+
+    def signature(self, move_std_id) -> dict | None:
+        """마지막으로 확인한 서명 (확인한 적 없으면 None)"""
+        with self._lock:
+            return self._signatures.get(str(int(move_std_id)))
+
+    def watched(self, max_idle: float) -> list[str]:
+        """최근 max_idle초 안에 확인된 이동번호 (백그라운드 폴링 대상)"""
+        cutoff = time.time() - max_idle
+        with self._lock:
+            return [mid for mid, t in self._checked_at.items() if t >= cutoff]
+
+
+_probe = ChangeProbe(min_interval=CHANGE_PROBE_CONFIG["min_interval_sec"])
+_probe_stop = threading.Event()
+_probe_thread = None
+
+
+def subscribe_changes(callback, tables=None):
+    _probe.subscribe(callback, tables)
+
+
+def ensure_fresh(move_std_id) -> set:
+    """캐시 조회 전 변경 확인 (비활성화 시 아무것도 하지 않음)"""
+    if not CHANGE_PROBE_CONFIG["enabled"] or not move_std_id or str(move_std_id) == "0":
+        return set()
+    return _probe.ensure_fresh(move_std_id)
+
+
+def current_signature(move_std_id) -> dict | None:
+    """ensure_fresh()로 마지막 확인한 이동번호 서명 (비활성화 또는 미확인 시 None)"""
+    if not CHANGE_PROBE_CONFIG["enabled"]:
+        return None
+    return _probe.signature(move_std_id)
+
+
+def _probe_loop(interval_sec: float):
+    """최근 사용된 이동번호를 주기적으로 한 번에 확인 (사용이 끊긴 이동번호는 1일 후 제외)"""
+    while not _probe_stop.wait(interval_sec):
+        move_ids = _probe.watched(max_idle=24 * 3600)
+        if not move_ids:
+            continue
+        try:
+            _probe.check(move_ids)
+        except Exception as e:
+            logger.warning(f"변경 감지 백그라운드 확인 실패: {e}")
+
+
+def start_change_probe(interval_sec: float = None):
+    """변경 감지 백그라운드 스레드 시작 (비활성화 또는 중복 호출 시 무시)"""
+    global _probe_thread
+    if not CHANGE_PROBE_CONFIG["enabled"] or (_probe_thread and _probe_thread.is_alive()):
+        return
+    interval_sec = interval_sec or CHANGE_PROBE_CONFIG["poll_sec"]
+    _probe_stop.clear()
+    _probe_thread = threading.Thread(
+        target=_probe_loop, args=(interval_sec,), name="change-probe", daemon=True,
+    )
+    _probe_thread.start()
@@ -23,6 +23,11 @@ def _load_env():
 _load_env()
 
 
+def _env_flag(name: str, default: str = "true") -> bool:
+    """환경변수 값을 불리언으로 해석 (true/1/yes/on → True)"""
+    return os.environ.get(name, default).strip().lower() in ("true", "1", "yes", "on")
+
+
 # Oracle DB 설정
 DB_CONFIG = {
     "user": os.environ.get("ORACLE_USER", "HRAI_CON"),
@@ -70,6 +75,7 @@ MODEL_REGISTRY = {
         "gpu_info": "GPU 4",
         "description": "테스트/비교용 모델 — Qwen3 코딩 MoE (30B, 활성 3B)",
         "max_tokens": 4096,
+        "max_concurrency": int(os.environ.get("VLLM_MAX_CONCURRENCY_1", "16")),  # 백엔드 동시 요청 한도
         "enabled": True,
     },
     # Arctic-Text2SQL-R1-7B (사용 중지 — SQLite 전용, Oracle 비호환)
@@ -89,6 +95,7 @@ MODEL_REGISTRY = {
         "gpu_info": "GPU 0-3 (TP4)",
         "description": "OpenAI 범용 추론 모델 (MoE 117B)",
         "max_tokens": 4096,
+        "max_concurrency": int(os.environ.get("VLLM_MAX_CONCURRENCY_0", "32")),  # 백엔드 동시 요청 한도
         "enabled": True,
     },
     # EXAONE Deep 32B (사용 중지 — 필요 시 재활성화)
@@ -116,6 +123,151 @@ MODEL_REGISTRY = {
 # 기본 모델 키 (UI 초기값 및 model_key=None일 때 사용)
 DEFAULT_MODEL_KEY = "gpt-oss-120b"
 
+# 공용 Oracle 연결 풀 (db_pool — 대시보드 쿼리와 SQLAlchemy 엔진이 공유)
+DB_POOL_CONFIG = {
+    "pool_min": int(os.environ.get("DB_POOL_MIN", "2")),
+    "pool_max": int(os.environ.get("DB_POOL_MAX", "10")),
+    "increment": int(os.environ.get("DB_POOL_INCREMENT", "1")),
+    "stmtcachesize": int(os.environ.get("DB_STMT_CACHE_SIZE", "50")),
+    # 0이면 checkout마다 ping, 양수면 해당 초 이상 유휴였던 연결만 ping
+    "ping_interval": int(os.environ.get("DB_POOL_PING_INTERVAL", "0")),
+    "wait_timeout_ms": int(os.environ.get("DB_POOL_WAIT_TIMEOUT_MS", "10000")),
+    "call_timeout_ms": int(os.environ.get("DB_CALL_TIMEOUT_MS", "30000")),
+}
+
+# 대시보드(제약조건 분석/배치 결과 리포트) 섹션 병렬 조회
+DASHBOARD_CONFIG = {
+    "max_workers": int(os.environ.get("DASHBOARD_MAX_WORKERS", "8")),
+    "section_timeout_sec": int(os.environ.get("DASHBOARD_SECTION_TIMEOUT_SEC", "40")),
+}
+
+# 비동기 Oracle 연결 풀 (aexecute_sql — 풀 크기가 곧 동시 쿼리 한도)
+ASYNC_DB_CONFIG = {
+    "pool_min": int(os.environ.get("ASYNC_DB_POOL_MIN", "1")),
+    "pool_max": int(os.environ.get("ASYNC_DB_POOL_MAX", "8")),
+}
+
+# 조회 결과 fetch 설정 (fetch_engine — 결과 상한 1000행을 한 번의 왕복으로 가져오도록 arraysize 조정)
+FETCH_CONFIG = {
+    "arraysize": int(os.environ.get("FETCH_ARRAYSIZE", "1000")),
+    "use_arrow": _env_flag("FETCH_USE_ARROW"),
+}
+
 # Gradio 설정
 GRADIO_HOST = os.environ.get("GRADIO_HOST", "0.0.0.0")
 GRADIO_PORT = int(os.environ.get("GRADIO_PORT", "7860"))
+
+# ===== 캐시 설정 =====
+# 디스크 캐시 저장 디렉토리 (서비스 재시작 후에도 유지되는 캐시 파일 위치)
+CACHE_DIR = os.environ.get("TEXT2SQL_CACHE_DIR", str(Path(__file__).parent / ".cache"))
+
+# SQL 생성 결과 캐시 (정규화 질문 + 모델 키 + 이동번호 + 프롬프트 해시 기준)
+SQL_CACHE_CONFIG = {
+    "enabled": _env_flag("SQL_CACHE_ENABLED", "true"),
+    "max_entries": int(os.environ.get("SQL_CACHE_MAX_ENTRIES", "1000")),
+    "ttl_sec": int(os.environ.get("SQL_CACHE_TTL_SEC", str(7 * 24 * 3600))),  # 기본 7일
+    "path": os.path.join(CACHE_DIR, "sql_cache.json"),
+}
+
+# SQL 실행 결과 캐시 (SQL 지문 기준, 이동번호 단위 무효화)
+# 마감된 이동번호(ftr_move_std.close_yn='Y')의 결과는 만료 없이, 진행 중인 이동번호는 짧은 TTL로 보관
+RESULT_CACHE_CONFIG = {
+    "enabled": _env_flag("RESULT_CACHE_ENABLED", "true"),
+    "max_entries": int(os.environ.get("RESULT_CACHE_MAX_ENTRIES", "500")),
+    "max_bytes": int(os.environ.get("RESULT_CACHE_MAX_MB", "256")) * 1024 * 1024,
+    "open_ttl_sec": int(os.environ.get("RESULT_CACHE_OPEN_TTL_SEC", "60")),
+}
+
+# 조회 결과 페이지 탐색 (1000행 상한 이후는 OFFSET/FETCH로 페이지 단위 조회)
+PAGING_CONFIG = {
+    "page_size": int(os.environ.get("RESULT_PAGE_SIZE", "100")),
+    "max_handles": int(os.environ.get("RESULT_PAGE_MAX_HANDLES", "200")),
+    "handle_ttl_sec": int(os.environ.get("RESULT_PAGE_TTL_SEC", "1800")),
+    "grid": _env_flag("RESULT_GRID_ENABLED", "true"),  # 가상 스크롤 그리드 (false면 기존 HTML 표)
+}
+
+# 조회 결과 저장소 (세션 State에는 결과 핸들만 두고 DataFrame은 서버 저장소 1곳에 압축 보관)
+# 메모리 상한을 넘으면 오래된 결과부터 디스크로 내리고, 디스크 상한도 넘으면 삭제 (이후 페이지는 DB 재조회)
+RESULT_STORE_CONFIG = {
+    "memory_bytes": int(os.environ.get("RESULT_STORE_MEMORY_MB", "512")) * 1024 * 1024,
+    "dir": os.environ.get("RESULT_STORE_DIR", os.path.join(CACHE_DIR, "result_store")),
+    "disk_bytes": int(os.environ.get("RESULT_STORE_DISK_MB", "4096")) * 1024 * 1024,
+    "sweep_sec": int(os.environ.get("RESULT_STORE_SWEEP_SEC", "300")),  # 만료된 결과 파일 정리 주기 (0이면 시작 시에만)
+}
+
+# 조회 결과 전체 내보내기 (행 상한 없이 커서에서 배치 단위로 CSV/Parquet/XLSX 파일에 기록)
+# 새 내보내기 전에 max_age_sec이 지난 파일과 quota를 넘는 오래된 파일부터 정리
+EXPORT_CONFIG = {
+    "dir": os.environ.get("EXPORT_DIR", os.path.join(CACHE_DIR, "exports")),
+    "batch_rows": int(os.environ.get("EXPORT_BATCH_ROWS", "5000")),          # 커서 fetch/파일 기록 단위
+    "call_timeout_sec": int(os.environ.get("EXPORT_CALL_TIMEOUT_SEC", "600")),  # 내보내기 중 DB 왕복 시간 한도
+    "max_age_sec": int(os.environ.get("EXPORT_MAX_AGE_SEC", "86400")),
+    "quota_bytes": int(os.environ.get("EXPORT_QUOTA_MB", "2048")) * 1024 * 1024,
+}
+
+# 분석용 로컬 복제본 (TARGET_TABLES를 이동번호 단위 Parquet로 추출, DuckDB로 조회 — duckdb/pyarrow 필요)
+# 대시보드/SQL 실행은 복제본에 있는 이동번호만 복제본에서 조회하고, 실패하면 Oracle로 재조회
+# 진행 중 이동번호는 변경 감지(CHANGE_PROBE_ENABLED)가 켜져 있을 때만 사용 (변경 감지 시 복제본에서 제외)
+REPLICA_CONFIG = {
+    "enabled": _env_flag("REPLICA_ENABLED", "false"),
+    "dir": os.environ.get("REPLICA_DIR", os.path.join(CACHE_DIR, "replica")),
+    "workers": int(os.environ.get("REPLICA_WORKERS", "4")),             # 테이블 병렬 추출 수 (연결 풀 크기 이내)
+    "arraysize": int(os.environ.get("REPLICA_ARRAYSIZE", "10000")),     # 추출 시 한 번에 가져올 행 수
+    "max_age_sec": int(os.environ.get("REPLICA_MAX_AGE_SEC", "3600")),  # 진행 중 이동번호 복제본 사용 허용 시간
+    "dashboards": _env_flag("REPLICA_DASHBOARDS", "true"),
+    "execute_sql": _env_flag("REPLICA_EXECUTE_SQL", "false"),
+}
+
+# 이동번호 마감여부(close_yn) 조회 결과 캐시 시간 (초)
+MOVE_STATUS_TTL_SEC = int(os.environ.get("MOVE_STATUS_TTL_SEC", "300"))
+
+# 이동번호 단위 변경 감지 (케이스 결과 테이블의 MAX(ORA_ROWSCN) + 행 수로 대시보드 캐시 무효화)
+CHANGE_PROBE_CONFIG = {
+    "enabled": _env_flag("CHANGE_PROBE_ENABLED", "true"),
+    "min_interval_sec": int(os.environ.get("CHANGE_PROBE_MIN_INTERVAL_SEC", "10")),  # 이동번호별 재확인 최소 간격
+    "poll_sec": int(os.environ.get("CHANGE_PROBE_POLL_SEC", "60")),                  # 백그라운드 확인 주기
+    "cache_ttl_sec": int(os.environ.get("DASHBOARD_CACHE_TTL_SEC", "3600")),         # 대시보드 쿼리 캐시 안전 만료
+}
+
+# 대시보드 집계 사전 계산 저장소 (python precompute.py — systemd 타이머로 주기 실행)
+# 화면은 메모리 캐시 다음으로 이 저장소를 먼저 확인하고, 변경 감지 서명이 같을 때만 사용
+PRECOMPUTE_CONFIG = {
+    "enabled": _env_flag("PRECOMPUTE_ENABLED", "true"),
+    "dir": os.environ.get("PRECOMPUTE_DIR", os.path.join(CACHE_DIR, "precomputed")),
+    "workers": int(os.environ.get("PRECOMPUTE_WORKERS", "4")),             # 쿼리 병렬 실행 수 (연결 풀 크기 이내)
+    "max_age_sec": int(os.environ.get("PRECOMPUTE_MAX_AGE_SEC", "3600")),  # 변경 감지가 꺼져 있을 때 사용 허용 시간
+}
+
+# 이동번호 목록 카탈로그 (시작 시 로컬 파일에서 로드, 백그라운드 스레드가 주기적으로 DB에서 갱신)
+MOVE_CATALOG_CONFIG = {
+    "path": os.environ.get("MOVE_CATALOG_PATH", os.path.join(CACHE_DIR, "move_catalog.json")),
+    "refresh_sec": int(os.environ.get("MOVE_CATALOG_REFRESH_SEC", "300")),   # DB 갱신 주기
+    "ui_poll_sec": int(os.environ.get("MOVE_CATALOG_UI_POLL_SEC", "60")),    # 화면 드롭다운 반영 주기
+    "stats_ttl_sec": int(os.environ.get("MOVE_STATS_TTL_SEC", "300")),       # 이동번호별 통계 캐시 시간
+}
+
+# 이동번호별 최종 케이스(case_id/case_det_id) 조회 캐시
+# rewrite_sql이 켜지면 생성 SQL의 MAX(case_id) 서브쿼리를 조회된 case_id 상수로 치환하여 실행
+CASE_RESOLVER_CONFIG = {
+    "ttl_sec": int(os.environ.get("CASE_RESOLVER_TTL_SEC", "60")),
+    "rewrite_sql": _env_flag("CASE_REWRITE_SQL", "false"),
+}
+
+# 마감된 이동번호의 리포트/제약조건 분석 스냅샷 (이동번호 + 최종 case_id + rev_id 기준 gzip JSON)
+REPORT_SNAPSHOT_CONFIG = {
+    "enabled": _env_flag("REPORT_SNAPSHOT_ENABLED", "true"),
+    "dir": os.environ.get("REPORT_SNAPSHOT_DIR", os.path.join(CACHE_DIR, "report_snapshots")),
+}
+
+# 스키마 스냅샷 (테이블 DDL + 샘플 행을 파일로 저장하여 시작 시 DB 접속 없이 프롬프트 구성)
+SCHEMA_SNAPSHOT_CONFIG = {
+    "path": os.environ.get("SCHEMA_SNAPSHOT_PATH", os.path.join(CACHE_DIR, "schema_snapshot.json")),
+    "refresh_sec": int(os.environ.get("SCHEMA_REFRESH_SEC", "3600")),  # 백그라운드 갱신 주기
+}
+
+# 질문 기반 스키마 가지치기 (질문과 관련된 테이블/컬럼만 프롬프트에 포함)
+SCHEMA_PRUNING_CONFIG = {
+    "enabled": _env_flag("SCHEMA_PRUNING_ENABLED", "true"),
+    "min_score": int(os.environ.get("SCHEMA_PRUNING_MIN_SCORE", "2")),      # 테이블 선택 최소 점수
+    "max_columns": int(os.environ.get("SCHEMA_PRUNING_MAX_COLUMNS", "30")),  # 이보다 컬럼이 많으면 컬럼도 가지치기
+}
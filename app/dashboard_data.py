@@ -0,0 +1,237 @@
+"""
+배치 결과 리포트/제약조건 분석 대시보드 쿼리
+요약 카드/권역별/직무별/필수이동·유보 4개 패널은 모두 같은 move_item_master LEFT JOIN move_case_item을
+그룹 기준만 바꿔 집계하므로, GROUPING SETS 쿼리 1회(테이블 스캔 1회)로 조회한 뒤 Python에서 패널별로 분리
+- 감점 TOP 20/TOP 10/사업소별 위반 패널은 이동번호별 감점 집계 1회(fetch_penalty_facts)를 메모리에서 잘라 사용
+- 대시보드 쿼리는 query_rows()로 실행 — 로컬 복제본(replica)에 이동번호가 있으면 DuckDB에서 조회
+- 쿼리 결과는 (이동번호, SQL, 바인드) 단위로 캐싱하고, change_probe가 참조 테이블 변경을 감지하면 해당 항목만 제거
+- 메모리 캐시에 없으면 precompute.py가 미리 계산해 둔 결과(aggregate_store)를 먼저 확인
+"""
+import logging
+
+import replica
+from aggregate_store import precomputed_rows
+from case_resolver import latest_case_id
+from change_probe import PROBE_TABLES, ensure_fresh, subscribe_changes
+from config import REPLICA_CONFIG, CHANGE_PROBE_CONFIG
+from db_pool import pooled_connection
+from sql_cache import LRUTTLCache
+
+logger = logging.getLogger(__name__)
+
+# (이동번호, SQL, 바인드) -> (rows, 변경 감지 대상 테이블 set). TTL은 감지 대상 밖 테이블 변경에 대한 안전장치
+# 변경 감지가 꺼져 있으면 min_interval_sec 동안만 보관 (같은 화면의 패널/탭이 동시에 여는 중복 조회만 흡수)
+_query_cache = LRUTTLCache(max_entries=500, ttl=CHANGE_PROBE_CONFIG["cache_ttl_sec"])
+
+
+def _invalidate_queries(move_std_id: str, changed: set):
+    """변경된 테이블을 참조하는 해당 이동번호의 쿼리 캐시만 제거"""
+    removed = 0
+    for key, (_, tables), _ in _query_cache.snapshot():
+        if key[0] == move_std_id and tables & changed:
+            _query_cache.pop(key)
+            removed += 1
+    if removed:
+        logger.info(f"대시보드 쿼리 캐시 {removed}건 제거 (이동번호 {move_std_id})")
+
+
+subscribe_changes(_invalidate_queries)
+
+# GROUPING_ID(lvl2_nm, job_type1, must_cat) 값 → 패널 (1이 집계된 열)
+GID_REGION = 0b011
+GID_JOB = 0b101
+GID_MUST = 0b110
+GID_TOTAL = 0b111
+
+MOVE_AGGREGATE_SQL = """
+    WITH base AS (
+        SELECT
+            m.lvl2_nm,
+            m.job_type1,
+            CASE WHEN m.must_move_yn = 1 THEN '필수이동'
+                 WHEN m.must_stay_yn = 1 THEN '필수유보'
+                 ELSE '일반' END AS must_cat,
+            CASE WHEN c.new_org_id IS NOT NULL AND c.new_org_id != m.lvl5_id THEN 1 ELSE 0 END AS moved,
+            CASE WHEN c.new_org_id IS NULL OR c.new_org_id = m.lvl5_id THEN 1 ELSE 0 END AS not_moved,
+            CASE WHEN c.must_stay_yn = 1 THEN 1 ELSE 0 END AS stayed,
+            CASE WHEN c.new_org_id IS NULL THEN 1 ELSE 0 END AS unplaced
+        FROM HRAI_CON.move_item_master m
+        LEFT JOIN HRAI_CON.move_case_item c
+            ON m.ftr_move_std_id = c.ftr_move_std_id AND m.emp_id = c.emp_id
+            AND c.rev_id = '999'
+            AND c.case_id = :cid
+        WHERE m.ftr_move_std_id = :mid
+    )
+    SELECT
+        GROUPING_ID(lvl2_nm, job_type1, must_cat) AS gid,
+        lvl2_nm, job_type1, must_cat,
+        COUNT(*) AS total,
+        SUM(moved) AS moved,
+        SUM(not_moved) AS not_moved,
+        SUM(stayed) AS stayed,
+        SUM(unplaced) AS unplaced
+    FROM base
+    GROUP BY GROUPING SETS ((lvl2_nm), (job_type1), (must_cat), ())
+"""
+
+
+def fetch_rows(sql: str, params: dict) -> list[tuple]:
+    """캐시를 거치지 않고 실행 (이동번호가 복제본에 있으면 DuckDB, 아니면/실패 시 Oracle 공용 풀)"""
+    if REPLICA_CONFIG["dashboards"] and replica.has_move(params.get("mid")):
+        try:
+            return replica.query_rows(sql, params)
+        except Exception as e:
+            logger.warning(f"복제본 조회 실패 — Oracle에서 재조회: {e}")
+    with pooled_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(sql, params)
+            return cur.fetchall()
+
+
+def query_rows(sql: str, params: dict) -> list[tuple]:
+    """
+    대시보드 쿼리 실행 — 메모리 캐시 → 사전 계산 저장소 → fetch_rows 순으로 조회
+
+    변경 감지가 켜져 있으면 먼저 이동번호 변경 여부를 확인(캐시 무효화)한 뒤 캐시된 결과를 재사용
+    """
+    mid = params.get("mid")
+    if mid is None:
+        return fetch_rows(sql, params)
+
+    if ensure_fresh(mid) and "cid" in params:
+        # 결과가 다시 기록되었으면 최종 케이스도 바뀌었을 수 있으므로 다시 확인한 값으로 바인드
+        params = {**params, "cid": latest_case_id(mid)}
+    key = (str(int(mid)), sql, tuple(sorted(params.items())))
+    cached = _query_cache.get(key)
+    if cached is not None:
+        return cached[0]
+
+    rows = precomputed_rows(mid, sql, params)
+    if rows is None:
+        rows = fetch_rows(sql, params)
+
+    lowered = sql.lower()
+    ttl = None if CHANGE_PROBE_CONFIG["enabled"] else CHANGE_PROBE_CONFIG["min_interval_sec"]
+    _query_cache.set(key, (rows, {t for t in PROBE_TABLES if t in lowered}), ttl=ttl)
+    return rows
+
+
+def get_query_cache_stats() -> dict:
+    return _query_cache.stats()
+
+
+def split_move_aggregates(rows) -> dict:
+    """
+    GROUPING SETS 결과 행을 패널별 행 목록으로 분리 (정렬은 기존 패널별 쿼리의 ORDER BY와 동일)
+
+    Returns: {
+        "summary": (total, moved, stayed, unplaced),
+        "region": [(권역, 총원, 이동, 미이동)]    — 권역명 오름차순, 미지정(NULL)은 마지막
+        "job": [(직무, 총원, 이동)]              — 총원 내림차순
+        "must": [(구분, 인원수, 이동완료)]        — 구분명 오름차순
+    }
+    """
+    summary = (0, 0, 0, 0)
+    region, job, must = [], [], []
+    for gid, lvl2_nm, job_type1, must_cat, total, moved, not_moved, stayed, unplaced in rows:
+        if gid == GID_TOTAL:
+            summary = (total, moved, stayed, unplaced)
+        elif gid == GID_REGION:
+            region.append((lvl2_nm, total, moved, not_moved))
+        elif gid == GID_JOB:
+            job.append((job_type1, total, moved))
+        elif gid == GID_MUST:
+            must.append((must_cat, total, moved))
+    # Oracle 기본 정렬(ASC NULLS LAST)과 맞추고, 표시는 기존과 같이 NULL을 '(미지정)'으로 치환
+    region.sort(key=lambda r: (r[0] is None, r[0] or ""))
+    job.sort(key=lambda r: -r[1])
+    must.sort(key=lambda r: r[0])
+    return {
+        "summary": summary,
+        "region": [(name or "(미지정)", *vals) for name, *vals in region],
+        "job": [(name or "(미지정)", *vals) for name, *vals in job],
+        "must": must,
+    }
+
+
+def fetch_move_aggregates(mid: int) -> dict:
+    """이동번호 mid의 4개 패널 집계를 쿼리 1회로 조회 (split_move_aggregates 형식, 최종 case_id는 상수 바인드)"""
+    cid = latest_case_id(mid)  # 풀 연결을 잡기 전에 조회 (캐시 미스 시 별도 연결 사용)
+    return split_move_aggregates(query_rows(MOVE_AGGREGATE_SQL, {"mid": mid, "cid": cid}))
+
+
+# 감점 패널 공용 집계 — 제약조건별 합계(kind='cnst')와 사업소별 합계(kind='org')를 쿼리 1회로 조회
+# 사업소별은 기존 패널과 같이 case/det/rev 단위로 MOVE_CASE_CNST_MASTER와 조인한 결과를 그대로 집계
+PENALTY_FACTS_SQL = """
+    SELECT 'cnst' AS kind, p.cnst_nm AS name, NULL AS vio_cnst_cnt,
+           SUM(p.penalty_cnt) AS total_vio, MAX(p.penalty_val) AS unit_pen, SUM(p.penalty_sum) AS total_pen
+    FROM HRAI_CON.MOVE_CASE_PENALTY_INFO p
+    WHERE p.ftr_move_std_id = :mid AND p.rev_id = '999' AND p.penalty_cnt > 0
+      AND p.case_id = :cid
+    GROUP BY p.cnst_nm
+    UNION ALL
+    SELECT 'org' AS kind, cn.org_nm AS name, COUNT(DISTINCT cn.cnst_cd) AS vio_cnst_cnt,
+           SUM(p.penalty_cnt) AS total_vio, NULL AS unit_pen, SUM(p.penalty_sum) AS total_pen
+    FROM HRAI_CON.MOVE_CASE_PENALTY_INFO p
+    JOIN HRAI_CON.MOVE_CASE_CNST_MASTER cn
+        ON p.ftr_move_std_id = cn.ftr_move_std_id
+        AND p.case_id = cn.case_id AND p.case_det_id = cn.case_det_id
+        AND p.rev_id = cn.rev_id AND cn.org_id IS NOT NULL
+    WHERE p.ftr_move_std_id = :mid AND p.rev_id = '999' AND p.penalty_cnt > 0
+      AND p.case_id = :cid
+    GROUP BY cn.org_nm
+"""
+
+
+def split_penalty_facts(rows) -> dict:
+    """
+    감점 집계 행을 패널용 목록으로 분리 (각 목록은 총감점합계 내림차순 — 패널은 앞에서 N개만 사용)
+
+    Returns: {
+        "cnst": [(감점항목명, 총위반건수, 건당감점값, 총감점합계)],
+        "org": [(사업소명, 위반제약수, 총위반건수, 총감점합계)],
+    }
+    """
+    cnst, org = [], []
+    for kind, name, vio_cnst_cnt, total_vio, unit_pen, total_pen in rows:
+        if kind == "cnst":
+            cnst.append((name, total_vio, unit_pen, total_pen))
+        else:
+            org.append((name, vio_cnst_cnt, total_vio, total_pen))
+    # Oracle ORDER BY ... DESC와 같이 NULL 합계를 앞에 둠
+    def by_pen_desc(r):
+        return (r[-1] is None, r[-1] or 0)
+    cnst.sort(key=by_pen_desc, reverse=True)
+    org.sort(key=by_pen_desc, reverse=True)
+    return {"cnst": cnst, "org": org}
+
+
+def fetch_penalty_facts(mid: int) -> dict:
+    """이동번호 mid의 감점 집계 전체 (split_penalty_facts 형식, query_rows 캐시로 탭 간 공유)"""
+    cid = latest_case_id(mid)
+    return split_penalty_facts(query_rows(PENALTY_FACTS_SQL, {"mid": mid, "cid": cid}))
+
+
+CNST_SUMMARY_SQL = """
+    SELECT c.cnst_cd, c.cnst_nm, c.cnst_gbn, c.use_yn, c.cnst_val, c.penalty_val,
+           COUNT(DISTINCT c.org_id) AS org_cnt
+    FROM HRAI_CON.MOVE_CASE_CNST_MASTER c
+    WHERE c.ftr_move_std_id = :mid AND c.rev_id = '999'
+      AND c.case_id = :cid
+    GROUP BY c.cnst_cd, c.cnst_nm, c.cnst_gbn, c.use_yn, c.cnst_val, c.penalty_val
+    ORDER BY c.use_yn DESC, c.cnst_cd
+"""
+
+
+def fetch_cnst_summary(mid: int) -> list[tuple]:
+    """이동번호 mid의 제약조건 요약 행 (제약코드, 제약조건명, 제약구분, 사용여부, 제약값, 패널티값, 적용사업소수)"""
+    cid = latest_case_id(mid)
+    return query_rows(CNST_SUMMARY_SQL, {"mid": mid, "cid": cid})
+
+
+# 배치 결과 리포트/제약조건 분석 탭이 쓰는 이동번호 단위 쿼리 전체 (precompute.py가 미리 계산)
+DASHBOARD_QUERIES = {
+    "move_aggregate": MOVE_AGGREGATE_SQL,
+    "penalty_facts": PENALTY_FACTS_SQL,
+    "cnst_summary": CNST_SUMMARY_SQL,
+}
@@ -0,0 +1,138 @@
+"""
+프로세스 공용 python-oracledb 연결 풀
+대시보드 위젯/보고서 쿼리와 SQLAlchemy 엔진(text2sql_pipeline.engine)이 같은 풀을 공유하여
+위젯마다 TCP+인증 핸드셰이크를 반복하지 않도록 함
+- 풀 크기/문장 캐시/ping 주기/call_timeout은 config.DB_POOL_CONFIG
+- call_deadline() 블록 안에서 빌린 연결은 call_timeout을 남은 시간 이내로 줄임 (대시보드 섹션 시간 초과 시
+  결과를 버린 뒤에도 쿼리가 작업 스레드/연결을 계속 붙잡지 않도록)
+- 풀은 첫 사용 시점에 생성 (import 시점에 Oracle 접속하지 않음)
+"""
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+import oracledb
+
+from config import DB_CONFIG, DB_POOL_CONFIG
+
+logger = logging.getLogger(__name__)
+
+_pool = None
+_pool_lock = threading.Lock()
+
+# 풀 대기시간 통계 (acquire 호출 기준)
+_wait_stats = {"acquires": 0, "wait_ms_total": 0.0, "wait_ms_max": 0.0, "timeouts": 0}
+_wait_lock = threading.Lock()
+
+# 스레드별 쿼리 마감 시각 (time.monotonic 기준, call_deadline 블록 안에서만 설정)
+_local = threading.local()
+
+
+def _session_callback(conn, requested_tag):
+    """새 세션 생성 시 1회 호출 — 쿼리 타임아웃 설정"""
+    conn.call_timeout = DB_POOL_CONFIG["call_timeout_ms"]
+
+
+def get_pool():
+    """공용 연결 풀 반환 (최초 호출 시 생성)"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = oracledb.create_pool(
+                user=DB_CONFIG["user"],
+                password=DB_CONFIG["password"],
+                dsn=oracledb.makedsn(DB_CONFIG["host"], DB_CONFIG["port"], sid=DB_CONFIG["sid"]),
+                min=DB_POOL_CONFIG["pool_min"],
+                max=DB_POOL_CONFIG["pool_max"],
+                increment=DB_POOL_CONFIG["increment"],
+                stmtcachesize=DB_POOL_CONFIG["stmtcachesize"],
+                ping_interval=DB_POOL_CONFIG["ping_interval"],
+                getmode=oracledb.POOL_GETMODE_TIMEDWAIT,
+                wait_timeout=DB_POOL_CONFIG["wait_timeout_ms"],
+                session_callback=_session_callback,
+            )
+            logger.info(f"Oracle 연결 풀 생성: min={DB_POOL_CONFIG['pool_min']}, max={DB_POOL_CONFIG['pool_max']}")
+        return _pool
+
+
+def acquire():
+    """풀에서 연결 1개 획득 (대기시간 기록). 반환은 conn.close() 또는 pool.release()"""
+    pool = get_pool()
+    t0 = time.perf_counter()
+    try:
+        conn = pool.acquire()
+    except oracledb.Error:
+        with _wait_lock:
+            _wait_stats["timeouts"] += 1
+        raise
+    wait_ms = (time.perf_counter() - t0) * 1000
+    with _wait_lock:
+        _wait_stats["acquires"] += 1
+        _wait_stats["wait_ms_total"] += wait_ms
+        _wait_stats["wait_ms_max"] = max(_wait_stats["wait_ms_max"], wait_ms)
+    return conn
+
+
+@contextmanager
+def call_deadline(seconds: float):
+    """with 블록 안(같은 스레드)에서 pooled_connection()으로 실행하는 쿼리를 seconds 안에 끝나도록 제한"""
+    previous = getattr(_local, "deadline", None)
+    _local.deadline = time.monotonic() + seconds
+    try:
+        yield
+    finally:
+        _local.deadline = previous
+
+
+def _call_timeout_ms() -> int:
+    """현재 스레드의 call_timeout (마감 시각이 있으면 남은 시간과 기본값 중 작은 값)"""
+    default = DB_POOL_CONFIG["call_timeout_ms"]
+    deadline = getattr(_local, "deadline", None)
+    if deadline is None:
+        return default
+    remaining_ms = int((deadline - time.monotonic()) * 1000)
+    if remaining_ms <= 0:
+        raise TimeoutError("쿼리 마감 시각 초과")
+    return min(default, remaining_ms)
+
+
+@contextmanager
+def pooled_connection():
+    """with 블록 동안 풀 연결을 빌려 쓰고 반환"""
+    call_timeout = _call_timeout_ms()
+    conn = acquire()
+    if call_timeout != DB_POOL_CONFIG["call_timeout_ms"]:
+        conn.call_timeout = call_timeout
+    try:
+        yield conn
+    finally:
+        if call_timeout != DB_POOL_CONFIG["call_timeout_ms"]:
+            conn.call_timeout = DB_POOL_CONFIG["call_timeout_ms"]  # 풀로 돌아가는 연결은 기본 한도로
+        conn.close()
+
+
+def get_pool_stats() -> dict:
+    """모니터링용 풀 상태 — open/busy/max 연결 수, 평균·최대 대기시간(ms), 대기 초과 횟수"""
+    with _wait_lock:
+        stats = dict(_wait_stats)
+    acquires = stats.pop("acquires")
+    total_ms = stats.pop("wait_ms_total")
+    stats["acquires"] = acquires
+    stats["wait_ms_avg"] = round(total_ms / acquires, 2) if acquires else 0.0
+    stats["wait_ms_max"] = round(stats["wait_ms_max"], 2)
+    pool = _pool
+    if pool is None:
+        stats.update({"open": 0, "busy": 0, "max": DB_POOL_CONFIG["pool_max"]})
+    else:
+        stats.update({"open": pool.opened, "busy": pool.busy, "max": pool.max})
+    return stats
+
+
+def close_pool():
+    """풀 종료 (프로세스 종료/테스트용)"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close(force=True)
+            _pool = None
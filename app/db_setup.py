@@ -2,21 +2,21 @@
 Step 4: Oracle DB 연결 테스트 및 스키마 확인 스크립트
 실행: python db_setup.py
 """
-import oracledb
 from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.pool import NullPool
 from config import DB_CONFIG, TARGET_TABLES
+from db_pool import acquire, get_pool_stats
 
 
 def get_engine():
-    """SQLAlchemy 엔진 생성"""
+    """SQLAlchemy 엔진 생성 — 연결은 공용 python-oracledb 풀(db_pool)에서 빌림
+
+    NullPool이므로 SQLAlchemy가 연결을 닫으면 python-oracledb 풀로 반환됨
+    """
     return create_engine(
         "oracle+oracledb://",
-        connect_args=DB_CONFIG,
-        pool_size=5,
-        max_overflow=10,
-        pool_recycle=3600,
-        pool_pre_ping=True,
-        pool_timeout=30,
+        creator=acquire,
+        poolclass=NullPool,
     )
 
 
@@ -126,3 +126,4 @@ if __name__ == "__main__":
     test_connection(engine)
     show_schema(engine)
     show_sample_data(engine)
+    print(f"  연결 풀 상태: {get_pool_stats()}")
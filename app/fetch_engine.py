@@ -0,0 +1,164 @@
+"""
+컬럼 지향 조회 엔진
+SQLAlchemy text() + pd.read_sql 대신 python-oracledb를 직접 사용하여 조회 결과를 DataFrame으로 변환
+- arraysize/prefetchrows를 결과 상한(1000행)에 맞춰 한 번의 왕복으로 가져옴
+- fetch_df_all(Arrow) 경로가 가능하면 사용, 아니면 cursor.description 타입 기반 컬럼 단위 NumPy 변환
+- compact=True면 결과 dtype 압축 (frame_compact — NUMBER 정밀도는 cursor.description 기준)
+"""
+import logging
+import re
+
+import numpy as np
+import oracledb
+import pandas as pd
+
+from config import FETCH_CONFIG
+from frame_compact import compact_frame, compaction_report, format_report
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pyarrow
+except ImportError:  # pyarrow 미설치 환경에서는 컬럼 단위 변환 경로만 사용
+    pyarrow = None
+
+
+def normalize_column_name(name: str) -> str:
+    """Oracle 대문자 컬럼명을 SQLAlchemy(pd.read_sql)와 같이 소문자로 변환 (따옴표 별칭은 유지)"""
+    if name.upper() == name and re.fullmatch(r"[A-Z][A-Z0-9_$#]*", name):
+        return name.lower()
+    return name
+
+
+def column_kind(description) -> str | None:
+    """cursor.description 항목으로 컬럼 변환 방식 결정 ("number" / "date" / None=그대로)"""
+    type_code = description[1]
+    if type_code in (oracledb.DB_TYPE_NUMBER, oracledb.DB_TYPE_BINARY_DOUBLE,
+                     oracledb.DB_TYPE_BINARY_FLOAT, oracledb.DB_TYPE_BINARY_INTEGER):
+        return "number"
+    if type_code in (oracledb.DB_TYPE_DATE, oracledb.DB_TYPE_TIMESTAMP):
+        return "date"
+    return None
+
+
+def integer_digits(description) -> int | None:
+    """NUMBER(p,0)로 선언된 컬럼의 정밀도 p (그 외/정밀도 없는 계산 컬럼은 None)"""
+    _, type_code, _, _, precision, scale, _ = description
+    if type_code == oracledb.DB_TYPE_NUMBER and scale == 0 and precision:
+        return precision
+    return None
+
+
+def _compact(df: pd.DataFrame, digits: list = None) -> pd.DataFrame:
+    """조회 결과 dtype 압축 (압축 전후 메모리는 debug 로그)"""
+    compact = compact_frame(df, integer_digits=digits)
+    if logger.isEnabledFor(logging.DEBUG) and not df.empty:
+        logger.debug(f"결과 dtype 압축: {format_report(compaction_report(df, compact))}")
+    return compact
+
+
+def _column_array(values: tuple, kind: str | None):
+    """한 컬럼의 값 튜플을 NumPy 배열로 변환 (NULL은 NaN/NaT — pd.read_sql과 동일한 dtype)"""
+    if kind == "number":
+        if None in values:
+            return np.fromiter((np.nan if v is None else v for v in values), dtype=np.float64, count=len(values))
+        arr = np.array(values)
+        if arr.dtype.kind in "if":
+            return arr
+    elif kind == "date":
+        return pd.to_datetime(np.array(values, dtype=object))
+    else:
+        return np.array(values, dtype=object)
+    return pd.Series(values).to_numpy()  # 예상 밖 값(Decimal, 범위 초과 정수 등)은 pandas 추론에 맡김
+
+
+def rows_to_frame(rows: list, columns: list[str], kinds: list = None) -> pd.DataFrame:
+    """
+    행 튜플 목록을 컬럼 단위로 전치한 뒤 DataFrame 구성
+
+    kinds(컬럼별 "number"/"date"/None)가 주어지면 타입 추론 없이 NumPy 버퍼를 바로 만들고,
+    없으면 컬럼마다 pandas 추론(pd.DataFrame.from_records와 같은 규칙)을 사용
+    """
+    if not rows:
+        return pd.DataFrame(columns=columns)
+    data = {}
+    for i, values in enumerate(zip(*rows)):
+        if kinds is None:
+            data[i] = pd.Series(values)
+        else:
+            data[i] = _column_array(values, kinds[i])
+    df = pd.DataFrame(data, copy=False)
+    df.columns = columns  # 중복 컬럼명 유지
+    return df
+
+
+def _arrow_to_frame(odf, columns: list[str]) -> pd.DataFrame:
+    """fetch_df_all 결과(OracleDataFrame)를 Arrow 테이블 경유로 pandas 변환"""
+    try:
+        table = pyarrow.table(odf)
+    except TypeError:  # Arrow PyCapsule 인터페이스 미지원 버전 (oracledb 3.0)
+        table = pyarrow.Table.from_arrays(odf.column_arrays(), names=odf.column_names())
+    df = table.to_pandas()
+    df.columns = columns
+    return df
+
+
+def _use_arrow(conn) -> bool:
+    return FETCH_CONFIG["use_arrow"] and pyarrow is not None and hasattr(conn, "fetch_df_all")
+
+
+def fetch_frame(conn, sql: str, params: dict = None, max_rows: int = None, compact: bool = False) -> pd.DataFrame:
+    """
+    oracledb 연결로 SQL을 실행하여 DataFrame 반환
+
+    Args:
+        conn: python-oracledb Connection (SQLAlchemy 연결이면 dbapi_connection을 넘길 것)
+        sql: 실행할 SQL
+        params: 바인드 변수
+        max_rows: 예상 최대 행 수 (arraysize/prefetchrows 조정용, 기본 FETCH_CONFIG)
+        compact: 결과 dtype 압축 여부 (category/downcast — 보관용 결과에 사용)
+    """
+    arraysize = max_rows or FETCH_CONFIG["arraysize"]
+    if _use_arrow(conn):
+        try:
+            odf = conn.fetch_df_all(statement=sql, parameters=params, arraysize=arraysize)
+            df = _arrow_to_frame(odf, [normalize_column_name(c) for c in odf.column_names()])
+        except Exception as e:
+            # Arrow 변환 불가 타입(LOB 등)은 일반 경로로 재시도
+            logger.debug(f"Arrow 조회 실패 — 일반 경로로 재시도: {e}")
+        else:
+            return _compact(df) if compact else df
+    with conn.cursor() as cursor:
+        cursor.arraysize = arraysize
+        cursor.prefetchrows = arraysize + 1  # 마지막 빈 fetch 왕복까지 생략
+        cursor.execute(sql, params or {})
+        columns = [normalize_column_name(d[0]) for d in cursor.description]
+        kinds = [column_kind(d) for d in cursor.description]
+        digits = [integer_digits(d) for d in cursor.description]
+        rows = cursor.fetchall()
+    df = rows_to_frame(rows, columns, kinds)
+    return _compact(df, digits) if compact else df
+
+
+async def afetch_frame(conn, sql: str, params: dict = None, max_rows: int = None,
+                       compact: bool = False) -> pd.DataFrame:
+    """fetch_frame의 비동기 버전 (python-oracledb AsyncConnection)"""
+    arraysize = max_rows or FETCH_CONFIG["arraysize"]
+    if _use_arrow(conn):
+        try:
+            odf = await conn.fetch_df_all(statement=sql, parameters=params, arraysize=arraysize)
+            df = _arrow_to_frame(odf, [normalize_column_name(c) for c in odf.column_names()])
+        except Exception as e:
+            logger.debug(f"Arrow 조회 실패 — 일반 경로로 재시도: {e}")
+        else:
+            return _compact(df) if compact else df
+    with conn.cursor() as cursor:
+        cursor.arraysize = arraysize
+        cursor.prefetchrows = arraysize + 1
+        await cursor.execute(sql, params or {})
+        columns = [normalize_column_name(d[0]) for d in cursor.description]
+        kinds = [column_kind(d) for d in cursor.description]
+        digits = [integer_digits(d) for d in cursor.description]
+        rows = await cursor.fetchall()
+    df = rows_to_frame(rows, columns, kinds)
+    return _compact(df, digits) if compact else df
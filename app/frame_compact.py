@@ -0,0 +1,87 @@
+"""
+DataFrame 메모리 압축
+조회 결과(execute_sql)와 대시보드 표 DataFrame을 값/표시 문자열 손실 없이 작은 dtype으로 변환
+- 정수 컬럼: 값 범위에 맞는 가장 작은 정수 dtype으로 downcast
+- 문자열 컬럼: 고유값 비율이 낮으면 category (org_nm, pos_grd_nm처럼 반복되는 문자열을 코드 배열 + 사전 1개로 보관)
+- 실수 컬럼: Oracle NUMBER(p,0) (p <= 7)로 선언된 컬럼만 float32 — NULL이 있어 float64가 된 정수 컬럼으로,
+  7자리 이하 정수는 float32로 정확히 표현되므로 표시 값이 같음. 그 외 실수(소수 자릿수가 있는 NUMBER,
+  BINARY_DOUBLE, 선언 정보가 없는 계산 컬럼)는 float32로 줄이면 값이 달라지므로 유지
+- compaction_report(): 컬럼별 압축 전후 dtype/메모리 (python bench_compact.py로 확인)
+"""
+import pandas as pd
+
+_FLOAT32_EXACT_DIGITS = 7  # 10^7 < 2^24 — 7자리 이하 정수는 float32 가수부에 정확히 들어감
+
+
+def frame_nbytes(df: pd.DataFrame) -> int:
+    """DataFrame 실제 메모리 사용량 (object/문자열 값 포함)"""
+    return int(df.memory_usage(deep=True, index=True).sum())
+
+
+def _is_text(col: pd.Series) -> bool:
+    if isinstance(col.dtype, pd.CategoricalDtype):
+        return False
+    if pd.api.types.is_string_dtype(col.dtype):
+        return True
+    return col.dtype == object and pd.api.types.infer_dtype(col, skipna=True) == "string"
+
+
+def compact_frame(df: pd.DataFrame, integer_digits: list = None, max_category_ratio: float = 0.5) -> pd.DataFrame:
+    """
+    값과 표시 문자열이 바뀌지 않는 범위에서 dtype을 줄인 새 DataFrame 반환 (원본은 변경하지 않음)
+
+    integer_digits: 컬럼별 NUMBER(p,0) 정밀도 p (정수 선언이 아니거나 알 수 없으면 None,
+                    fetch_engine.integer_digits로 cursor.description에서 구함)
+    max_category_ratio: 고유값 수 / 행 수가 이 비율 이하인 문자열 컬럼만 category로 변환
+    """
+    if df.empty:
+        return df
+    out = df.copy(deep=False)
+    n_rows = len(df)
+    for i in range(df.shape[1]):
+        col = df.iloc[:, i]
+        digits = integer_digits[i] if integer_digits else None
+        if pd.api.types.is_integer_dtype(col.dtype) and not pd.api.types.is_extension_array_dtype(col.dtype):
+            kind = "unsigned" if col.dtype.kind == "u" else "integer"
+            out.isetitem(i, pd.to_numeric(col, downcast=kind))
+        elif col.dtype == "float64" and digits and digits <= _FLOAT32_EXACT_DIGITS:
+            out.isetitem(i, col.astype("float32"))
+        elif _is_text(col) and col.nunique(dropna=True) <= n_rows * max_category_ratio:
+            out.isetitem(i, col.astype("category"))
+    return out
+
+
+def compaction_report(before: pd.DataFrame, after: pd.DataFrame) -> dict:
+    """
+    압축 전후 메모리 비교
+
+    Returns: {"before_bytes", "after_bytes", "ratio"(after/before),
+              "columns": [{"name", "before_dtype", "after_dtype", "before_bytes", "after_bytes"}]}
+    """
+    before_cols = before.memory_usage(deep=True, index=False)
+    after_cols = after.memory_usage(deep=True, index=False)
+    columns = [
+        {
+            "name": str(name),
+            "before_dtype": str(before.dtypes.iloc[i]),
+            "after_dtype": str(after.dtypes.iloc[i]),
+            "before_bytes": int(before_cols.iloc[i]),
+            "after_bytes": int(after_cols.iloc[i]),
+        }
+        for i, name in enumerate(before.columns)
+    ]
+    before_bytes = frame_nbytes(before)
+    after_bytes = frame_nbytes(after)
+    return {
+        "before_bytes": before_bytes,
+        "after_bytes": after_bytes,
+        "ratio": after_bytes / before_bytes if before_bytes else 1.0,
+        "columns": columns,
+    }
+
+
+def format_report(report: dict) -> str:
+    """compaction_report 결과를 한 줄 요약으로 (로그용)"""
+    changed = sum(c["before_dtype"] != c["after_dtype"] for c in report["columns"])
+    return (f"{report['before_bytes'] / 1024:,.1f} KB → {report['after_bytes'] / 1024:,.1f} KB "
+            f"({report['ratio']:.0%}, 컬럼 {changed}/{len(report['columns'])}개 변환)")
@@ -0,0 +1,146 @@
+"""
+LLM 호출 지표 수집
+SQL 생성 요청별 TTFT(첫 토큰까지 시간), 전체 소요시간, 프롬프트/캐시 적중 토큰 수를 기록하여
+vLLM 접두사 캐시(prefix caching)의 prefill 절감 효과를 확인
+- 캐시 토큰 수는 vLLM을 --enable-prompt-tokens-details로 띄워야 응답에 포함됨
+- 스트림을 조기 종료하여 마지막 usage 청크를 받지 못한 요청은 캐시 토큰 수를 알 수 없으므로(None) 적중률에서 제외
+"""
+import logging
+import re
+import statistics
+import threading
+import time
+import urllib.request
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+
+def usage_from_message(message) -> dict | None:
+    """AIMessage/AIMessageChunk의 usage_metadata에서 {"prompt", "cached", "output"} 토큰 수 추출"""
+    usage = getattr(message, "usage_metadata", None)
+    if not usage:
+        return None
+    details = usage.get("input_token_details") or {}
+    return {
+        "prompt": usage.get("input_tokens", 0),
+        "cached": details.get("cache_read", 0) or 0,
+        "output": usage.get("output_tokens", 0),
+    }
+
+
+class RequestTimer:
+    """요청 1건의 TTFT/소요시간/usage 측정 (스트림 청크마다 observe 호출)"""
+
+    def __init__(self):
+        self.start = time.monotonic()
+        self.ttft = None
+        self.usage = None
+        self.complete = False  # 스트림을 끝까지 받았는지 (마지막 usage 청크 포함)
+
+    def observe(self, chunk):
+        """첫 내용(또는 추론) 토큰 도착 시각과 가장 최근 usage 기록"""
+        if self.ttft is None and (chunk.content or chunk.additional_kwargs.get("reasoning_content")):
+            self.ttft = time.monotonic() - self.start
+        usage = usage_from_message(chunk)
+        if usage:
+            self.usage = usage
+
+    def finish(self):
+        """스트림을 끝까지 받았음을 표시 (조기 종료하지 않은 경우)"""
+        self.complete = True
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.start
+
+
+_PROM_LINE_RE = re.compile(r"^(vllm:prefix_cache_(?:queries|hits)(?:_total)?)(?:\{[^}]*\})?\s+([0-9.eE+-]+)$", re.MULTILINE)
+
+
+def scrape_prefix_cache_counters(base_url: str, timeout: float = 5) -> dict | None:
+    """
+    vLLM /metrics에서 접두사 캐시 누적 카운터(조회 토큰 수, 적중 토큰 수) 조회
+
+    스트림을 조기 종료하면 응답의 cached_tokens를 받지 못하므로 서버 측 카운터로 적중률을 확인
+    Returns: {"queries": int, "hits": int} 또는 조회 실패 시 None
+    """
+    url = re.sub(r"/v1/?$", "", base_url.rstrip("/")) + "/metrics"
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as resp:
+            text = resp.read().decode("utf-8", "replace")
+    except Exception as e:
+        logger.debug(f"vLLM 메트릭 조회 실패 ({url}): {e}")
+        return None
+    counters = {"queries": 0, "hits": 0}
+    for name, value in _PROM_LINE_RE.findall(text):
+        key = "hits" if "hits" in name else "queries"
+        counters[key] += int(float(value))
+    return counters
+
+
+def _percentile(values: list, pct: float):
+    if not values:
+        return None
+    if len(values) == 1:
+        return round(values[0], 3)
+    return round(statistics.quantiles(values, n=100, method="inclusive")[int(pct) - 1], 3)
+
+
+class LLMMetrics:
+    """최근 max_records건의 SQL 생성 호출 지표 (thread-safe)"""
+
+    def __init__(self, max_records: int = 500):
+        self._records = deque(maxlen=max_records)
+        self._lock = threading.Lock()
+
+    def record(self, model_key: str, prefix_digest: str, ttft: float | None, latency: float, usage: dict | None) -> dict:
+        """호출 1건 기록 후 기록 dict 반환 (ttft는 스트리밍 호출에서만 측정)"""
+        rec = {
+            "time": time.time(),
+            "model": model_key,
+            "prefix": prefix_digest,
+            "ttft": ttft,
+            "latency": latency,
+            "prompt_tokens": usage["prompt"] if usage else None,
+            "cached_tokens": usage["cached"] if usage else None,
+            "output_tokens": usage["output"] if usage else None,
+        }
+        with self._lock:
+            self._records.append(rec)
+        ttft_text = f"{ttft:.2f}s" if ttft is not None else "-"
+        if usage:
+            cached_text = f"{usage['cached']:,}" if usage["cached"] is not None else "미수신"
+            usage_text = f"프롬프트 {usage['prompt']:,} 토큰(캐시 {cached_text})"
+        else:
+            usage_text = "usage 없음"
+        logger.info(f"SQL 생성 [{model_key}] TTFT {ttft_text}, 전체 {latency:.2f}s, {usage_text}")
+        return rec
+
+    def stats(self, model_key: str = None) -> dict:
+        """
+        TTFT/소요시간 p50·p95와 프롬프트 토큰 중 캐시 적중 비율(%)
+
+        적중률은 캐시 토큰 수를 받은 요청만으로 계산 (hit_rate_samples건, 없으면 None —
+        조기 종료 스트림만 있을 때는 scrape_prefix_cache_counters로 서버 카운터 확인)
+        """
+        with self._lock:
+            records = [r for r in self._records if model_key is None or r["model"] == model_key]
+        ttfts = [r["ttft"] for r in records if r["ttft"] is not None]
+        latencies = [r["latency"] for r in records]
+        with_usage = [r for r in records if r["prompt_tokens"]]
+        with_cached = [r for r in with_usage if r["cached_tokens"] is not None]
+        prompt_total = sum(r["prompt_tokens"] for r in with_usage)
+        cached_prompt_total = sum(r["prompt_tokens"] for r in with_cached)
+        cached_total = sum(r["cached_tokens"] for r in with_cached)
+        return {
+            "count": len(records),
+            "ttft_p50": _percentile(ttfts, 50),
+            "ttft_p95": _percentile(ttfts, 95),
+            "latency_p50": _percentile(latencies, 50),
+            "latency_p95": _percentile(latencies, 95),
+            "prompt_tokens_avg": round(prompt_total / len(with_usage)) if with_usage else None,
+            "cached_tokens_avg": round(cached_total / len(with_cached)) if with_cached else None,
+            "prefix_hit_rate": round(cached_total / cached_prompt_total * 100, 1) if cached_prompt_total else None,
+            "hit_rate_samples": len(with_cached),
+        }
@@ -70,13 +70,13 @@ def get_available_models() -> list[dict]:
 
 def get_model_config(model_key: str) -> dict:
     """
-    지정한 모델 키에 대응하는 base_url, model_name, max_tokens를 반환
+    지정한 모델 키에 대응하는 base_url, model_name, max_tokens, max_concurrency를 반환
 
     Args:
         model_key: MODEL_REGISTRY의 키 (예: "gpt-oss-120b")
 
     Returns:
-        {"base_url": "...", "model_name": "...", "max_tokens": int}
+        {"base_url": "...", "model_name": "...", "max_tokens": int, "max_concurrency": int}
 
     Raises:
         KeyError: 등록되지 않은 모델 키
@@ -88,6 +88,7 @@ def get_model_config(model_key: str) -> dict:
         "base_url": cfg["base_url"],
         "model_name": cfg["model_name"],
         "max_tokens": cfg.get("max_tokens", 4096),
+        "max_concurrency": cfg.get("max_concurrency", 16),
     }
 
 
@@ -0,0 +1,211 @@
+"""
+이동번호(FTR_MOVE_STD) 메타데이터 조회
+마감여부(close_yn) 등 이동번호 단위 정보를 짧게 캐싱하여 여러 캐시 계층에서 공유
+- 이동번호 목록 카탈로그: 시작 시 로컬 파일에서 로드(DB 접속 없음), 백그라운드 스레드가 주기적으로 갱신
+"""
+import json
+import logging
+import os
+import threading
+
+from sqlalchemy import text
+
+from config import MOVE_STATUS_TTL_SEC, MOVE_CATALOG_CONFIG
+from db_setup import get_engine
+from sql_cache import LRUTTLCache
+
+logger = logging.getLogger(__name__)
+
+_engine = None
+_engine_lock = threading.Lock()
+
+# ftr_move_std_id(str) -> close_yn == 'Y'
+_close_status = LRUTTLCache(max_entries=1000, ttl=MOVE_STATUS_TTL_SEC)
+
+
+def _get_engine():
+    """조회용 엔진을 지연 생성 (import 시점에 DB 접속하지 않도록)"""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = get_engine()
+        return _engine
+
+
+def get_close_status(move_std_ids) -> dict:
+    """
+    이동번호별 마감여부 조회 (캐시 우선, 미조회분만 한 번에 DB 조회)
+
+    Args:
+        move_std_ids: 이동번호 목록 (str 또는 int)
+
+    Returns:
+        {"123": True, ...} — 조회 실패하거나 존재하지 않는 이동번호는 False(진행 중) 취급
+    """
+    result = {}
+    missing = []
+    for mid in {str(m) for m in move_std_ids}:
+        closed = _close_status.get(mid)
+        if closed is None:
+            missing.append(mid)
+        else:
+            result[mid] = closed
+
+    if missing:
+        binds = {f"m{i}": int(mid) for i, mid in enumerate(missing)}
+        placeholders = ", ".join(f":{k}" for k in binds)
+        try:
+            with _get_engine().connect() as conn:
+                rows = conn.execute(
+                    text(f"SELECT ftr_move_std_id, close_yn FROM HRAI_CON.ftr_move_std "
+                         f"WHERE ftr_move_std_id IN ({placeholders})"),
+                    binds,
+                ).fetchall()
+            found = {str(int(r[0])): (r[1] or "").upper() == "Y" for r in rows}
+        except Exception as e:
+            logger.warning(f"이동번호 마감여부 조회 실패: {e}")
+            found = {}
+        for mid in missing:
+            closed = found.get(mid, False)
+            if mid in found:
+                _close_status.set(mid, closed)
+            result[mid] = closed
+    return result
+
+
+def is_move_closed(move_std_id) -> bool:
+    """단일 이동번호의 마감여부"""
+    return get_close_status([move_std_id]).get(str(move_std_id), False)
+
+
+# ===== 이동번호 목록 카탈로그 =====
+_EMPTY_CHOICES = [("(이동번호 없음)", "0")]
+
+_STATS_SQL = """
+    SELECT
+        (SELECT COUNT(*) FROM HRAI_CON.move_item_master WHERE ftr_move_std_id = :mid) AS emp_cnt,
+        (SELECT COUNT(*) FROM HRAI_CON.move_org_master WHERE ftr_move_std_id = :mid) AS org_cnt,
+        (SELECT COUNT(*) FROM HRAI_CON.move_case_master WHERE ftr_move_std_id = :mid) AS case_cnt,
+        (SELECT COUNT(*) FROM HRAI_CON.move_item_master WHERE ftr_move_std_id = :mid AND must_move_yn = 1) AS must_move,
+        (SELECT COUNT(*) FROM HRAI_CON.move_item_master WHERE ftr_move_std_id = :mid AND must_stay_yn = 1) AS must_stay
+    FROM dual
+"""
+
+
+class MoveCatalog:
+    """
+    이동번호 Dropdown choices [(라벨, 이동번호 문자열), ...] 카탈로그 (thread-safe)
+
+    - 생성 시 로컬 캐시 파일에서만 로드하여 서비스 시작이 Oracle 응답을 기다리지 않음
+    - refresh()가 DB 목록을 다시 읽어 바뀌었으면 version을 올리고 파일에 저장
+    - 이동번호별 통계(직원/사업소/케이스/필수이동/필수유보 수)는 TTL 동안 재사용
+    """
+
+    def __init__(self, path: str, stats_ttl: float = 300):
+        self.path = path
+        self.version = 0
+        self._choices = []
+        self._lock = threading.Lock()
+        self._stats = LRUTTLCache(max_entries=500, ttl=stats_ttl)
+        self._load()
+
+    def choices(self) -> list[tuple]:
+        with self._lock:
+            return list(self._choices) or list(_EMPTY_CHOICES)
+
+    def refresh(self) -> bool:
+        """DB에서 이동번호 목록을 다시 조회 (목록이 바뀌었으면 True)"""
+        with _get_engine().connect() as conn:
+            rows = conn.execute(text(
+                "SELECT FTR_MOVE_STD_ID, STD_NM FROM HRAI_CON.FTR_MOVE_STD ORDER BY FTR_MOVE_STD_ID DESC"
+            )).fetchall()
+        choices = []
+        for ftr_id, std_nm in rows:
+            ftr_id = int(ftr_id) if ftr_id is not None else 0
+            choices.append((f"{ftr_id} - {std_nm or ftr_id}", str(ftr_id)))
+        with self._lock:
+            if choices == self._choices:
+                return False
+            self._choices = choices
+            self.version += 1
+        self._save(choices)
+        logger.info(f"이동번호 목록 갱신: {len(choices)}개 (버전 {self.version})")
+        return True
+
+    def stats(self, move_std_id) -> dict:
+        """이동번호별 통계 {"emp", "org", "case", "must_move", "must_stay"} (TTL 캐시)"""
+        key = str(int(move_std_id))
+        stats = self._stats.get(key)
+        if stats is None:
+            with _get_engine().connect() as conn:
+                row = conn.execute(text(_STATS_SQL), {"mid": int(key)}).fetchone()
+            stats = dict(zip(("emp", "org", "case", "must_move", "must_stay"), (int(v or 0) for v in row)))
+            self._stats.set(key, stats)
+        return stats
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                self._choices = [tuple(c) for c in json.load(f)["choices"]]
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"이동번호 목록 캐시 로드 실패 ({self.path}): {e}")
+
+    def _save(self, choices):
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"choices": choices}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"이동번호 목록 캐시 저장 실패 ({self.path}): {e}")
+
+
+_catalog = MoveCatalog(MOVE_CATALOG_CONFIG["path"], stats_ttl=MOVE_CATALOG_CONFIG["stats_ttl_sec"])
+_catalog_refresh_stop = threading.Event()
+_catalog_refresh_thread = None
+
+
+def get_move_choices() -> list[tuple]:
+    """이동번호 Dropdown choices (DB 조회 없이 카탈로그에서 반환)"""
+    return _catalog.choices()
+
+
+def get_move_catalog_version() -> int:
+    """목록이 갱신될 때마다 증가하는 카탈로그 버전 (화면 갱신 필요 여부 판단용)"""
+    return _catalog.version
+
+
+def refresh_move_catalog() -> bool:
+    return _catalog.refresh()
+
+
+def get_move_stats(move_std_id) -> dict:
+    return _catalog.stats(move_std_id)
+
+
+def _catalog_refresh_loop(interval_sec: float):
+    """백그라운드 이동번호 목록 갱신 루프 (시작 직후 1회 갱신 후 주기적으로 반복)"""
+    while True:
+        try:
+            _catalog.refresh()
+        except Exception as e:
+            logger.warning(f"이동번호 목록 갱신 실패: {e}")
+        _catalog_refresh_stop.wait(interval_sec)
+        if _catalog_refresh_stop.is_set():
+            return
+
+
+def start_move_catalog_refresher(interval_sec: float = None):
+    """이동번호 목록 백그라운드 갱신 스레드 시작 (중복 호출 시 무시)"""
+    global _catalog_refresh_thread
+    if _catalog_refresh_thread and _catalog_refresh_thread.is_alive():
+        return
+    interval_sec = interval_sec or MOVE_CATALOG_CONFIG["refresh_sec"]
+    _catalog_refresh_stop.clear()
+    _catalog_refresh_thread = threading.Thread(
+        target=_catalog_refresh_loop, args=(interval_sec,), name="move-catalog-refresher", daemon=True,
+    )
+    _catalog_refresh_thread.start()
@@ -0,0 +1,107 @@
+"""
+대시보드 집계 사전 계산 배치
+모든 이동번호에 대해 배치 결과 리포트/제약조건 분석 탭의 쿼리(dashboard_data.DASHBOARD_QUERIES)를
+제한된 병렬도로 미리 실행하고 결과를 aggregate_store에 저장 — 화면은 클릭 즉시 저장된 결과를 표시
+- 변경 감지 서명(ORA_ROWSCN + 행 수)을 쿼리 1회로 먼저 조회하여, 마지막 계산 이후 바뀌지 않은 이동번호는 건너뜀
+- 쿼리별/이동번호별 실행 시간 출력
+- 패널 HTML/LLM 요약 스냅샷(마감 이동번호)은 python app.py --prewarm-snapshots
+실행: python precompute.py                       (모든 이동번호, 변경된 것만)
+      python precompute.py --move 202409 [--move ...] [--force]
+      python precompute.py --status
+"""
+import argparse
+import concurrent.futures
+import logging
+import sys
+import time
+
+from aggregate_store import get_precompute_stats, save_precomputed, sql_key, stored_signature
+from case_resolver import latest_case_id
+from change_probe import sample_signatures
+from config import PRECOMPUTE_CONFIG
+from dashboard_data import DASHBOARD_QUERIES, fetch_rows
+from move_std import get_move_choices, refresh_move_catalog
+
+logger = logging.getLogger(__name__)
+
+
+def _run_query(mid: str, name: str) -> dict:
+    """이동번호 1개의 쿼리 1개 실행 (최종 case_id는 화면과 같이 상수 바인드)"""
+    params = {"mid": int(mid), "cid": latest_case_id(mid)}
+    t0 = time.perf_counter()
+    rows = fetch_rows(DASHBOARD_QUERIES[name], params)
+    return {"name": name, "params": params, "rows": [list(r) for r in rows],
+            "elapsed_ms": round((time.perf_counter() - t0) * 1000, 1)}
+
+
+def precompute_moves(move_std_ids, workers: int = None, force: bool = False) -> dict:
+    """
+    이동번호들의 대시보드 쿼리를 (이동번호, 쿼리) 단위로 병렬 실행하고 이동번호별로 저장
+
+    Returns: {"done": [이동번호], "skipped": [이동번호], "failed": [이동번호]}
+    """
+    workers = workers or PRECOMPUTE_CONFIG["workers"]
+    move_ids = sorted({str(int(m)) for m in move_std_ids}, key=int, reverse=True)
+    signatures = sample_signatures(move_ids)
+    targets = [mid for mid in move_ids if force or stored_signature(mid) != signatures[mid]]
+    skipped = [mid for mid in move_ids if mid not in targets]
+    print(f"사전 계산 대상 {len(targets)}개 (변경 없음 {len(skipped)}개 건너뜀), 병렬 {workers}")
+
+    entries = {mid: {} for mid in targets}
+    failed = set()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix="precompute") as ex:
+        futures = {ex.submit(_run_query, mid, name): (mid, name) for mid in targets for name in DASHBOARD_QUERIES}
+        for future in concurrent.futures.as_completed(futures):
+            mid, name = futures[future]
+            try:
+                entry = future.result()
+            except Exception as e:
+                logger.error(f"사전 계산 실패 ({mid}, {name}): {e}")
+                failed.add(mid)
+                continue
+            entries[mid][sql_key(DASHBOARD_QUERIES[name])] = entry
+            print(f"  {mid} {name}: {entry['elapsed_ms']:.0f} ms, {len(entry['rows']):,}행")
+
+            if len(entries[mid]) == len(DASHBOARD_QUERIES):
+                # 서명은 쿼리 전에 조회한 값 — 계산 중 변경되었으면 다음 실행 때 다시 계산됨
+                save_precomputed(mid, signatures[mid], entries[mid])
+                total_ms = sum(e["elapsed_ms"] for e in entries[mid].values())
+                print(f"  {mid}: 저장 (쿼리 {len(entries[mid])}개 합계 {total_ms:.0f} ms)")
+                entries[mid] = {}  # 저장한 결과 행은 메모리에서 해제
+
+    done = [mid for mid in targets if mid not in failed]
+    return {"done": done, "skipped": skipped, "failed": sorted(failed, key=int, reverse=True)}
+
+
+def _print_status():
+    stats = get_precompute_stats()
+    print("=" * 50)
+    print(f"[사전 계산] {PRECOMPUTE_CONFIG['dir']} (활성화: {PRECOMPUTE_CONFIG['enabled']})")
+    print("=" * 50)
+    print(f"  저장된 이동번호: {stats['moves']}개, {stats['bytes'] / 1024:.1f} KB")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    parser = argparse.ArgumentParser(description="대시보드 집계 사전 계산")
+    parser.add_argument("--move", action="append", default=[], help="계산할 이동번호 (여러 번 지정 가능, 미지정 시 전체)")
+    parser.add_argument("--workers", type=int, default=None, help="쿼리 병렬 실행 수")
+    parser.add_argument("--force", action="store_true", help="변경 여부와 관계없이 다시 계산")
+    parser.add_argument("--status", action="store_true", help="저장소 현황 출력")
+    args = parser.parse_args()
+
+    if args.status:
+        _print_status()
+        sys.exit(0)
+
+    moves = list(args.move)
+    if not moves:
+        refresh_move_catalog()
+        moves = [mid for _, mid in get_move_choices() if mid != "0"]
+    t0 = time.perf_counter()
+    result = precompute_moves(moves, workers=args.workers, force=args.force)
+    print(f"사전 계산 완료: {len(result['done'])}개 저장, {len(result['skipped'])}개 건너뜀, "
+          f"{len(result['failed'])}개 실패, {time.perf_counter() - t0:.1f}초")
+    if result["failed"]:
+        print(f"  실패 이동번호: {', '.join(result['failed'])}")
+        sys.exit(1)
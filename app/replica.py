@@ -0,0 +1,376 @@
+"""
+분석용 로컬 복제본 (Parquet + DuckDB)
+TARGET_TABLES를 이동번호(FTR_MOVE_STD_ID) 단위 Parquet 파일로 추출해 두고, 대시보드 집계와 (선택) execute_sql을
+내장 DuckDB에서 실행하여 운영 Oracle 부하와 30초 call_timeout 경합을 피함
+- 디렉토리 구조: {dir}/{table}/{이동번호}.parquet, FTR_MOVE_STD_ID가 없는 테이블은 {dir}/{table}/_all.parquet
+- 추출은 테이블별 병렬(REPLICA_CONFIG["workers"]), 큰 arraysize로 배치 단위 스트리밍 기록
+- Oracle SQL은 to_duckdb_sql()로 NVL/ROWNUM/FETCH FIRST/바인드 변수 등을 변환 (지원하지 않는 구문·NULL 의미가 다른 || 는 UnsupportedSQL)
+- 진행 중 이동번호는 max_age_sec 이내 추출분을 변경 감지(change_probe)가 켜져 있을 때만 사용하고,
+  변경이 감지되면 manifest에서 제외하여 이후 조회는 Oracle로 (다시 추출하면 복원)
+- duckdb/pyarrow가 설치되지 않았으면 복제본은 항상 비활성
+실행: python replica.py --move 202409 [--move ...]   (지정 이동번호 추출)
+      python replica.py --closed                   (마감된 모든 이동번호 추출)
+      python replica.py --status                   (복제본 현황)
+"""
+import argparse
+import concurrent.futures
+import datetime
+import json
+import logging
+import os
+import re
+import threading
+import time
+
+from change_probe import subscribe_changes
+from config import CHANGE_PROBE_CONFIG, DB_CONFIG, TARGET_TABLES, REPLICA_CONFIG
+from db_pool import pooled_connection
+from fetch_engine import normalize_column_name, rows_to_frame
+from move_std import get_close_status
+
+logger = logging.getLogger(__name__)
+
+try:
+    import duckdb
+    import pyarrow
+    import pyarrow.parquet as pq
+except ImportError:  # 선택 의존성 — 미설치 시 복제본 비활성
+    duckdb = None
+    pyarrow = None
+    pq = None
+
+_MANIFEST_NAME = "manifest.json"
+_GLOBAL_PART = "_all"
+
+
+class UnsupportedSQL(ValueError):
+    """DuckDB로 변환할 수 없는 Oracle 구문"""
+
+
+# ===== Oracle → DuckDB 방언 변환 =====
+_STRING_LITERAL_RE = re.compile(r"('(?:[^']|'')*')")
+# ||: Oracle은 NULL을 빈 문자열로 이어 붙이지만 DuckDB는 NULL을 반환하므로 결과가 달라짐 → Oracle에서 조회
+_UNSUPPORTED_RE = re.compile(r"\bCONNECT\s+BY\b|\(\+\)|\bROWID\b|\bDECODE\s*\(|\bMERGE\b|\|\|", re.IGNORECASE)
+_REWRITES = [
+    (re.compile(r"\bNVL\s*\(", re.IGNORECASE), "COALESCE("),
+    (re.compile(r"\bSYSDATE\b", re.IGNORECASE), "CURRENT_TIMESTAMP"),
+    (re.compile(r"\bMINUS\b", re.IGNORECASE), "EXCEPT"),
+    (re.compile(r"\s+FROM\s+DUAL\b", re.IGNORECASE), ""),
+    (re.compile(r"\bOFFSET\s+(\S+)\s+ROWS?\s+FETCH\s+(?:FIRST|NEXT)\s+(\S+)\s+ROWS?\s+ONLY\b", re.IGNORECASE),
+     r"LIMIT \2 OFFSET \1"),
+    (re.compile(r"\bFETCH\s+(?:FIRST|NEXT)\s+(\S+)\s+ROWS?\s+ONLY\b", re.IGNORECASE), r"LIMIT \1"),
+    (re.compile(r"(?<![:\w]):(\w+)"), r"$\1"),  # 바인드 변수 :mid → $mid
+]
+# 맨 바깥 WHERE/AND ROWNUM <= N (execute_sql의 결과 상한 래핑 포함)
+_TRAILING_ROWNUM_RE = re.compile(r"\s+(WHERE|AND)\s+ROWNUM\s*(<=|<)\s*(\d+)\s*$", re.IGNORECASE)
+
+
+def to_duckdb_sql(sql: str) -> str:
+    """Oracle SELECT를 DuckDB 방언으로 변환 (문자열 리터럴 내부는 변경하지 않음)"""
+    sql = sql.strip().rstrip(";")
+    limit = None
+    match = _TRAILING_ROWNUM_RE.search(sql)
+    if match:
+        limit = int(match.group(3)) - (1 if match.group(2) == "<" else 0)
+        # WHERE ROWNUM만 있던 경우는 WHERE 자체를 제거, AND면 앞 조건 유지
+        sql = sql[:match.start()]
+
+    parts = _STRING_LITERAL_RE.split(sql)
+    for i in range(0, len(parts), 2):  # 짝수 인덱스가 리터럴 밖
+        if _UNSUPPORTED_RE.search(parts[i]) or re.search(r"\bROWNUM\b", parts[i], re.IGNORECASE):
+            raise UnsupportedSQL(f"DuckDB 변환 미지원 구문: {parts[i][:80]}")
+        for pattern, repl in _REWRITES:
+            parts[i] = pattern.sub(repl, parts[i])
+    sql = "".join(parts)
+    if limit is not None:
+        sql = f"{sql} LIMIT {limit}"
+    return sql
+
+
+# ===== 추출 =====
+def _manifest_path() -> str:
+    return os.path.join(REPLICA_CONFIG["dir"], _MANIFEST_NAME)
+
+
+_manifest_lock = threading.Lock()
+# ((경로, 수정 시각, 크기), 내용) — 조회마다 JSON을 다시 읽지 않도록 파일이 바뀌었을 때만 다시 읽음
+_manifest_cache = (None, None)
+
+
+def _read_manifest() -> dict:
+    path = _manifest_path()
+    if not os.path.exists(path):
+        return {"moves": {}, "global": {}}
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"복제본 manifest 로드 실패 ({path}): {e}")
+        return {"moves": {}, "global": {}}
+
+
+def load_manifest() -> dict:
+    """
+    {"moves": {이동번호: {"extracted_at", "closed", "tables": {테이블: 행 수}}}, "global": {...}}
+
+    파일 수정 시각/크기가 그대로면 캐시된 dict 반환 (읽기 전용 — 변경은 _update_manifest로)
+    """
+    global _manifest_cache
+    path = _manifest_path()
+    try:
+        st = os.stat(path)
+    except OSError:
+        return {"moves": {}, "global": {}}
+    version = (path, st.st_mtime_ns, st.st_size)
+    cached_version, manifest = _manifest_cache
+    if cached_version != version:
+        manifest = _read_manifest()
+        _manifest_cache = (version, manifest)
+    return manifest
+
+
+def _update_manifest(update):
+    with _manifest_lock:
+        manifest = _read_manifest()
+        update(manifest)
+        os.makedirs(REPLICA_CONFIG["dir"], exist_ok=True)
+        tmp_path = f"{_manifest_path()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, _manifest_path())
+
+
+def move_partitioned_tables() -> set[str]:
+    """TARGET_TABLES 중 FTR_MOVE_STD_ID 컬럼이 있는 테이블 (소문자)"""
+    binds = {f"t{i}": t.upper() for i, t in enumerate(TARGET_TABLES)}
+    placeholders = ", ".join(f":{k}" for k in binds)
+    with pooled_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                f"SELECT table_name FROM all_tab_columns WHERE owner = :owner AND column_name = 'FTR_MOVE_STD_ID' "
+                f"AND table_name IN ({placeholders})",
+                {"owner": DB_CONFIG["user"].upper(), **binds},
+            )
+            return {r[0].lower() for r in cur.fetchall()}
+
+
+def _write_parquet(conn, sql: str, params: dict, path: str) -> int:
+    """SQL 결과를 배치 단위로 Parquet 파일에 기록 (임시 파일 후 교체). 기록한 행 수 반환"""
+    arraysize = REPLICA_CONFIG["arraysize"]
+    tmp_path = f"{path}.tmp"
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    n_rows = 0
+    writer = None
+    try:
+        if hasattr(conn, "fetch_df_batches"):
+            # oracledb가 Oracle 컬럼 타입으로 Arrow 배치를 채우므로 배치 간 스키마가 일정
+            for odf in conn.fetch_df_batches(statement=sql, parameters=params, size=arraysize):
+                table = pyarrow.table(odf)
+                if writer is None:
+                    writer = pq.ParquetWriter(tmp_path, table.schema, compression="zstd")
+                writer.write_table(table)
+                n_rows += table.num_rows
+        else:
+            with conn.cursor() as cur:
+                cur.arraysize = arraysize
+                cur.execute(sql, params)
+                columns = [d[0] for d in cur.description]
+                df = rows_to_frame(cur.fetchall(), columns)
+            table = pyarrow.Table.from_pandas(df, preserve_index=False)
+            writer = pq.ParquetWriter(tmp_path, table.schema, compression="zstd")
+            writer.write_table(table)
+            n_rows = table.num_rows
+        if writer is None:
+            return 0  # 0건 — 기존 파일이 있으면 제거하여 조회 결과도 0건이 되도록 함
+    finally:
+        if writer is not None:
+            writer.close()
+    os.replace(tmp_path, path)
+    return n_rows
+
+
+def _extract_table(table: str, move_std_id=None) -> tuple[str, int, float]:
+    t0 = time.perf_counter()
+    if move_std_id is None:
+        sql, params, part = f"SELECT * FROM HRAI_CON.{table}", {}, _GLOBAL_PART
+    else:
+        sql = f"SELECT * FROM HRAI_CON.{table} WHERE ftr_move_std_id = :mid"
+        params, part = {"mid": int(move_std_id)}, str(int(move_std_id))
+    path = os.path.join(REPLICA_CONFIG["dir"], table, f"{part}.parquet")
+    with pooled_connection() as conn:
+        n_rows = _write_parquet(conn, sql, params, path)
+    if n_rows == 0 and os.path.exists(path):
+        os.remove(path)
+    return table, n_rows, time.perf_counter() - t0
+
+
+def extract_moves(move_std_ids, include_global: bool = True) -> dict:
+    """
+    이동번호들의 TARGET_TABLES 데이터를 Parquet로 추출 (테이블 단위 병렬)
+
+    Returns: {이동번호: {테이블: 행 수}} — 이동번호 컬럼이 없는 테이블은 "global" 키
+    """
+    if duckdb is None:
+        raise RuntimeError("duckdb/pyarrow가 설치되지 않아 복제본을 만들 수 없습니다")
+    partitioned = move_partitioned_tables()
+    jobs = []
+    if include_global:
+        jobs += [(t, None) for t in TARGET_TABLES if t not in partitioned]
+    move_ids = [str(int(m)) for m in move_std_ids]
+    jobs += [(t, mid) for mid in move_ids for t in TARGET_TABLES if t in partitioned]
+
+    results = {}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=REPLICA_CONFIG["workers"],
+                                               thread_name_prefix="replica-extract") as ex:
+        futures = {ex.submit(_extract_table, t, mid): (t, mid) for t, mid in jobs}
+        for future in concurrent.futures.as_completed(futures):
+            table, mid = futures[future]
+            key = mid or "global"
+            try:
+                _, n_rows, elapsed = future.result()
+            except Exception as e:
+                logger.error(f"복제본 추출 실패 ({table}, {key}): {e}")
+                results.setdefault(key, {})[table] = None
+                continue
+            results.setdefault(key, {})[table] = n_rows
+            logger.info(f"복제본 추출 {table} [{key}] {n_rows:,}행 {elapsed:.1f}초")
+
+    closed = get_close_status(move_ids)
+    now = datetime.datetime.now().isoformat(timespec="seconds")
+
+    def update(manifest):
+        if "global" in results and None not in results["global"].values():
+            manifest["global"] = {"extracted_at": now, "tables": results["global"]}
+        for mid in move_ids:
+            tables = results.get(mid, {})
+            if None in tables.values():
+                manifest["moves"].pop(mid, None)  # 일부 테이블 실패 — 복제본 사용 안 함
+            else:
+                manifest["moves"][mid] = {"extracted_at": now, "closed": closed.get(mid, False), "tables": tables}
+
+    _update_manifest(update)
+    _replica.reset()
+    return results
+
+
+# ===== 조회 =====
+class ReplicaDB:
+    """복제본 Parquet 위에 HRAI_CON 스키마 뷰를 구성한 내장 DuckDB (스레드별 커서 사용)"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._con = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        with self._lock:
+            if self._con is None:
+                con = duckdb.connect(database=":memory:")
+                con.execute("CREATE SCHEMA IF NOT EXISTS hrai_con")
+                for table in TARGET_TABLES:
+                    table_dir = os.path.join(self.directory, table)
+                    if not os.path.isdir(table_dir) or not any(f.endswith(".parquet") for f in os.listdir(table_dir)):
+                        continue  # 추출되지 않은 테이블은 뷰를 만들지 않음 (조회 시 오류 → Oracle 재조회)
+                    pattern = os.path.join(table_dir, "*.parquet")
+                    view = f"read_parquet('{pattern}', union_by_name = true)"
+                    con.execute(f"CREATE OR REPLACE VIEW hrai_con.{table} AS SELECT * FROM {view}")
+                    con.execute(f"CREATE OR REPLACE VIEW main.{table} AS SELECT * FROM {view}")
+                self._con = con
+            return self._con
+
+    def reset(self):
+        """추출 후 뷰를 다시 구성하도록 연결 폐기"""
+        with self._lock:
+            if self._con is not None:
+                self._con.close()
+                self._con = None
+
+    def query(self, sql: str, params: dict = None):
+        """Oracle SQL을 변환하여 실행한 DuckDB 관계(cursor) 반환"""
+        cur = self._connect().cursor()
+        duck_sql = to_duckdb_sql(sql)
+        used = set(re.findall(r"\$(\w+)", duck_sql))
+        return cur.execute(duck_sql, {k: v for k, v in (params or {}).items() if k in used})
+
+
+_replica = ReplicaDB(REPLICA_CONFIG["dir"])
+
+
+def has_move(move_std_id) -> bool:
+    """
+    이동번호가 복제본에 있고 사용 가능한지
+
+    진행 중 이동번호는 변경 감지가 켜져 있고(변경 시 forget_move로 제외) max_age_sec 이내 추출분만
+    """
+    if not REPLICA_CONFIG["enabled"] or duckdb is None or move_std_id is None:
+        return False
+    entry = load_manifest()["moves"].get(str(int(move_std_id)))
+    if not entry:
+        return False
+    if entry.get("closed"):
+        return True
+    if not CHANGE_PROBE_CONFIG["enabled"]:
+        return False  # 변경을 알 수 없으므로 진행 중 이동번호는 항상 Oracle
+    age = (datetime.datetime.now() - datetime.datetime.fromisoformat(entry["extracted_at"])).total_seconds()
+    return age <= REPLICA_CONFIG["max_age_sec"]
+
+
+def forget_move(move_std_id, changed: set = None):
+    """이동번호를 manifest에서 제외 (원본 데이터가 바뀌어 복제본이 오래됨 — 다시 추출하면 복원)"""
+    mid = str(int(move_std_id))
+    if mid not in load_manifest()["moves"]:
+        return
+    _update_manifest(lambda manifest: manifest["moves"].pop(mid, None))
+    logger.info(f"복제본에서 이동번호 {mid} 제외 (데이터 변경 감지) — 이후 조회는 Oracle")
+
+
+if REPLICA_CONFIG["enabled"]:
+    # 변경 감지 후 캐시를 지우고 다시 조회할 때 같은 오래된 복제본을 읽지 않도록 먼저 제외
+    subscribe_changes(forget_move)
+
+
+def query_rows(sql: str, params: dict = None) -> list[tuple]:
+    return _replica.query(sql, params).fetchall()
+
+
+def query_frame(sql: str, params: dict = None):
+    """DataFrame으로 조회 (컬럼명은 fetch_engine과 같이 소문자 정규화)"""
+    df = _replica.query(sql, params).df()
+    df.columns = [normalize_column_name(c) for c in df.columns]
+    return df
+
+
+def _print_status():
+    manifest = load_manifest()
+    print("=" * 50)
+    print(f"[복제본] {REPLICA_CONFIG['dir']} (활성화: {REPLICA_CONFIG['enabled']})")
+    print("=" * 50)
+    if manifest.get("global"):
+        print(f"  공통 테이블: {manifest['global']['extracted_at']}")
+    for mid, entry in sorted(manifest["moves"].items(), key=lambda kv: int(kv[0]), reverse=True):
+        total = sum(entry["tables"].values())
+        state = "마감" if entry.get("closed") else "진행"
+        print(f"  {mid} ({state}): {total:,}행, {entry['extracted_at']}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    parser = argparse.ArgumentParser(description="분석용 로컬 복제본 추출")
+    parser.add_argument("--move", action="append", default=[], help="추출할 이동번호 (여러 번 지정 가능)")
+    parser.add_argument("--closed", action="store_true", help="마감된 모든 이동번호 추출")
+    parser.add_argument("--status", action="store_true", help="복제본 현황 출력")
+    args = parser.parse_args()
+
+    if args.status:
+        _print_status()
+    else:
+        moves = list(args.move)
+        if args.closed:
+            from move_std import get_move_choices, refresh_move_catalog
+            refresh_move_catalog()
+            all_ids = [mid for _, mid in get_move_choices() if mid != "0"]
+            moves += [mid for mid, closed in get_close_status(all_ids).items() if closed]
+        t0 = time.perf_counter()
+        extract_moves(sorted(set(moves), key=int))
+        print(f"추출 완료: 이동번호 {len(set(moves))}개, {time.perf_counter() - t0:.1f}초")
+        _print_status()
@@ -0,0 +1,130 @@
+"""
+마감된 이동번호의 리포트 스냅샷 저장소
+마감(ftr_move_std.close_yn='Y')된 이동번호는 배치 결과 리포트/제약조건 분석 결과가 더 이상 바뀌지 않으므로
+렌더링된 패널 HTML, 구조화된 통계, LLM 요약을 gzip JSON 파일로 보관하여 Oracle/LLM 호출 없이 즉시 표시
+- 키: 종류(report/cnst) + 이동번호 + 최종 case_id + rev_id '999' — 최종 케이스가 바뀌면 자연히 새 스냅샷
+- 진행 중인 이동번호는 저장/조회하지 않음
+"""
+import datetime
+import gzip
+import json
+import logging
+import os
+import threading
+
+from case_resolver import latest_case_id
+from change_probe import subscribe_changes
+from config import REPORT_SNAPSHOT_CONFIG
+from move_std import is_move_closed
+
+logger = logging.getLogger(__name__)
+
+# 스냅샷 파일 형식 버전 (패널 HTML 구조가 바뀌면 올려서 이전 파일을 무시하게 함)
+SNAPSHOT_VERSION = 1
+REV_ID = "999"
+
+
+class ReportSnapshotStore:
+    """이동번호별 리포트 스냅샷 파일 저장소 (thread-safe)"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._lock = threading.Lock()
+
+    def _path(self, kind: str, move_std_id, case_id) -> str:
+        return os.path.join(self.directory, f"{kind}_{int(move_std_id)}_{int(case_id)}_{REV_ID}.json.gz")
+
+    def get(self, kind: str, move_std_id, case_id) -> dict | None:
+        """스냅샷 payload 반환 (없거나 버전이 다르면 None)"""
+        path = self._path(kind, move_std_id, case_id)
+        if not os.path.exists(path):
+            return None
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"리포트 스냅샷 로드 실패 ({path}): {e}")
+            return None
+        if snapshot.get("version") != SNAPSHOT_VERSION:
+            return None
+        return snapshot["payload"]
+
+    def put(self, kind: str, move_std_id, case_id, payload: dict):
+        """스냅샷 저장 (임시 파일에 쓴 뒤 교체하여 읽는 쪽이 깨진 파일을 보지 않도록 함)"""
+        path = self._path(kind, move_std_id, case_id)
+        snapshot = {
+            "version": SNAPSHOT_VERSION,
+            "created_at": datetime.datetime.now().isoformat(timespec="seconds"),
+            "payload": payload,
+        }
+        with self._lock:
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                tmp_path = f"{path}.tmp"
+                with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+                    json.dump(snapshot, f, ensure_ascii=False)
+                os.replace(tmp_path, path)
+            except OSError as e:
+                logger.warning(f"리포트 스냅샷 저장 실패 ({path}): {e}")
+
+    def invalidate_move(self, move_std_id) -> int:
+        """이동번호의 모든 스냅샷 파일 삭제 (삭제한 파일 수 반환)"""
+        if not os.path.isdir(self.directory):
+            return 0
+        removed = 0
+        with self._lock:
+            for name in os.listdir(self.directory):
+                kind, _, rest = name.partition("_")
+                if rest.startswith(f"{int(move_std_id)}_") and name.endswith(".json.gz"):
+                    try:
+                        os.remove(os.path.join(self.directory, name))
+                        removed += 1
+                    except OSError as e:
+                        logger.warning(f"리포트 스냅샷 삭제 실패 ({name}): {e}")
+        return removed
+
+    def stats(self) -> dict:
+        """스냅샷 파일 수와 전체 크기(bytes)"""
+        if not os.path.isdir(self.directory):
+            return {"files": 0, "bytes": 0}
+        files = [f for f in os.listdir(self.directory) if f.endswith(".json.gz")]
+        size = sum(os.path.getsize(os.path.join(self.directory, f)) for f in files)
+        return {"files": len(files), "bytes": size}
+
+
+_store = ReportSnapshotStore(REPORT_SNAPSHOT_CONFIG["dir"])
+
+# 마감 후에도 결과가 다시 기록되는 경우(재마감 등)에 대비해 변경이 감지되면 스냅샷 폐기
+subscribe_changes(lambda move_std_id, changed: _store.invalidate_move(move_std_id))
+
+
+def snapshot_key(move_std_id) -> int | None:
+    """
+    스냅샷 대상이면 최종 case_id, 아니면 None
+
+    스냅샷 비활성화, 이동번호 미선택, 진행 중인 이동번호, 케이스 없음, 조회 실패는 모두 None
+    """
+    if not REPORT_SNAPSHOT_CONFIG["enabled"] or not move_std_id or move_std_id == "0":
+        return None
+    try:
+        if not is_move_closed(move_std_id):
+            return None
+        return latest_case_id(move_std_id)
+    except Exception as e:
+        logger.warning(f"리포트 스냅샷 키 조회 실패 ({move_std_id}): {e}")
+        return None
+
+
+def load_report_snapshot(kind: str, move_std_id, case_id) -> dict | None:
+    if case_id is None:
+        return None
+    return _store.get(kind, move_std_id, case_id)
+
+
+def save_report_snapshot(kind: str, move_std_id, case_id, payload: dict):
+    if case_id is not None:
+        _store.put(kind, move_std_id, case_id, payload)
+
+
+def get_snapshot_stats() -> dict:
+    return _store.stats()
@@ -0,0 +1,146 @@
+"""
+SQL 실행 결과 캐시
+정규화된 SQL 지문(fingerprint)을 키로 execute_sql 결과 DataFrame을 재사용
+- 메모리 상한은 DataFrame 바이트 크기 기준 (LRU 제거)
+- SQL에 포함된 FTR_MOVE_STD_ID 단위로 무효화
+- 마감된 이동번호만 조회하는 결과는 만료 없음, 그 외에는 짧은 TTL 적용
+"""
+import hashlib
+import logging
+import re
+import threading
+
+import pandas as pd
+
+from move_std import get_close_status
+from sql_cache import LRUTTLCache
+
+logger = logging.getLogger(__name__)
+
+# 이동번호 리터럴을 특정할 수 없는 SQL(예: MAX(ftr_move_std_id) 서브쿼리)의 무효화 그룹
+ANY_MOVE = "*"
+
+_STRING_LITERAL_RE = re.compile(r"('(?:[^']|'')*'|\"[^\"]*\")")
+_MOVE_ID_RE = re.compile(r"\bFTR_MOVE_STD_ID\s*(?:=\s*(\d+)|IN\s*\(([\d\s,]+)\))", re.IGNORECASE)
+
+
+def normalize_sql(sql: str) -> str:
+    """문자열 리터럴/따옴표 식별자는 유지하고 나머지 부분의 공백 축약(연산자/괄호 주변 공백 제거) + 대문자화"""
+    parts = _STRING_LITERAL_RE.split(sql.strip())
+    out = []
+    for i, part in enumerate(parts):
+        if i % 2 == 1:
+            out.append(part)
+        else:
+            part = re.sub(r"\s+", " ", part)
+            out.append(re.sub(r" ?([=<>(),]) ?", r"\1", part).upper())
+    return "".join(out).strip()
+
+
+def sql_fingerprint(sql: str) -> str:
+    """정규화된 SQL의 sha256 지문"""
+    return hashlib.sha256(normalize_sql(sql).encode("utf-8")).hexdigest()
+
+
+def extract_move_ids(sql: str) -> set[str]:
+    """SQL에서 FTR_MOVE_STD_ID = N / IN (N, ...) 리터럴을 추출"""
+    ids = set()
+    for eq, in_list in _MOVE_ID_RE.findall(sql):
+        if eq:
+            ids.add(str(int(eq)))
+        for token in in_list.split(","):
+            if token.strip():
+                ids.add(str(int(token)))
+    return ids
+
+
+def _frame_nbytes(df: pd.DataFrame) -> int:
+    return int(df.memory_usage(deep=True, index=True).sum())
+
+
+class ResultCache:
+    """
+    execute_sql 결과 캐시
+
+    move_std_id별로 키 인덱스를 유지하여 invalidate_move()로 해당 이동번호가 포함된
+    결과만 골라서 제거할 수 있음 (LRU 제거/만료된 키는 인덱스에서도 정리)
+    """
+
+    def __init__(self, max_entries: int = 500, max_bytes: int = 256 * 1024 * 1024, open_ttl: float = 60):
+        self.open_ttl = open_ttl
+        self._cache = LRUTTLCache(max_entries=max_entries, max_bytes=max_bytes, sizeof=_frame_nbytes,
+                                  on_evict=lambda key, df: self._unindex(key))
+        self._by_move = {}  # move_std_id -> set(fingerprint)
+        self._moves_of = {}  # fingerprint -> set(move_std_id) (제거 시 _by_move 정리용)
+        self._index_lock = threading.Lock()
+
+    def _unindex(self, key: str):
+        """키를 이동번호 인덱스에서 제거"""
+        with self._index_lock:
+            for mid in self._moves_of.pop(key, ()):
+                keys = self._by_move.get(mid)
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del self._by_move[mid]
+
+    def get(self, sql: str):
+        """
+        캐시된 DataFrame의 사본 반환 (없거나 만료되었으면 None)
+
+        호출 측(페이지 탐색/압축/화면)이 결과를 수정해도 캐시 항목에 영향이 없도록 사본을 돌려줌
+        """
+        key = sql_fingerprint(sql)
+        df = self._cache.get(key)
+        if df is None:
+            self._unindex(key)  # 만료로 제거된 키
+            return None
+        return df.copy()
+
+    def set(self, sql: str, df: pd.DataFrame):
+        """
+        결과 사본 저장 — 참조하는 이동번호가 모두 마감 상태면 만료 없이 보관
+
+        호출 측은 저장한 DataFrame을 그대로 돌려받아 쓰므로 사본을 보관 (이후 수정이 캐시 항목에 반영되지 않도록)
+        """
+        key = sql_fingerprint(sql)
+        move_ids = extract_move_ids(_STRING_LITERAL_RE.sub("''", sql))
+        closed = bool(move_ids) and all(get_close_status(move_ids).values())
+        ttl = 0 if closed else self.open_ttl
+        # 색인을 먼저 등록 — 저장 직후 LRU 제거(on_evict → _unindex)가 색인보다 먼저 실행되어 키가 남지 않도록
+        with self._index_lock:
+            mids = move_ids or {ANY_MOVE}
+            self._moves_of[key] = set(mids)
+            for mid in mids:
+                self._by_move.setdefault(mid, set()).add(key)
+        if not self._cache.set(key, df.copy(), ttl=ttl):
+            logger.debug(f"결과 캐시 상한 초과로 저장 생략 ({_frame_nbytes(df):,} bytes)")
+            self._cache.pop(key)  # 같은 SQL의 이전 결과도 새 결과로 대체되었으므로 제거
+            self._unindex(key)
+
+    def invalidate_move(self, move_std_id) -> int:
+        """이동번호가 포함된 결과(및 이동번호 미지정 결과) 제거, 제거 건수 반환"""
+        with self._index_lock:
+            keys = self._by_move.get(str(move_std_id), set()) | self._by_move.get(ANY_MOVE, set())
+        removed = 0
+        for key in keys:
+            if self._cache.pop(key) is not None:
+                removed += 1
+            self._unindex(key)
+        if removed:
+            logger.info(f"결과 캐시 무효화: 이동번호 {move_std_id} — {removed}건")
+        return removed
+
+    def index_size(self) -> int:
+        """이동번호 인덱스에 남아 있는 키 수"""
+        with self._index_lock:
+            return len(self._moves_of)
+
+    def clear(self):
+        self._cache.clear()
+        with self._index_lock:
+            self._by_move.clear()
+            self._moves_of.clear()
+
+    def stats(self) -> dict:
+        return self._cache.stats()
@@ -0,0 +1,283 @@
+"""
+조회 결과 전체 내보내기 (CSV / Parquet / XLSX)
+화면 표시용 1000행 상한 없이 SQL을 다시 실행하고, 커서에서 batch_rows씩 읽어 파일에 바로 기록
+- 메모리 사용은 배치 크기로 제한 (결과 전체를 DataFrame으로 만들지 않음)
+- CSV: UTF-8 BOM (한글 Excel 호환, 컬럼 타입별 고정 형식), Parquet: pyarrow (Oracle 컬럼 타입 기준 고정 스키마, zstd),
+  XLSX: openpyxl write-only 모드 (시트당 행 한도를 넘으면 다음 시트에 이어서 기록)
+- 진행률: 배치를 기록할 때마다 on_progress(누적 행 수)
+- 파일은 EXPORT_CONFIG["dir"]에 두고, 새 내보내기 전에 보관 시간/용량 한도 기준으로 오래된 파일부터 정리
+- pyarrow/openpyxl이 없으면 해당 형식만 비활성 (available_formats)
+"""
+import csv
+import datetime
+import logging
+import os
+import time
+import uuid
+
+import oracledb
+
+from config import EXPORT_CONFIG
+from db_pool import pooled_connection
+from fetch_engine import column_kind, normalize_column_name
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pyarrow
+    import pyarrow.parquet as pq
+except ImportError:  # 선택 의존성 — 미설치 시 Parquet 내보내기 비활성
+    pyarrow = None
+    pq = None
+
+try:
+    from openpyxl import Workbook
+    from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+except ImportError:  # 선택 의존성 — 미설치 시 XLSX 내보내기 비활성
+    Workbook = None
+    ILLEGAL_CHARACTERS_RE = None
+
+EXPORT_FORMATS = {"csv": ".csv", "parquet": ".parquet", "xlsx": ".xlsx"}
+_FILE_PREFIX = "query_result_"
+_XLSX_MAX_ROWS = 1_048_576  # Excel 시트당 최대 행 수 (헤더 포함)
+
+
+def available_formats() -> list[str]:
+    """설치된 의존성으로 가능한 내보내기 형식"""
+    formats = ["csv"]
+    if pyarrow is not None:
+        formats.append("parquet")
+    if Workbook is not None:
+        formats.append("xlsx")
+    return formats
+
+
+# ===== 형식별 기록기 =====
+def _is_integer_column(description) -> bool:
+    """소수 자릿수 0인 NUMBER(p) 컬럼 (Parquet 정수 필드)"""
+    _, type_code, _, _, precision, scale, _ = description
+    return type_code == oracledb.DB_TYPE_NUMBER and scale == 0 and bool(precision)
+
+
+_CSV_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def _csv_formatter(description):
+    """
+    컬럼별 CSV 셀 변환 함수 (배치와 관계없이 같은 컬럼은 같은 형식)
+
+    - NUMBER: 정수값은 소수점 없이 (드라이버가 float로 준 정수값 포함), 그 외는 repr
+    - 날짜: 초 단위 고정 형식
+    - NULL: 빈 칸
+    """
+    kind = column_kind(description)
+    if kind == "number" and description[1] == oracledb.DB_TYPE_NUMBER:
+        def fmt(v):
+            if v is None:
+                return ""
+            if isinstance(v, float) and v.is_integer():
+                return str(int(v))
+            return str(v)
+    elif kind == "date":
+        def fmt(v):
+            return "" if v is None else v.strftime(_CSV_DATE_FORMAT)
+    else:
+        def fmt(v):
+            return "" if v is None else str(v)
+    return fmt
+
+
+class _CsvWriter:
+    """
+    csv.writer로 행을 바로 기록 (BOM은 파일 처음 1회)
+
+    배치마다 DataFrame으로 바꾸면 NULL이 있는 배치만 정수 컬럼이 float가 되어 "12"와 "12.0"이 섞이므로
+    cursor.description 기준 컬럼별 변환 함수로 기록
+    """
+
+    def __init__(self, path: str, description):
+        self.formatters = [_csv_formatter(d) for d in description]
+        self._file = open(path, "w", encoding="utf-8-sig", newline="")
+        self._writer = csv.writer(self._file, lineterminator="\n")
+        self._writer.writerow([normalize_column_name(d[0]) for d in description])
+
+    def write(self, rows: list):
+        formatters = self.formatters
+        self._writer.writerows([fmt(v) for fmt, v in zip(formatters, row)] for row in rows)
+
+    def close(self):
+        self._file.close()
+
+
+def _arrow_field(description):
+    """cursor.description 항목 → Arrow 필드 (배치마다 NULL 분포가 달라도 스키마가 바뀌지 않도록 고정)"""
+    name, type_code, _, _, precision, scale, _ = description
+    if type_code in (oracledb.DB_TYPE_NUMBER, oracledb.DB_TYPE_BINARY_INTEGER):
+        if _is_integer_column(description) and precision <= 18:
+            return pyarrow.field(normalize_column_name(name), pyarrow.int64())
+        return pyarrow.field(normalize_column_name(name), pyarrow.float64())
+    if type_code in (oracledb.DB_TYPE_BINARY_DOUBLE, oracledb.DB_TYPE_BINARY_FLOAT):
+        return pyarrow.field(normalize_column_name(name), pyarrow.float64())
+    if type_code in (oracledb.DB_TYPE_DATE, oracledb.DB_TYPE_TIMESTAMP):
+        return pyarrow.field(normalize_column_name(name), pyarrow.timestamp("us"))
+    return pyarrow.field(normalize_column_name(name), pyarrow.string())
+
+
+class _ParquetWriter:
+    """배치를 컬럼 배열로 전치해 row group 단위로 기록"""
+
+    def __init__(self, path: str, description):
+        self.schema = pyarrow.schema([_arrow_field(d) for d in description])
+        self._writer = pq.ParquetWriter(path, self.schema, compression="zstd")
+
+    def write(self, rows: list):
+        arrays = []
+        for field, values in zip(self.schema, zip(*rows)):
+            if pyarrow.types.is_string(field.type):
+                values = [v if v is None or isinstance(v, str) else str(v) for v in values]
+            arrays.append(pyarrow.array(values, type=field.type))
+        self._writer.write_table(pyarrow.Table.from_arrays(arrays, schema=self.schema))
+
+    def close(self):
+        self._writer.close()
+
+
+class _XlsxWriter:
+    """openpyxl write-only 통합문서 (행을 바로 임시 XML로 흘려 보내 메모리에 쌓지 않음)"""
+
+    def __init__(self, path: str, description):
+        self.path = path
+        self.columns = [normalize_column_name(d[0]) for d in description]
+        self._book = Workbook(write_only=True)
+        self._sheet = None
+        self._sheet_rows = 0
+        self._new_sheet()
+
+    def _new_sheet(self):
+        n = len(self._book.worksheets) + 1
+        self._sheet = self._book.create_sheet(title="결과" if n == 1 else f"결과_{n}")
+        self._sheet.append(self.columns)
+        self._sheet_rows = 1
+
+    @staticmethod
+    def _cell(value):
+        if isinstance(value, str):
+            return ILLEGAL_CHARACTERS_RE.sub("", value)  # 제어 문자는 XLSX에 기록 불가
+        return value
+
+    def write(self, rows: list):
+        for row in rows:
+            if self._sheet_rows >= _XLSX_MAX_ROWS:
+                self._new_sheet()
+            self._sheet.append([self._cell(v) for v in row])
+            self._sheet_rows += 1
+
+    def close(self):
+        self._book.save(self.path)
+
+
+_WRITERS = {"csv": _CsvWriter, "parquet": _ParquetWriter, "xlsx": _XlsxWriter}
+
+
+# ===== 파일 정리 =====
+def gc_exports(max_age_sec: float = None, quota_bytes: int = None) -> dict:
+    """
+    내보내기 파일 정리 — 보관 시간이 지난 파일(중단된 .part 포함)을 지우고,
+    남은 파일 합계가 용량 한도를 넘으면 오래된 파일부터 삭제
+
+    Returns: {"removed": 삭제 파일 수, "freed": 삭제 바이트, "kept": 남은 파일 수, "bytes": 남은 바이트}
+    """
+    max_age_sec = EXPORT_CONFIG["max_age_sec"] if max_age_sec is None else max_age_sec
+    quota_bytes = EXPORT_CONFIG["quota_bytes"] if quota_bytes is None else quota_bytes
+    directory = EXPORT_CONFIG["dir"]
+    if not os.path.isdir(directory):
+        return {"removed": 0, "freed": 0, "kept": 0, "bytes": 0}
+
+    files = []
+    for name in os.listdir(directory):
+        if not name.startswith(_FILE_PREFIX):
+            continue
+        path = os.path.join(directory, name)
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        files.append((st.st_mtime, st.st_size, path))
+    files.sort()  # 오래된 순
+
+    now = time.time()
+    total = sum(size for _, size, _ in files)
+    removed = freed = 0
+    kept = []
+    for mtime, size, path in files:
+        if now - mtime > max_age_sec or total > quota_bytes:
+            try:
+                os.remove(path)
+                removed += 1
+                freed += size
+                total -= size
+                continue
+            except OSError as e:
+                logger.warning(f"내보내기 파일 삭제 실패 ({path}): {e}")
+        kept.append(size)
+    if removed:
+        logger.info(f"내보내기 파일 {removed}개 정리 ({freed / 1024 / 1024:.1f} MB)")
+    return {"removed": removed, "freed": freed, "kept": len(kept), "bytes": sum(kept)}
+
+
+# ===== 내보내기 =====
+def export_query(sql: str, fmt: str = "csv", on_progress=None) -> dict:
+    """
+    SQL 결과 전체를 파일로 내보내기 (호출 전에 SQL 안전성 검증을 마쳤다고 가정)
+
+    Args:
+        sql: 실행할 SELECT 문 (행 상한 없음)
+        fmt: "csv" / "parquet" / "xlsx"
+        on_progress: 배치 기록 후 호출되는 callback(누적 행 수)
+
+    Returns: {"path": 파일 경로, "rows": 행 수, "bytes": 파일 크기, "elapsed": 소요 초}
+    """
+    if fmt not in available_formats():
+        raise ValueError(f"지원하지 않는 내보내기 형식: {fmt}")
+    gc_exports()
+    os.makedirs(EXPORT_CONFIG["dir"], exist_ok=True)
+    stamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    path = os.path.join(EXPORT_CONFIG["dir"], f"{_FILE_PREFIX}{stamp}_{uuid.uuid4().hex[:6]}{EXPORT_FORMATS[fmt]}")
+    tmp_path = f"{path}.part"
+    batch_rows = EXPORT_CONFIG["batch_rows"]
+
+    t0 = time.perf_counter()
+    n_rows = 0
+    try:
+        with pooled_connection() as conn:
+            call_timeout = conn.call_timeout
+            conn.call_timeout = EXPORT_CONFIG["call_timeout_sec"] * 1000
+            try:
+                with conn.cursor() as cursor:
+                    cursor.arraysize = batch_rows
+                    cursor.prefetchrows = batch_rows
+                    cursor.execute(sql, fetch_lobs=False)  # CLOB은 문자열로 받아 배치와 함께 기록
+                    writer = _WRITERS[fmt](tmp_path, cursor.description)
+                    try:
+                        while True:
+                            rows = cursor.fetchmany(batch_rows)
+                            if not rows:
+                                break
+                            writer.write(rows)
+                            n_rows += len(rows)
+                            if on_progress:
+                                on_progress(n_rows)
+                    finally:
+                        writer.close()
+            finally:
+                conn.call_timeout = call_timeout  # 풀로 돌아가는 연결은 대시보드 기본 한도 유지
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    elapsed = time.perf_counter() - t0
+    size = os.path.getsize(path)
+    logger.info(f"결과 내보내기 완료: {fmt} {n_rows:,}행 {size / 1024 / 1024:.1f} MB {elapsed:.1f}초")
+    return {"path": path, "rows": n_rows, "bytes": size, "elapsed": elapsed}
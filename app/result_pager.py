@@ -0,0 +1,128 @@
+"""
+조회 결과 페이지 탐색
+execute_sql의 1000행 상한을 넘는 결과를 결과 핸들 단위로 페이지씩 조회
+- 첫 조회에서 이미 가져온 행(최대 1000행)은 DB 왕복 없이 잘라서 반환
+- 그 이후 페이지는 OFFSET … FETCH NEXT n ROWS ONLY로 필요할 때만 조회
+- 전체 건수는 요청 시점에 COUNT(*)로 한 번만 계산하여 핸들에 보관
+- 첫 조회 DataFrame은 결과 저장소(result_store)에 핸들 키로 보관 — 저장소에서 밀려났으면 DB 페이지 조회로 대체
+- 맨 바깥 ORDER BY가 없는 SQL은 조회마다 행 순서가 달라질 수 있어 DB 페이지 조회를 하지 않고
+  첫 조회 결과 안에서만 페이지 이동 (ordered=False — 화면에 ORDER BY 추가/내보내기 안내)
+"""
+import logging
+import re
+import uuid
+
+import pandas as pd
+
+from result_store import ResultStore
+from sql_cache import LRUTTLCache
+
+logger = logging.getLogger(__name__)
+
+
+_QUOTED_RE = re.compile(r"'(?:[^']|'')*'|\"[^\"]*\"")
+_ORDER_SCAN_RE = re.compile(r"\(|\)|\bORDER\s+(?:SIBLINGS\s+)?BY\b", re.IGNORECASE)
+
+
+def has_top_level_order_by(sql: str) -> bool:
+    """괄호(서브쿼리, OVER(...)) 밖에 ORDER BY가 있는지 (문자열 리터럴/따옴표 식별자 내부는 무시)"""
+    depth = 0
+    for match in _ORDER_SCAN_RE.finditer(_QUOTED_RE.sub("''", sql)):
+        token = match.group(0)
+        if token == "(":
+            depth += 1
+        elif token == ")":
+            depth = max(0, depth - 1)
+        elif depth == 0:
+            return True
+    return False
+
+
+def page_sql(sql: str) -> str:
+    """페이지 조회 SQL (바인드: :row_offset, :row_count)
+
+    원본 SQL의 ORDER BY가 인라인 뷰 밖에서도 유지되어야 페이지 간 순서가 일정하므로
+    맨 바깥 ORDER BY가 있는 SQL에만 사용 (has_top_level_order_by)
+    """
+    return f"SELECT * FROM ({sql}) OFFSET :row_offset ROWS FETCH NEXT :row_count ROWS ONLY"
+
+
+def count_sql(sql: str) -> str:
+    """전체 건수 조회 SQL"""
+    return f"SELECT COUNT(*) AS cnt FROM ({sql})"
+
+
+class ResultPager:
+    """
+    결과 핸들 저장소
+
+    핸들별 상태: {"handle", "sql", "prefetched_rows"(첫 조회 행 수), "truncated"(상한 도달 여부),
+                  "ordered"(맨 바깥 ORDER BY 여부 — 아니면 첫 조회 결과 밖으로 페이지 이동 불가),
+                  "page"(현재 페이지, 0부터), "total"(전체 건수 또는 None)}
+    첫 조회 DataFrame은 store에 같은 핸들로 보관, 오래 사용하지 않은 핸들은 LRU/TTL로 제거
+    """
+
+    def __init__(self, store: ResultStore, page_size: int = 100, max_handles: int = 200, ttl: float = 1800):
+        self.page_size = page_size
+        self.store = store
+        # 개수 상한으로 밀려난 핸들은 저장소의 DataFrame도 함께 해제
+        self._handles = LRUTTLCache(max_entries=max_handles, ttl=ttl,
+                                    on_evict=lambda handle, state: store.release(handle))
+
+    def open(self, sql: str, prefetched: pd.DataFrame, truncated: bool, session: str = None) -> str:
+        """실행 결과를 등록하고 새 핸들 반환 (session: 결과를 소유한 브라우저 세션 ID)"""
+        handle = uuid.uuid4().hex
+        self.store.put(handle, prefetched, session)
+        self._handles.set(handle, {
+            "handle": handle,
+            "sql": sql,
+            "prefetched_rows": len(prefetched),
+            "truncated": truncated,
+            "ordered": has_top_level_order_by(sql),
+            "page": 0,
+            "total": None if truncated else len(prefetched),
+        })
+        return handle
+
+    def frame(self, handle: str) -> pd.DataFrame | None:
+        """핸들의 첫 조회 DataFrame (만료/미등록/저장소에서 삭제되었으면 None)"""
+        return self.store.get(handle) if self.get(handle) is not None else None
+
+    def release(self, handle: str):
+        """핸들과 저장소의 DataFrame 해제"""
+        if handle:
+            self._handles.pop(handle)
+            self.store.release(handle)
+
+    def get(self, handle: str) -> dict | None:
+        """핸들 상태 조회 (만료/미등록이면 None)"""
+        return self._handles.get(handle) if handle else None
+
+    def last_page(self, state: dict) -> int | None:
+        """이동할 수 있는 마지막 페이지 (전체 건수를 모르고 DB 페이지 조회가 가능하면 None)"""
+        if not state["ordered"]:
+            return max(0, (state["prefetched_rows"] - 1) // self.page_size)
+        if state["total"] is not None:
+            return max(0, (state["total"] - 1) // self.page_size)
+        return None
+
+    def prefetched_page(self, state: dict, page: int) -> pd.DataFrame | None:
+        """첫 조회 결과만으로 채울 수 있는 페이지면 잘라서 반환, 아니면 None (DB 조회 필요)"""
+        start = page * self.page_size
+        end = start + self.page_size
+        if end > state["prefetched_rows"] and state["truncated"] and state["ordered"]:
+            return None
+        df = self.store.get(state["handle"])
+        if df is None:
+            return None
+        return df.iloc[start:end].reset_index(drop=True)
+
+    def has_next(self, state: dict, page: int, more: bool = None) -> bool:
+        """다음 페이지 존재 여부 (DB 조회 페이지는 page_size+1행을 가져와 판단한 more를 전달)"""
+        if not state["ordered"]:
+            return (page + 1) * self.page_size < state["prefetched_rows"]
+        if state["total"] is not None:
+            return (page + 1) * self.page_size < state["total"]
+        if more is not None:
+            return more
+        return (page + 1) * self.page_size < state["prefetched_rows"] or state["truncated"]
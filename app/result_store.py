@@ -0,0 +1,248 @@
+"""
+조회 결과 저장소 (결과 핸들 → DataFrame)
+브라우저 세션마다 gr.State에 DataFrame 사본을 두는 대신 서버 저장소 1곳에 압축된 DataFrame을 보관하고
+화면 이벤트 사이에는 불투명한 핸들 문자열만 주고받음
+- 메모리 계층: LRU + 바이트 상한 (frame_compact로 dtype 압축 후 실제 메모리 사용량 기준)
+- 디스크 계층: 메모리 상한으로 밀려난 결과를 pickle 파일로 내려 두고, 다시 조회되면 메모리로 올림
+  (디스크도 바이트 상한/TTL을 넘으면 파일 삭제 — 그 뒤에는 None을 돌려주고 호출 측이 DB에서 다시 조회)
+- 핸들별 소유 세션을 기록하여 세션별 메모리/디스크 사용량 제공, 세션 종료 시 일괄 해제
+- 색인에 없는 결과 파일(TTL 만료, 이전 실행)은 시작 시와 백그라운드 주기(sweep_interval)로 정리
+"""
+import logging
+import os
+import re
+import threading
+import uuid
+
+import pandas as pd
+
+from frame_compact import compact_frame, frame_nbytes
+from sql_cache import LRUTTLCache
+
+logger = logging.getLogger(__name__)
+
+# 저장소가 만드는 파일 이름 (결과 핸들 = uuid4 hex) — 이 형식이 아닌 파일은 정리 대상에서 제외
+_SPILL_FILE_RE = re.compile(r"([0-9a-f]{32})\.pkl")
+# 기록 중/읽는 중인 임시 파일 ({핸들}.pkl.{임의값}.tmp) — 주기 정리에서는 건드리지 않고 시작 시에만 삭제
+_TEMP_FILE_RE = re.compile(r"[0-9a-f]{32}\.pkl\.[0-9a-f]{8}\.tmp")
+
+
+class ResultStore:
+    """핸들별 결과 DataFrame 저장소 (메모리 → 디스크 2단계, thread-safe)"""
+
+    def __init__(self, memory_bytes: int, disk_dir: str, disk_bytes: int, ttl: float = 1800,
+                 max_handles: int = 10000, sweep_interval: float = 300):
+        self.disk_dir = disk_dir
+        self._memory = LRUTTLCache(max_entries=max_handles, ttl=ttl, max_bytes=memory_bytes,
+                                   sizeof=frame_nbytes, on_evict=self._queue_spill)
+        # handle -> {"path", "bytes"} — 파일 크기 기준 바이트 상한, 밀려나면 파일 삭제
+        self._disk = LRUTTLCache(max_entries=max_handles, ttl=ttl, max_bytes=disk_bytes,
+                                 sizeof=lambda entry: entry["bytes"],
+                                 on_evict=lambda handle, entry: self._remove_file(entry["path"]))
+        self._owners = {}  # handle -> 세션 ID
+        # handle -> DataFrame — 메모리에서 밀려나 디스크에 기록 중인 결과 (등록 전까지 여기서 조회)
+        self._spilling = {}
+        self._writing = set()  # 기록을 맡은 스레드가 있는 핸들
+        # 메모리 계층 저장(밀려난 결과를 _spilling에 넣는 콜백 포함)과 디스크 색인/파일 변경은 이 lock 안에서
+        # → 다른 스레드의 조회/정리가 어느 계층에도 없는 순간을 보지 않음 (파일 기록/읽기는 lock 밖)
+        self._lock = threading.RLock()
+        # 핸들은 프로세스 메모리에만 있으므로 이전 실행이 남긴 결과/임시 파일은 쓸모가 없음
+        # (디렉터리는 설정값이므로 저장소가 만든 형식의 파일만 삭제)
+        self._sweep_disk(temp_files=True)
+        self._sweep_stop = threading.Event()
+        if sweep_interval:
+            threading.Thread(target=self._sweep_loop, args=(sweep_interval,), name="result-store-sweeper",
+                             daemon=True).start()
+
+    # ----- 디스크 계층 -----
+    def _path(self, handle: str) -> str:
+        return os.path.join(self.disk_dir, f"{handle}.pkl")
+
+    def _temp_path(self, handle: str) -> str:
+        return f"{self._path(handle)}.{uuid.uuid4().hex[:8]}.tmp"
+
+    def _queue_spill(self, handle: str, df: pd.DataFrame):
+        """메모리 상한으로 밀려난 결과를 디스크 기록 대기열에 추가 (메모리 계층 저장과 같은 lock 안에서 호출)"""
+        with self._lock:
+            if handle in self._owners:  # 해제된 핸들은 버림
+                self._spilling[handle] = df
+
+    def _store_memory(self, handle: str, df: pd.DataFrame):
+        """메모리 계층에 저장 (상한보다 큰 결과는 바로 디스크 기록 대기열로) — 기록은 호출 측이 _flush_spills()로"""
+        with self._lock:
+            if not self._memory.set(handle, df):
+                self._queue_spill(handle, df)
+
+    def _flush_spills(self):
+        """
+        기록 대기열의 결과를 디스크에 기록 (실패하면 버림)
+
+        임시 이름으로 기록한 뒤 lock 안에서 {핸들}.pkl로 바꾸고 색인에 등록 — 정리(_sweep_disk)가
+        색인에 없는 결과 파일을 보는 순간이 없도록 함. 기록 중에 조회/해제된 결과는 등록하지 않음
+        """
+        while True:
+            with self._lock:
+                handle = next((h for h in self._spilling if h not in self._writing), None)
+                if handle is None:
+                    return
+                df = self._spilling[handle]
+                self._writing.add(handle)
+            tmp = self._temp_path(handle)
+            try:
+                os.makedirs(self.disk_dir, exist_ok=True)
+                df.to_pickle(tmp)
+                nbytes = os.path.getsize(tmp)
+            except Exception as e:
+                logger.warning(f"결과 디스크 기록 실패 ({handle}): {e}")
+                self._remove_file(tmp)
+                nbytes = None
+            with self._lock:
+                self._writing.discard(handle)
+                if self._spilling.get(handle) is not df:  # 기록하는 동안 메모리로 다시 올라갔거나 해제됨
+                    self._remove_file(tmp)
+                    continue
+                del self._spilling[handle]
+                if nbytes is not None:
+                    path = self._path(handle)
+                    os.replace(tmp, path)
+                    self._disk.set(handle, {"path": path, "bytes": nbytes})
+
+    @staticmethod
+    def _remove_file(path: str):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"결과 파일 삭제 실패 ({path}): {e}")
+
+    def _sweep_disk(self, temp_files: bool = False):
+        """
+        색인에 없는 결과 파일({핸들}.pkl) 삭제 — TTL이 지나 빠진 파일, 이전 실행이 남긴 파일
+
+        결과 파일 등록/꺼내기와 같은 lock 안에서 실행 (temp_files=True는 시작 시 임시 파일까지 삭제)
+        """
+        with self._lock:
+            if not os.path.isdir(self.disk_dir):
+                return
+            live = {handle for handle, _, _ in self._disk.snapshot()}
+            for name in os.listdir(self.disk_dir):
+                match = _SPILL_FILE_RE.fullmatch(name)
+                if (match and match.group(1) not in live) or (temp_files and _TEMP_FILE_RE.fullmatch(name)):
+                    self._remove_file(os.path.join(self.disk_dir, name))
+
+    def _sweep_loop(self, interval_sec: float):
+        """주기적 결과 파일 정리 (close() 전까지)"""
+        while not self._sweep_stop.wait(interval_sec):
+            try:
+                self._sweep_disk()
+            except Exception as e:
+                logger.warning(f"결과 파일 정리 실패: {e}")
+
+    def close(self):
+        """주기 정리 스레드 중지"""
+        self._sweep_stop.set()
+
+    # ----- 핸들 -----
+    def put(self, handle: str, df: pd.DataFrame, session: str = None) -> pd.DataFrame:
+        """결과를 압축하여 보관하고 압축된 DataFrame 반환"""
+        compact = compact_frame(df)
+        with self._lock:
+            self._owners[handle] = session or ""
+            self._store_memory(handle, compact)
+        self._flush_spills()
+        return compact
+
+    def get(self, handle: str) -> pd.DataFrame | None:
+        """결과 조회 (디스크에 있으면 메모리로 올림, 만료/해제/상한 초과로 삭제되었으면 None)"""
+        if not handle:
+            return None
+        df = self._memory.get(handle)
+        if df is not None:
+            return df
+        # 색인에서 꺼내면서 파일도 임시 이름으로 옮김 (정리가 읽는 중인 파일을 지우지 않도록 같은 lock 안에서)
+        tmp = self._temp_path(handle)
+        with self._lock:
+            df = self._spilling.pop(handle, None)  # 디스크 기록 중인 결과는 그대로 메모리로
+            if df is None:
+                entry = self._disk.pop(handle)
+                if entry is None:
+                    return None
+                try:
+                    os.replace(entry["path"], tmp)
+                except OSError as e:
+                    logger.warning(f"결과 디스크 읽기 실패 ({handle}): {e}")
+                    return None
+        if df is None:
+            try:
+                df = pd.read_pickle(tmp)
+            except Exception as e:
+                logger.warning(f"결과 디스크 읽기 실패 ({handle}): {e}")
+                return None
+            finally:
+                self._remove_file(tmp)
+        with self._lock:
+            if handle in self._owners:  # 읽는 동안 해제되지 않았으면 다시 보관
+                self._store_memory(handle, df)
+        self._flush_spills()
+        return df
+
+    def release(self, handle: str):
+        """핸들의 결과를 메모리/디스크에서 모두 제거"""
+        if not handle:
+            return
+        with self._lock:
+            self._owners.pop(handle, None)
+            self._spilling.pop(handle, None)
+            self._memory.pop(handle)
+            entry = self._disk.pop(handle)
+            if entry:
+                self._remove_file(entry["path"])
+
+    def release_session(self, session: str) -> int:
+        """세션이 소유한 모든 핸들 해제 (해제한 핸들 수 반환)"""
+        with self._lock:
+            handles = [h for h, s in self._owners.items() if s == session]
+        for handle in handles:
+            self.release(handle)
+        return len(handles)
+
+    # ----- 사용량 -----
+    def _usage(self) -> dict:
+        """handle -> (memory_bytes, disk_bytes) — 만료된 항목은 제외"""
+        usage = {}
+        for handle, df, _ in self._memory.snapshot():
+            usage[handle] = (frame_nbytes(df), 0)
+        for handle, entry, _ in self._disk.snapshot():
+            memory, _ = usage.get(handle, (0, 0))
+            usage[handle] = (memory, entry["bytes"])
+        return usage
+
+    def session_stats(self, session: str) -> dict:
+        """세션별 사용량: {"handles", "memory_bytes", "disk_bytes"}"""
+        with self._lock:
+            handles = {h for h, s in self._owners.items() if s == (session or "")}
+        usage = self._usage()
+        rows = [usage[h] for h in handles if h in usage]
+        return {
+            "handles": len(rows),
+            "memory_bytes": sum(m for m, _ in rows),
+            "disk_bytes": sum(d for _, d in rows),
+        }
+
+    def stats(self) -> dict:
+        """전체 사용량과 세션별 사용량, 메모리/디스크 계층 캐시 카운터"""
+        with self._lock:
+            owners = dict(self._owners)
+        usage = self._usage()
+        sessions = {}
+        for handle, (memory, disk) in usage.items():
+            entry = sessions.setdefault(owners.get(handle, ""), {"handles": 0, "memory_bytes": 0, "disk_bytes": 0})
+            entry["handles"] += 1
+            entry["memory_bytes"] += memory
+            entry["disk_bytes"] += disk
+        return {
+            "memory": self._memory.stats(),
+            "disk": self._disk.stats(),
+            "sessions": sessions,
+        }
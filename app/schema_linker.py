@@ -0,0 +1,219 @@
+"""
+질문 기반 스키마 가지치기 (Schema Linking)
+SYSTEM_PROMPT의 한글 테이블 설명과 JOIN 패턴을 이용해 질문과 관련된 테이블/컬럼만 골라
+프롬프트의 '테이블 스키마 정보' 섹션을 축소 — prefill 토큰 및 TTFT 감소 목적
+"""
+import logging
+import re
+import threading
+
+logger = logging.getLogger(__name__)
+
+try:
+    import tiktoken
+except ImportError:  # 선택 의존성 — 미설치 시 문자 수 기반 근사
+    tiktoken = None
+
+# 이동번호 기준 테이블 — 거의 모든 질의의 조인 키이므로 항상 유지
+ALWAYS_KEEP = ("ftr_move_std",)
+
+# CASE 계열 테이블이 선택되면 MAX(case_id) 서브쿼리를 위해 케이스 마스터도 유지
+CASE_TABLES = ("move_case_item", "move_case_detail", "move_case_org", "move_case_cnst_master", "move_case_penalty_info")
+CASE_MASTER = "move_case_master"
+
+# 모든 테이블에 공통인 키 컬럼 (컬럼 가지치기 시 항상 유지)
+KEY_COLUMN_RE = re.compile(r"^(ftr_move_std_id|.*_id|.*_cd|rev_id)$", re.IGNORECASE)
+
+# 여러 테이블 설명에 공통으로 등장하여 변별력이 없는 단어
+STOP_TERMS = {"마스터", "정보", "상세", "컬럼", "테이블", "목록", "관리", "데이터", "구분", "여부", "복합"}
+
+_CREATE_RE = re.compile(r"CREATE TABLE\s+(?:\"?\w+\"?\.)?\"?(\w+)\"?\s*\(", re.IGNORECASE)
+_DESC_LINE_RE = re.compile(r"^- (\w+): (.+)$", re.MULTILINE)
+_COL_MAP_RE = re.compile(r"([\w~/]+)=([^,()]+)")
+
+
+_encoder = None
+_encoder_resolved = False
+_encoder_lock = threading.Lock()
+
+
+def _get_encoder():
+    """
+    o200k_base 인코더 (프로세스에서 1회만 로드 시도)
+
+    인코딩 파일은 처음 사용할 때 내려받으므로 오프라인 서버에서는 실패 — 실패도 기억하여 매 요청 재시도하지 않음
+    """
+    global _encoder, _encoder_resolved
+    if _encoder_resolved:
+        return _encoder
+    with _encoder_lock:
+        if not _encoder_resolved:
+            if tiktoken is not None:
+                try:
+                    _encoder = tiktoken.get_encoding("o200k_base")
+                except Exception as e:
+                    logger.warning(f"tiktoken 인코딩 로드 실패 — 토큰 수는 근사값 사용: {e}")
+            _encoder_resolved = True
+    return _encoder
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    프롬프트 토큰 수 추정 — tiktoken이 있으면 o200k_base(gpt-oss 계열) 사용,
+    없으면 ASCII 4자당 1토큰 + 한글 등 비ASCII 1자당 1토큰으로 근사
+    """
+    encoder = _get_encoder()
+    if encoder is not None:
+        return len(encoder.encode(text))
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return ascii_chars // 4 + (len(text) - ascii_chars)
+
+
+def split_table_info(table_info: str) -> dict[str, str]:
+    """SQLDatabase.get_table_info() 결과를 테이블별 블록으로 분리 {테이블명(소문자): 블록}"""
+    matches = list(_CREATE_RE.finditer(table_info))
+    blocks = {}
+    for i, m in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(table_info)
+        blocks[m.group(1).lower()] = table_info[m.start():end].strip()
+    return blocks
+
+
+def _expand_columns(name: str) -> list[str]:
+    """'lvl1~5_nm', 'job_type1/2/3' 같은 축약 표기를 실제 컬럼명 목록으로 전개"""
+    m = re.fullmatch(r"(\w*?)(\d)~(\d)(\w*)", name)
+    if m:
+        return [f"{m.group(1)}{n}{m.group(4)}" for n in range(int(m.group(2)), int(m.group(3)) + 1)]
+    if "/" in name:
+        head, *rest = name.split("/")
+        base = re.sub(r"\d+$", "", head)
+        return [head] + [base + r if r.isdigit() else r for r in rest]
+    return [name]
+
+
+def _korean_terms(text: str) -> set[str]:
+    """설명 문자열에서 2글자 이상 한글 단어 추출 (조사 영향을 줄이기 위해 앞 2~4글자 접두어도 포함)"""
+    terms = set()
+    for word in re.findall(r"[가-힣]{2,}", text):
+        terms.add(word)
+        for n in (2, 3, 4):
+            if len(word) > n:
+                terms.add(word[:n])
+    return terms - STOP_TERMS
+
+
+class SchemaLinker:
+    """
+    질문 → 관련 테이블/컬럼 선택기
+
+    - 테이블 점수: 질문에 포함된 테이블 설명 한글 단어, 컬럼 한글명/영문명 매칭당 2점, 테이블명 5점
+    - 선택 규칙: 점수가 min_score 이상인 테이블 + JOIN 패턴으로 연결된 테이블(점수와 무관, 조인 키 유지용)
+      + 항상 유지 테이블
+    - 컬럼 가지치기: max_columns를 넘는 테이블은 키 컬럼, 설명에 등장한 컬럼, 질문에 매칭된 컬럼만 유지
+    """
+
+    def __init__(self, table_info: str, prompt_text: str, min_score: int = 2, max_columns: int = 30):
+        self.min_score = min_score
+        self.max_columns = max_columns
+        self.blocks = split_table_info(table_info)
+        self.table_terms = {}    # table -> set(한글 단어)
+        self.column_terms = {}   # table -> {column: 한글명}
+        for table, desc in _DESC_LINE_RE.findall(prompt_text):
+            table = table.lower()
+            if table not in self.blocks:
+                continue
+            self.table_terms[table] = _korean_terms(desc.split("(")[0])
+            cols = {}
+            for names, label in _COL_MAP_RE.findall(desc):
+                for col in _expand_columns(names):
+                    cols[col.lower()] = label.strip()
+            self.column_terms[table] = cols
+        self.join_edges = self._parse_join_edges(prompt_text)
+
+    def _parse_join_edges(self, prompt_text: str) -> dict[str, set[str]]:
+        """'주요 JOIN 패턴' 섹션에서 함께 조인되는 테이블 쌍을 추출"""
+        edges = {t: set() for t in self.blocks}
+        section = prompt_text.split("## 주요 JOIN 패턴", 1)
+        if len(section) < 2:
+            return edges
+        for line in section[1].split("\n## ", 1)[0].splitlines():
+            tables = [t for t in re.findall(r"\b(\w+)\b", line.lower()) if t in self.blocks]
+            for a in tables:
+                for b in tables:
+                    if a != b:
+                        edges[a].add(b)
+        return edges
+
+    def score_tables(self, question: str) -> dict[str, int]:
+        """테이블별 관련도 점수"""
+        q = question.lower()
+        scores = {}
+        for table in self.blocks:
+            score = 0
+            if table in q:
+                score += 5
+            score += sum(2 for term in self.table_terms.get(table, ()) if term in q)
+            for col, label in self.column_terms.get(table, {}).items():
+                if col in q or any(term in q for term in _korean_terms(label)):
+                    score += 2
+            scores[table] = score
+        return scores
+
+    def select_tables(self, question: str) -> list[str]:
+        """질문에 필요한 테이블 목록 (원래 순서 유지). 매칭이 없으면 전체 테이블"""
+        scores = self.score_tables(question)
+        primary = {t for t, s in scores.items() if s >= self.min_score}
+        if not primary:
+            return list(self.blocks)
+        selected = set(primary)
+        # JOIN 패턴으로 연결된 테이블은 질문에 나오지 않아도 포함 — 빠지면 LLM이 조인 경로를 지어냄
+        # (컬럼이 많은 테이블은 _prune_columns에서 키 컬럼/설명 컬럼 위주로 축소)
+        for table in primary:
+            selected |= self.join_edges.get(table, set())
+        if selected & set(CASE_TABLES) and CASE_MASTER in self.blocks:
+            selected.add(CASE_MASTER)
+        selected |= {t for t in ALWAYS_KEEP if t in self.blocks}
+        return [t for t in self.blocks if t in selected]
+
+    def _prune_columns(self, table: str, block: str, question: str) -> str:
+        """컬럼 수가 많은 테이블의 DDL/샘플 행에서 불필요한 컬럼 제거"""
+        ddl, sep, samples = block.partition("/*")
+        ddl_lines = ddl.splitlines(keepends=True)
+        col_lines = [ln for ln in ddl_lines if re.match(r"^\s+\w+\s+\w", ln) and "CONSTRAINT" not in ln.upper()]
+        if len(col_lines) <= self.max_columns:
+            return block
+        q = question.lower()
+        described = self.column_terms.get(table, {})
+        keep = set()
+        for ln in col_lines:
+            col = ln.split()[0].strip('"').lower()
+            label = described.get(col, "")
+            if (KEY_COLUMN_RE.match(col) or col in described or col in q
+                    or (label and any(term in q for term in _korean_terms(label)))):
+                keep.add(col)
+        pruned_ddl = "".join(
+            ln for ln in ddl_lines
+            if ln not in col_lines or ln.split()[0].strip('"').lower() in keep
+        )
+        if not sep:
+            return pruned_ddl
+        # 샘플 행 블록: "N rows from T table:" 다음 줄이 탭 구분 컬럼 헤더
+        sample_lines = samples.split("\n")
+        for i, ln in enumerate(sample_lines):
+            if "rows from" in ln and i + 1 < len(sample_lines):
+                header = sample_lines[i + 1].split("\t")
+                idx = [j for j, c in enumerate(header) if c.lower() in keep]
+                for k in range(i + 1, len(sample_lines)):
+                    if sample_lines[k].startswith("*/"):
+                        break
+                    cells = sample_lines[k].split("\t")
+                    if len(cells) == len(header):
+                        sample_lines[k] = "\t".join(cells[j] for j in idx)
+                break
+        return pruned_ddl + sep + "\n".join(sample_lines)
+
+    def prune(self, question: str) -> tuple[str, list[str]]:
+        """질문에 맞게 축소한 테이블 정보와 선택된 테이블 목록 반환"""
+        tables = self.select_tables(question)
+        parts = [self._prune_columns(t, self.blocks[t], question) for t in tables]
+        return "\n\n".join(parts), tables
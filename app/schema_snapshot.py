@@ -0,0 +1,94 @@
+"""
+스키마 스냅샷 관리
+TARGET_TABLES의 테이블 정보(DDL + 샘플 행)를 버전이 있는 JSON 파일로 저장/로드하여
+text2sql_pipeline이 import 시점에 Oracle에 접속하지 않고도 SYSTEM_PROMPT를 구성할 수 있게 함
+실행: python schema_snapshot.py  (DB에서 스냅샷 파일을 다시 생성)
+"""
+import datetime
+import hashlib
+import json
+import logging
+import os
+import re
+
+from config import DB_CONFIG, TARGET_TABLES, SCHEMA_SNAPSHOT_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# 스냅샷 파일 형식 버전 (형식이 바뀌면 올려서 이전 파일을 무시하게 함)
+SNAPSHOT_VERSION = 1
+
+_SAMPLE_BLOCK_RE = re.compile(r"/\*.*?\*/", re.DOTALL)
+
+
+def build_table_info(engine) -> str:
+    """DB에서 테이블 정보(DDL + 샘플 3행)를 조회 — 15개 테이블 반영으로 수 초 소요"""
+    from langchain_community.utilities import SQLDatabase
+
+    db = SQLDatabase(
+        engine=engine,
+        schema=DB_CONFIG["user"],
+        include_tables=TARGET_TABLES,
+        sample_rows_in_table_info=3,
+    )
+    return db.get_table_info()
+
+
+def schema_fingerprint(table_info: str) -> str:
+    """샘플 행 블록을 제외한 DDL 부분의 해시 (샘플 데이터 변동은 스키마 변경으로 보지 않음)"""
+    ddl_only = _SAMPLE_BLOCK_RE.sub("", table_info)
+    ddl_only = re.sub(r"\s+", " ", ddl_only).strip()
+    return hashlib.sha256(ddl_only.encode("utf-8")).hexdigest()[:16]
+
+
+def load_snapshot(path: str = None) -> dict | None:
+    """
+    스냅샷 파일 로드
+
+    Returns:
+        {"version", "created_at", "tables", "fingerprint", "table_info"} 또는
+        파일이 없거나 버전/대상 테이블이 다르면 None
+    """
+    path = path or SCHEMA_SNAPSHOT_CONFIG["path"]
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, encoding="utf-8") as f:
+            snapshot = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"스키마 스냅샷 로드 실패 ({path}): {e}")
+        return None
+    if snapshot.get("version") != SNAPSHOT_VERSION:
+        logger.info(f"스키마 스냅샷 버전 불일치 — 무시 ({snapshot.get('version')} != {SNAPSHOT_VERSION})")
+        return None
+    if sorted(snapshot.get("tables", [])) != sorted(TARGET_TABLES):
+        logger.info("스키마 스냅샷의 대상 테이블이 TARGET_TABLES와 다름 — 무시")
+        return None
+    return snapshot
+
+
+def save_snapshot(table_info: str, path: str = None) -> dict:
+    """테이블 정보를 스냅샷 파일로 저장 (임시 파일 후 교체하여 원자적으로 기록)"""
+    path = path or SCHEMA_SNAPSHOT_CONFIG["path"]
+    snapshot = {
+        "version": SNAPSHOT_VERSION,
+        "created_at": datetime.datetime.now().isoformat(timespec="seconds"),
+        "tables": list(TARGET_TABLES),
+        "fingerprint": schema_fingerprint(table_info),
+        "table_info": table_info,
+    }
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(snapshot, f, ensure_ascii=False, indent=1)
+    os.replace(tmp_path, path)
+    return snapshot
+
+
+if __name__ == "__main__":
+    from db_setup import get_engine
+
+    info = build_table_info(get_engine())
+    saved = save_snapshot(info)
+    print(f"스키마 스냅샷 저장: {SCHEMA_SNAPSHOT_CONFIG['path']}")
+    print(f"  테이블 수: {len(saved['tables'])}, 지문: {saved['fingerprint']}, 크기: {len(info):,}자")
@@ -0,0 +1,274 @@
+"""
+SQL 생성 결과 캐시
+정규화된 질문 + 모델 키 + 이동번호 + 프롬프트 해시를 키로 generate_sql 결과를 재사용
+LRU + TTL 방식으로 만료하며, JSON 파일로 저장하여 서비스 재시작 후에도 유지
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+class LRUTTLCache:
+    """
+    thread-safe LRU + TTL 캐시
+
+    - max_entries를 초과하면 가장 오래 사용되지 않은 항목부터 제거
+    - max_bytes가 지정되면 sizeof(value) 합계가 상한을 넘지 않도록 LRU 제거
+    - ttl(초)이 지난 항목은 조회 시 만료 처리 (None이면 만료 없음)
+    - 만료 시각은 벽시계(time.time) 기준이라 디스크 저장 후 복원해도 유지됨
+    - on_evict가 지정되면 상한 초과로 밀려난 항목마다 lock 밖에서 on_evict(key, value) 호출
+    """
+
+    def __init__(self, max_entries: int = 1000, ttl: float = None, max_bytes: int = None, sizeof=None,
+                 on_evict=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof or (lambda value: 0)
+        self._on_evict = on_evict
+        self._data = OrderedDict()  # key -> (value, expires_at, nbytes)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "sets": 0, "evictions": 0, "expirations": 0}
+
+    def get(self, key):
+        """캐시 조회 (없거나 만료되었으면 None)"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self._counters["misses"] += 1
+                return None
+            value, expires_at, _ = entry
+            if expires_at is not None and expires_at <= time.time():
+                self._remove(key)
+                self._counters["expirations"] += 1
+                self._counters["misses"] += 1
+                return None
+            self._data.move_to_end(key)
+            self._counters["hits"] += 1
+            return value
+
+    def set(self, key, value, ttl: float = None):
+        """캐시 저장 (ttl 미지정 시 기본 ttl, 0이면 만료 없음). 바이트 상한보다 큰 값은 저장하지 않음"""
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.time() + ttl if ttl else None
+        nbytes = self._sizeof(value)
+        if self.max_bytes is not None and nbytes > self.max_bytes:
+            return False
+        with self._lock:
+            self._remove(key)
+            self._data[key] = (value, expires_at, nbytes)
+            self._bytes += nbytes
+            self._counters["sets"] += 1
+            evicted = self._evict()
+        self._notify_evicted(evicted)
+        return True
+
+    def pop(self, key):
+        """항목 제거 후 값 반환 (없으면 None)"""
+        with self._lock:
+            entry = self._remove(key)
+        return entry[0] if entry else None
+
+    def clear(self):
+        """전체 항목 삭제"""
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def snapshot(self) -> list[tuple]:
+        """만료되지 않은 항목을 오래된 순서로 반환 [(key, value, expires_at), ...]"""
+        now = time.time()
+        with self._lock:
+            return [(k, v, exp) for k, (v, exp, _) in self._data.items() if exp is None or exp > now]
+
+    def restore(self, items):
+        """snapshot() 형식의 항목을 복원 (만료된 항목은 건너뜀)"""
+        now = time.time()
+        with self._lock:
+            for key, value, expires_at in items:
+                if expires_at is not None and expires_at <= now:
+                    continue
+                self._remove(key)
+                nbytes = self._sizeof(value)
+                self._data[key] = (value, expires_at, nbytes)
+                self._bytes += nbytes
+            evicted = self._evict()
+        self._notify_evicted(evicted)
+
+    def stats(self) -> dict:
+        """적중/실패 카운터와 현재 크기 반환"""
+        with self._lock:
+            stats = dict(self._counters)
+            stats["size"] = len(self._data)
+            stats["bytes"] = self._bytes
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups * 100, 1) if lookups else 0.0
+        return stats
+
+    def _remove(self, key):
+        """항목 제거 (lock 보유 상태에서 호출)"""
+        entry = self._data.pop(key, None)
+        if entry:
+            self._bytes -= entry[2]
+        return entry
+
+    def _evict(self) -> list[tuple]:
+        """개수/바이트 상한 초과분을 LRU 순서로 제거하고 [(key, value)] 반환 (lock 보유 상태에서 호출)"""
+        evicted = []
+        while self._data and (len(self._data) > self.max_entries
+                              or (self.max_bytes is not None and self._bytes > self.max_bytes)):
+            key, (value, _, nbytes) = self._data.popitem(last=False)
+            self._bytes -= nbytes
+            self._counters["evictions"] += 1
+            evicted.append((key, value))
+        return evicted
+
+    def _notify_evicted(self, evicted: list[tuple]):
+        if not self._on_evict:
+            return
+        for key, value in evicted:
+            try:
+                self._on_evict(key, value)
+            except Exception as e:
+                logger.warning(f"캐시 제거 콜백 실패: {e}")
+
+
+# ===== 질문 정규화 =====
+_MOVE_HINT_RE = re.compile(r"\[이동번호\(FTR_MOVE_STD_ID\)=(\d+) 조건 필수\]")
+
+# 단어 끝의 조사 (긴 것부터 매칭)
+_PARTICLES = ("에서", "으로", "에게", "까지", "부터", "처럼", "보다", "하고",
+              "을", "를", "은", "는", "이", "가", "의", "에", "로", "와", "과", "도", "만")
+
+# 질문 끝의 요청 어미 (결과 SQL에 영향 없음)
+_REQUEST_ENDINGS = {"보여줘", "보여주세요", "알려줘", "알려주세요", "구해줘", "구해주세요",
+                    "조회해줘", "조회해주세요", "출력해줘", "뽑아줘", "줘", "주세요",
+                    "뭐야", "뭐지", "무엇인가요", "어디야", "얼마야"}
+
+
+# 의미가 있는 기호는 토큰으로 유지 (비교 연산자, %, 음수 부호, 소수점) — 나머지 문장부호는 구분자로 취급
+_TOKEN_RE = re.compile(r"<>|!=|[<>]=?|=|%|(?<!\w)-?\d+(?:\.\d+)*\w*|\w+")
+
+# NFKC로 바뀌지 않는 비교 기호를 ASCII 연산자로 통일
+_OPERATOR_ALIASES = str.maketrans({"≥": ">=", "≤": "<=", "≠": "!=", "＞": ">", "＜": "<"})
+
+
+def _strip_particle(token: str) -> str:
+    """
+    토큰 끝의 한국어 조사 제거 (한 글자 조사는 어간이 2글자 이상일 때만)
+
+    숫자 바로 뒤의 글자는 조사가 아니라 단위일 수 있으므로 ("1000만") 제거하지 않음
+    """
+    for p in _PARTICLES:
+        if token.endswith(p):
+            stem = token[:-len(p)]
+            min_stem = 1 if len(p) > 1 else 2
+            if len(stem) >= min_stem and re.search(r"[가-힣a-z]$", stem):
+                return stem
+            break
+    return token
+
+
+def split_move_hint(question: str) -> tuple[str, str]:
+    """질문에서 이동번호 조건 접두사를 분리하여 (이동번호, 본문) 반환"""
+    match = _MOVE_HINT_RE.search(question)
+    if not match:
+        return "", question
+    return match.group(1), (question[:match.start()] + question[match.end():]).strip()
+
+
+def normalize_question(question: str) -> str:
+    """
+    캐시 키용 질문 정규화
+
+    - 유니코드 NFKC 정규화 + 소문자화
+    - 문장부호 제거, 공백 축약 (비교 연산자/%/음수 부호/소수점은 결과 SQL이 달라지므로 유지)
+    - 한국어 조사 제거 및 마지막 요청 어미(보여줘/알려줘 등) 제거
+    """
+    text = unicodedata.normalize("NFKC", question).translate(_OPERATOR_ALIASES).lower()
+    tokens = [_strip_particle(t) for t in _TOKEN_RE.findall(text)]
+    tokens = ["!=" if t == "<>" else t for t in tokens]
+    while tokens and tokens[-1] in _REQUEST_ENDINGS:
+        tokens.pop()
+    return " ".join(tokens)
+
+
+def prompt_hash(prompt: str) -> str:
+    """시스템 프롬프트 해시 (프롬프트 변경 시 캐시 자동 무효화용)"""
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:16]
+
+
+class SQLCache:
+    """
+    generate_sql 결과 캐시 (디스크 영속화)
+
+    키: sha256(정규화 질문, 모델 키, 이동번호, 프롬프트 해시)
+    값: {"sql": str, "reasoning": str, "question": 정규화 질문}
+    """
+
+    FILE_VERSION = 1
+
+    def __init__(self, path: str, max_entries: int = 1000, ttl: float = None):
+        self.path = path
+        self._cache = LRUTTLCache(max_entries=max_entries, ttl=ttl)
+        self._save_lock = threading.Lock()
+        self._load()
+
+    @staticmethod
+    def make_key(question: str, model_key: str, prompt_digest: str) -> tuple[str, str]:
+        """(캐시 키, 정규화 질문) 반환"""
+        move_std_id, body = split_move_hint(question)
+        normalized = normalize_question(body)
+        raw = json.dumps([normalized, model_key, move_std_id, prompt_digest], ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest(), normalized
+
+    def get(self, key: str):
+        return self._cache.get(key)
+
+    def set(self, key: str, value: dict):
+        self._cache.set(key, value)
+        self._save()
+
+    def clear(self):
+        self._cache.clear()
+        self._save()
+
+    def stats(self) -> dict:
+        return self._cache.stats()
+
+    def _load(self):
+        """디스크 캐시 파일 로드 (버전 불일치/손상 시 무시)"""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != self.FILE_VERSION:
+                logger.info(f"SQL 캐시 파일 버전 불일치 — 무시: {self.path}")
+                return
+            self._cache.restore((e["key"], e["value"], e["expires_at"]) for e in data.get("entries", []))
+            logger.info(f"SQL 캐시 로드: {self._cache.stats()['size']}건 ({self.path})")
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"SQL 캐시 파일 로드 실패 ({self.path}): {e}")
+
+    def _save(self):
+        """임시 파일에 쓴 뒤 교체하여 원자적으로 저장"""
+        entries = [{"key": k, "value": v, "expires_at": exp} for k, v, exp in self._cache.snapshot()]
+        with self._save_lock:
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                tmp_path = f"{self.path}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump({"version": self.FILE_VERSION, "entries": entries}, f, ensure_ascii=False)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                logger.warning(f"SQL 캐시 파일 저장 실패 ({self.path}): {e}")
@@ -0,0 +1,194 @@
+"""
+DataFrame → HTML 테이블 렌더러 (조회 결과 / 제약조건 분석 패널)
+iterrows()로 셀마다 이스케이프하고 문자열을 += 로 이어 붙이던 방식 대신 열 단위로 처리
+- 셀 값은 iterrows()가 행 Series에서 꺼내는 값과 같은 객체를 열 단위로 꺼냄 (출력 문자열이 기존과 동일)
+- html.escape는 열마다 1회 (셀을 구분자로 이어 붙여 이스케이프한 뒤 다시 분리)
+- 행/표 조립은 리스트 join
+- render_result_grid(): 스타일된 표 대신 열 정보 + 행 데이터(compact JSON)만 보내고, 화면의 가상 스크롤 그리드
+  (app.py custom_js)가 보이는 행만 그리며 정렬/검색도 브라우저에서 처리
+벤치마크 및 기존 구현과의 출력 비교: python bench_render.py
+"""
+import html
+import json
+
+import pandas as pd
+
+_CELL_SEP = "\x00"  # html.escape가 바꾸지 않는 문자 — 값에 포함되어 있으면 셀 단위로 이스케이프
+
+_ROW_OPEN = ('<tr style="background:#ffffff;">', '<tr style="background:#f9fafb;">')
+
+
+def _escape_all(texts: list[str]) -> list[str]:
+    """문자열 목록을 html.escape 1회로 이스케이프"""
+    joined = _CELL_SEP.join(texts)
+    if joined.count(_CELL_SEP) != len(texts) - 1:
+        return [html.escape(t) for t in texts]
+    return html.escape(joined).split(_CELL_SEP)
+
+
+def _row_values(df: pd.DataFrame, boxed: bool = False):
+    """
+    iterrows()의 행 Series가 돌려주는 셀 값을 열 단위로 꺼냄 (열별 값 목록, 결측 여부 2차원 배열)
+
+    iterrows()는 공통 dtype 배열(df.values)의 각 행으로 Series를 만들므로 같은 배열의 열을 사용
+    - object 배열: 원소 그대로
+    - 숫자 배열: 순회(for val in row)는 Python 스칼라, 라벨 조회(row[col])는 numpy 스칼라(boxed=True)
+    - 날짜/시간 배열: 행 Series와 같이 Timestamp/Timedelta
+    """
+    values = df.values
+    isna = pd.isna(values)
+    columns = [values[:, j] for j in range(values.shape[1])]
+    if values.dtype == object:
+        return columns, isna
+    if values.dtype.kind in "mM":
+        return [list(pd.Series(col)) for col in columns], isna
+    return [list(col) if boxed else col.tolist() for col in columns], isna
+
+
+def _cell_texts(values, isna) -> list[str]:
+    """열 값 → 이스케이프된 셀 문자열 (결측은 빈 문자열)"""
+    return _escape_all(['' if na else str(v) for v, na in zip(values, isna)])
+
+
+# ===== 조회 결과 테이블 =====
+_RESULT_TH = ('<th style="background:#f8fafc;padding:10px 14px;text-align:left;font-weight:600;color:#374151;'
+              'border-bottom:2px solid #e5e7eb;white-space:nowrap;position:relative;min-width:60px;">{}'
+              '<div class="col-resize-handle" style="position:absolute;right:0;top:0;bottom:0;width:5px;'
+              'cursor:col-resize;background:transparent;z-index:2;"></div></th>')
+_RESULT_TD = '<td style="padding:8px 14px;border-bottom:1px solid #f1f5f9;color:#111827;white-space:nowrap;">'
+
+
+def render_result_table(df, max_display: int = 500) -> str:
+    """조회 결과 DataFrame을 스타일된 HTML 테이블로 변환 (30행 초과 시 스크롤, max_display행까지 표시)"""
+    if not isinstance(df, pd.DataFrame) or df.empty:
+        return '<div style="padding:20px;text-align:center;color:#9ca3af;">조회 결과가 없습니다.</div>'
+
+    total = len(df)
+    parts = ['<div style="border-radius:12px;overflow:hidden;border:1px solid #e5e7eb;">']
+    if total > 30:
+        parts.append('<div style="max-height:500px;overflow:auto;">')
+    parts.append('<table style="width:100%;border-collapse:collapse;font-size:13px;">')
+
+    parts.append('<thead style="position:sticky;top:0;z-index:1;"><tr>')
+    parts.extend(_RESULT_TH.format(col) for col in df.columns)
+    parts.append('</tr></thead>')
+
+    parts.append('<tbody>')
+    values, isna = _row_values(df.head(max_display))
+    columns = [_cell_texts(col, isna[:, j]) for j, col in enumerate(values)]
+    sep = f'</td>{_RESULT_TD}'
+    parts.extend(
+        f'{_ROW_OPEN[i % 2]}{_RESULT_TD}{sep.join(cells)}</td></tr>'
+        for i, cells in enumerate(zip(*columns))
+    )
+    parts.append('</tbody></table>')
+
+    if total > 30:
+        parts.append('</div>')
+    if total > max_display:
+        parts.append(f'<div style="padding:8px 14px;background:#f8fafc;color:#6b7280;font-size:12px;'
+                     f'border-top:1px solid #e5e7eb;">전체 {total}건 중 {max_display}건 표시</div>')
+    parts.append('</div>')
+    return ''.join(parts)
+
+
+# ===== 조회 결과 가상 스크롤 그리드 =====
+def result_grid_payload(df: pd.DataFrame, max_display: int = 500) -> dict:
+    """
+    그리드 데이터 (셀 문자열은 render_result_table과 같은 str() 표현, 결측은 null)
+
+    Returns: {"columns": [열 이름], "numeric": [숫자 열 여부 — 우측 정렬/숫자 정렬],
+              "rows": [[셀, ...]], "total": 전체 행 수, "shown": 전달한 행 수}
+    """
+    display_df = df.head(max_display)
+    values, isna = _row_values(display_df)
+    columns = [[None if na else str(v) for v, na in zip(col, isna[:, j])] for j, col in enumerate(values)]
+    numeric = [pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+               for dtype in df.dtypes]
+    return {
+        "columns": [str(col) for col in df.columns],
+        "numeric": numeric,
+        "rows": [list(row) for row in zip(*columns)],
+        "total": len(df),
+        "shown": len(display_df),
+    }
+
+
+def render_result_grid(df, max_display: int = 500) -> str:
+    """조회 결과를 가상 스크롤 그리드 자리표시 요소로 변환 (데이터는 data-grid 속성의 JSON)"""
+    if not isinstance(df, pd.DataFrame) or df.empty:
+        return '<div style="padding:20px;text-align:center;color:#9ca3af;">조회 결과가 없습니다.</div>'
+    payload = json.dumps(result_grid_payload(df, max_display), ensure_ascii=False, separators=(",", ":"))
+    return f'<div class="result-grid" data-grid="{html.escape(payload)}"></div>'
+
+
+# ===== 제약조건 분석 패널 테이블 =====
+_CNST_TD_STYLE = "padding:8px 14px;border-bottom:1px solid #f1f5f9;color:#111827;"
+_CNST_NUM_STYLE = _CNST_TD_STYLE + "text-align:right;font-variant-numeric:tabular-nums;"
+_BADGE_Y = ('<span style="background:#10b98120;color:#10b981;padding:2px 8px;border-radius:10px;'
+            'font-size:12px;font-weight:600;">Y</span>')
+_BADGE_N = ('<span style="background:#9ca3af20;color:#9ca3af;padding:2px 8px;border-radius:10px;'
+            'font-size:12px;font-weight:600;">N</span>')
+
+
+def _format_number(val, cell: str) -> str:
+    """정수값은 천 단위 구분, 그 외는 소수 2자리 (변환 불가 값은 이스케이프된 문자열 그대로)"""
+    try:
+        return f'{int(val):,}' if float(val) == int(float(val)) else f'{float(val):,.2f}'
+    except (ValueError, OverflowError):
+        return cell
+
+
+def _cnst_column_cells(values, isna, badge: bool) -> list[str]:
+    """제약조건 패널 열 하나의 <td> 목록 (사용여부 배지, 숫자 우측 정렬/천 단위 구분)"""
+    texts = _cell_texts(values, isna)
+    if badge:
+        return [f'<td style="{_CNST_TD_STYLE}">{_BADGE_Y if t == "Y" else _BADGE_N}</td>' for t in texts]
+    cells = []
+    for val, na, text in zip(values, isna, texts):
+        if isinstance(val, (int, float)) and not na:
+            cells.append(f'<td style="{_CNST_NUM_STYLE}">{_format_number(val, text)}</td>')
+        else:
+            cells.append(f'<td style="{_CNST_TD_STYLE}">{text}</td>')
+    return cells
+
+
+def render_cnst_table(df, title: str = "", badge_col=None, rank_col: bool = False) -> str:
+    """제약조건 분석 전용 HTML 테이블 (제목/건수 헤더, 순위 열, 사용여부 배지, 숫자 서식)"""
+    if not isinstance(df, pd.DataFrame) or df.empty:
+        return '<div style="padding:20px;text-align:center;color:#9ca3af;">데이터 없음</div>'
+    header = ""
+    if title:
+        header = (f'<div style="padding:10px 16px 8px;font-weight:700;font-size:14px;'
+                  f'color:#374151;border-bottom:2px solid #667eea20;">{title}'
+                  f'<span style="margin-left:8px;font-size:12px;font-weight:400;color:#9ca3af;">({len(df)}건)</span></div>')
+    parts = [f'<div style="border-radius:12px;overflow:hidden;border:1px solid #e5e7eb;'
+             f'box-shadow:0 2px 8px rgba(0,0,0,0.04);">{header}']
+    if len(df) > 25:
+        parts.append('<div style="max-height:420px;overflow:auto;">')
+    parts.append('<table style="width:100%;border-collapse:collapse;font-size:13px;">')
+    parts.append('<thead style="position:sticky;top:0;z-index:1;"><tr>')
+    if rank_col:
+        parts.append('<th style="background:#f8fafc;padding:9px 10px;text-align:center;font-weight:600;'
+                     'color:#6b7280;border-bottom:2px solid #e5e7eb;width:36px;">#</th>')
+    parts.extend(f'<th style="background:#f8fafc;padding:9px 14px;text-align:left;font-weight:600;'
+                 f'color:#374151;border-bottom:2px solid #e5e7eb;white-space:nowrap;">{col}</th>'
+                 for col in df.columns)
+    parts.append('</tr></thead><tbody>')
+
+    values, isna = _row_values(df, boxed=True)
+    columns = [_cnst_column_cells(vals, isna[:, j], col == badge_col)
+               for j, (col, vals) in enumerate(zip(df.columns, values))]
+    if rank_col:
+        columns.insert(0, [
+            f'<td style="padding:8px 10px;text-align:center;color:{"#667eea" if i < 3 else "#9ca3af"};'
+            f'font-weight:700;border-bottom:1px solid #f1f5f9;">{i + 1}</td>'
+            for i in range(len(df))
+        ])
+    parts.extend(f'{_ROW_OPEN[i % 2]}{"".join(cells)}</tr>' for i, cells in enumerate(zip(*columns)))
+
+    parts.append('</tbody></table>')
+    if len(df) > 25:
+        parts.append('</div>')
+    parts.append('</div>')
+    return ''.join(parts)
@@ -50,8 +50,9 @@ def test_sql_generation():
     print("=" * 50)
     print("[3/4] SQL 생성 테스트")
     print("=" * 50)
-    from text2sql_pipeline import ask_hr
+    from text2sql_pipeline import ask_hr, ensure_schema
 
+    ensure_schema()  # 스냅샷이 없으면 DB에서 조회
     question = "전체 테이블의 행 수를 각각 알려줘"
     result = ask_hr(question)
 
@@ -73,8 +74,9 @@ def test_multiple_questions():
     print("=" * 50)
     print("[4/4] 다양한 질문 테스트")
     print("=" * 50)
-    from text2sql_pipeline import ask_hr
+    from text2sql_pipeline import ask_hr, ensure_schema
 
+    ensure_schema()
     questions = [
         "직급별 인원 수를 구해줘",
         "평균 나이가 가장 높은 부서는 어디야?",
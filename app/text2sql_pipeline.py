@@ -3,34 +3,62 @@ Step 5: LangChain Text2SQL 파이프라인
 자연어 질문을 Oracle SQL로 변환하고 실행하는 핵심 모듈
 """
 import re
+import time
+import asyncio
+import contextlib
 import logging
 import threading
+import oracledb
 import pandas as pd
-from sqlalchemy import text
 from langchain_openai import ChatOpenAI
-from langchain_community.utilities import SQLDatabase
 from langchain_core.messages import HumanMessage, SystemMessage
 
-from config import DB_CONFIG, TARGET_TABLES, DEFAULT_MODEL_KEY
+from config import (
+    DB_CONFIG, DB_POOL_CONFIG, ASYNC_DB_CONFIG, DEFAULT_MODEL_KEY, SQL_CACHE_CONFIG, RESULT_CACHE_CONFIG, SCHEMA_SNAPSHOT_CONFIG, SCHEMA_PRUNING_CONFIG,
+    PAGING_CONFIG, RESULT_STORE_CONFIG, CASE_RESOLVER_CONFIG, REPLICA_CONFIG,
+)
 from model_registry import get_model_config
 from db_setup import get_engine
+from fetch_engine import fetch_frame, afetch_frame
+from frame_compact import compact_frame
+from sql_cache import SQLCache, prompt_hash, split_move_hint
+from result_cache import ResultCache, extract_move_ids
+from result_pager import ResultPager, page_sql, count_sql
+from result_store import ResultStore
+from result_export import export_query
+from schema_snapshot import build_table_info, load_snapshot, save_snapshot, schema_fingerprint
+from schema_linker import SchemaLinker, estimate_tokens
+from llm_metrics import LLMMetrics, RequestTimer, usage_from_message
+from case_resolver import rewrite_latest_case_sql, subscribe_case_changes
+from change_probe import subscribe_changes
+import replica
 
 logger = logging.getLogger(__name__)
 
 
 # ===== 1. 데이터베이스 연결 =====
+# (create_engine은 실제 접속을 하지 않으므로 import 시점에 Oracle 왕복 없음)
 engine = get_engine()
 
-# SQLDatabase 인스턴스 (LangChain이 스키마 정보를 자동으로 가져옴)
-db = SQLDatabase(
-    engine=engine,
-    schema=DB_CONFIG["user"],
-    include_tables=TARGET_TABLES,
-    sample_rows_in_table_info=3,
-)
 
-# 테이블 정보 캐싱
-_table_info = db.get_table_info()
+def _load_initial_table_info() -> tuple[str, str]:
+    """
+    스냅샷 파일에서 테이블 정보 로드 (import 시 DB 접속 없음)
+
+    스냅샷이 없으면 빈 스키마로 시작 — 첫 스냅샷은 백그라운드 갱신(start_schema_refresher)이나
+    배포 단계(python schema_snapshot.py)에서 생성하고, 그 전까지 SQL 생성은 오류 반환
+    """
+    snapshot = load_snapshot()
+    if snapshot:
+        logger.info(f"스키마 스냅샷 로드: {snapshot['created_at']} (지문 {snapshot['fingerprint']})")
+        return snapshot["table_info"], snapshot["fingerprint"]
+    logger.warning(f"스키마 스냅샷 없음 ({SCHEMA_SNAPSHOT_CONFIG['path']}) — 백그라운드 갱신에서 생성될 때까지 "
+                   f"SQL 생성 불가 (배포 시 python schema_snapshot.py로 미리 생성)")
+    return "", ""
+
+
+# 테이블 정보 (스냅샷에서 로드, 백그라운드 갱신 시 교체 — 빈 문자열이면 아직 스키마 없음)
+_table_info, _schema_fingerprint = _load_initial_table_info()
 
 # ===== 2. LLM 인스턴스 캐시 (다중 모델 지원) =====
 _llm_cache = {}
@@ -80,7 +108,14 @@ def get_report_llm(model_key=None):
         return new_llm
 
 # ===== 3. 시스템 프롬프트 =====
-SYSTEM_PROMPT = f"""당신은 Oracle SQL 전문가이며, HDTP(정기인사 전환배치 최적화) 시스템의 데이터베이스를 깊이 이해하고 있습니다.
+# vLLM 접두사 캐시(prefix caching)는 요청 간 바이트 단위로 같은 앞부분만 재사용하므로
+# 규칙/테이블 설명/JOIN 패턴/few-shot은 고정 접두사(시스템 메시지)로 두고,
+# 질문마다 달라지는 가지치기 스키마·이동번호 조건·질문은 사용자 메시지(가변 접미사)로 보냄
+
+# 정적 접두사 버전 — 규칙/설명/few-shot을 수정하면 올릴 것 (SQL 캐시 키에 포함)
+PROMPT_VERSION = "2"
+
+_STATIC_PROMPT = """당신은 Oracle SQL 전문가이며, HDTP(정기인사 전환배치 최적화) 시스템의 데이터베이스를 깊이 이해하고 있습니다.
 사용자의 질문을 Oracle SQL SELECT 문으로 변환하세요.
 
 ## 시스템 개요
@@ -90,9 +125,6 @@ HDTP는 현대백화점 직원 정기인사이동 배치를 최적화하는 시
 - FTR_MOVE_STD_ID: 이동번호 — 거의 모든 MOVE_* 테이블의 공통 조인 키 (물리적 FK 없음)
 - REV_ID='999': 최종 확정 리비전 (VARCHAR2 타입). CASE 계열 테이블은 여러 리비전이 존재하므로 REV_ID = '999' 조건 없이 조회하면 중복 행이 발생합니다. 반드시 문자열 '999'로 비교하세요.
 
-## 테이블 스키마 정보
-{_table_info}
-
 ## 테이블 설명 (15개 핵심 테이블)
 ### 이동기준
 - ftr_move_std: 이동기준 마스터 (ftr_move_std_id=이동번호 PK, std_nm=이동기준명, std_ym=기준년월, wk_std_ymd=기준일자, close_yn=마감여부)
@@ -213,6 +245,219 @@ FETCH FIRST 10 ROWS ONLY
 """
 
 
+def _build_system_prompt(table_info: str) -> str:
+    """정적 접두사 + 전체 테이블 스키마 (스키마 가지치기를 쓰지 않을 때의 시스템 프롬프트)"""
+    return f"{_STATIC_PROMPT}## 테이블 스키마 정보\n{table_info}\n"
+
+
+def _build_user_message(question: str, move_std_id: str = "", schema_info: str = None) -> str:
+    """가변 접미사: (질문 관련 스키마) + 질문 + 이동번호 조건"""
+    parts = []
+    if schema_info is not None:
+        parts.append(f"## 테이블 스키마 정보 (질문 관련 테이블)\n{schema_info}\n")
+    hint = f" [이동번호(FTR_MOVE_STD_ID)={move_std_id} 조건 필수]" if move_std_id else ""
+    parts.append(f"질문: {question}{hint}")
+    return "\n".join(parts)
+
+
+def _make_prompt_state(table_info: str) -> dict:
+    """
+    테이블 정보로 프롬프트 상태 생성
+
+    Returns:
+        {"prefix": 시스템 메시지(고정 접두사), "digest": SQL 캐시 키용 해시, "linker": 스키마 링커 또는 None,
+         "full_prompt": 전체 스키마 포함 프롬프트, "full_tokens", "prefix_tokens", "prefix_digest",
+         "ready": 스키마가 있는지 (없으면 SQL 생성 안 함)}
+    """
+    full_prompt = _build_system_prompt(table_info)
+    state = {
+        "ready": bool(table_info),
+        "prefix": full_prompt,
+        "digest": prompt_hash(f"{PROMPT_VERSION}\n{full_prompt}"),
+        "linker": None,
+        "full_prompt": full_prompt,
+        "full_tokens": estimate_tokens(full_prompt),
+    }
+    if SCHEMA_PRUNING_CONFIG["enabled"]:
+        # 가지치기 스키마는 질문마다 다르므로 접두사에서 빼고 사용자 메시지로 보냄
+        state["linker"] = SchemaLinker(
+            table_info, _STATIC_PROMPT,
+            min_score=SCHEMA_PRUNING_CONFIG["min_score"],
+            max_columns=SCHEMA_PRUNING_CONFIG["max_columns"],
+        )
+        state["prefix"] = _STATIC_PROMPT
+        state["digest"] += ":pruned"
+    state["prefix_tokens"] = estimate_tokens(state["prefix"])
+    state["prefix_digest"] = prompt_hash(state["prefix"])
+    return state
+
+
+# 프롬프트 상태는 한 dict로 교체하여 갱신 중에도 일관된 조합을 읽도록 함
+_prompt_state = _make_prompt_state(_table_info)
+SYSTEM_PROMPT = _prompt_state["full_prompt"]
+_schema_lock = threading.Lock()
+
+
+def _build_messages(question: str) -> tuple[list, dict]:
+    """
+    질문에 대한 LLM 메시지 구성 — [고정 접두사 SystemMessage, 가변 접미사 HumanMessage]
+
+    Returns:
+        (messages, {"full": 전체 스키마 사용 시 토큰 수, "pruned": 실제 전송 토큰 수,
+                    "prefix": 고정 접두사 토큰 수, "prefix_digest": 접두사 해시, "tables": 선택 테이블 목록})
+    """
+    state = _prompt_state
+    move_std_id, body = split_move_hint(question)
+    question_tokens = estimate_tokens(_build_user_message(body, move_std_id))
+    token_info = {
+        "full": state["full_tokens"] + question_tokens,
+        "pruned": state["full_tokens"] + question_tokens,
+        "prefix": state["prefix_tokens"],
+        "prefix_digest": state["prefix_digest"],
+        "tables": [],
+    }
+    linker = state["linker"]
+    if linker is None:
+        user_content = _build_user_message(body, move_std_id)
+    else:
+        schema_info, tables = linker.prune(body)
+        user_content = _build_user_message(body, move_std_id, schema_info)
+        token_info["pruned"] = state["prefix_tokens"] + estimate_tokens(user_content)
+        token_info["tables"] = tables
+        logger.info(f"스키마 가지치기: {len(tables)}/{len(linker.blocks)}개 테이블, "
+                    f"프롬프트 토큰 {token_info['full']:,} → {token_info['pruned']:,} "
+                    f"(고정 접두사 {state['prefix_tokens']:,})")
+    messages = [SystemMessage(content=state["prefix"]), HumanMessage(content=user_content)]
+    return messages, token_info
+
+
+def refresh_schema(force: bool = False) -> bool:
+    """
+    DB에서 테이블 정보를 다시 조회하여 DDL이 바뀌었으면 SYSTEM_PROMPT를 원자적으로 교체
+
+    Args:
+        force: True이면 DDL 변경 여부와 관계없이 교체 (샘플 행 갱신 포함)
+
+    Returns:
+        SYSTEM_PROMPT가 교체되었으면 True
+    """
+    global _table_info, _schema_fingerprint, SYSTEM_PROMPT, _prompt_state
+    table_info = build_table_info(engine)
+    fingerprint = schema_fingerprint(table_info)
+    with _schema_lock:
+        if not force and fingerprint == _schema_fingerprint:
+            return False
+        new_state = _make_prompt_state(table_info)
+        _table_info, _schema_fingerprint = table_info, fingerprint
+        SYSTEM_PROMPT = new_state["full_prompt"]
+        _prompt_state = new_state
+    save_snapshot(table_info)
+    logger.info(f"스키마 변경 감지 — SYSTEM_PROMPT 갱신 (지문 {fingerprint})")
+    return True
+
+
+def schema_ready() -> bool:
+    """테이블 정보가 로드되었는지 (스냅샷 또는 DB 조회 성공)"""
+    return _prompt_state["ready"]
+
+
+def ensure_schema():
+    """스키마가 아직 없으면 DB에서 바로 조회 (백그라운드 갱신 스레드를 띄우지 않는 CLI/점검 스크립트용, 실패 시 예외)"""
+    if not schema_ready():
+        refresh_schema()
+
+
+_schema_refresh_stop = threading.Event()
+_schema_refresh_thread = None
+
+
+def _schema_refresh_loop(interval_sec: float):
+    """백그라운드 스키마 갱신 루프 (시작 직후 1회 확인 후 주기적으로 반복)"""
+    while True:
+        try:
+            refresh_schema()
+        except Exception as e:
+            logger.warning(f"스키마 백그라운드 갱신 실패: {e}")
+        _schema_refresh_stop.wait(interval_sec)
+        if _schema_refresh_stop.is_set():
+            return
+
+
+def start_schema_refresher(interval_sec: float = None):
+    """스키마 백그라운드 갱신 스레드 시작 (중복 호출 시 무시)"""
+    global _schema_refresh_thread
+    if _schema_refresh_thread and _schema_refresh_thread.is_alive():
+        return
+    interval_sec = interval_sec or SCHEMA_SNAPSHOT_CONFIG["refresh_sec"]
+    _schema_refresh_stop.clear()
+    _schema_refresh_thread = threading.Thread(
+        target=_schema_refresh_loop, args=(interval_sec,), name="schema-refresher", daemon=True,
+    )
+    _schema_refresh_thread.start()
+
+
+# ===== 4. SQL 생성 결과 캐시 =====
+# 키에 프롬프트 해시가 포함되므로 SYSTEM_PROMPT가 바뀌면 기존 항목은 자연히 적중하지 않음
+_sql_cache = SQLCache(
+    path=SQL_CACHE_CONFIG["path"],
+    max_entries=SQL_CACHE_CONFIG["max_entries"],
+    ttl=SQL_CACHE_CONFIG["ttl_sec"],
+) if SQL_CACHE_CONFIG["enabled"] else None
+
+
+# ===== 5. SQL 실행 결과 캐시 =====
+# execute_sql이 한 번에 가져오는 최대 행 수 (이후는 결과 페이지 탐색으로 조회)
+MAX_RESULT_ROWS = 1000
+
+_result_cache = ResultCache(
+    max_entries=RESULT_CACHE_CONFIG["max_entries"],
+    max_bytes=RESULT_CACHE_CONFIG["max_bytes"],
+    open_ttl=RESULT_CACHE_CONFIG["open_ttl_sec"],
+) if RESULT_CACHE_CONFIG["enabled"] else None
+
+
+def get_sql_cache_stats() -> dict:
+    """SQL 생성 캐시의 적중/실패 카운터 반환 (비활성화 시 빈 dict)"""
+    return _sql_cache.stats() if _sql_cache else {}
+
+
+def get_result_cache_stats() -> dict:
+    """SQL 실행 결과 캐시의 적중/실패 카운터와 사용 바이트 반환 (비활성화 시 빈 dict)"""
+    return _result_cache.stats() if _result_cache else {}
+
+
+def invalidate_move_results(move_std_id) -> int:
+    """이동번호 데이터가 변경되었을 때 해당 이동번호의 실행 결과 캐시 제거"""
+    return _result_cache.invalidate_move(move_std_id) if _result_cache else 0
+
+
+# 최적화 엔진이 새 케이스를 만들면 해당 이동번호의 "최종 케이스" 기준 결과가 달라지므로 캐시 제거
+subscribe_case_changes(lambda move_std_id, old, new: invalidate_move_results(move_std_id))
+# 같은 케이스 안에서 결과/감점/제약 행이 다시 기록된 경우 (change_probe가 감지)
+subscribe_changes(lambda move_std_id, changed: invalidate_move_results(move_std_id))
+
+
+def _replica_frame(safe_sql: str) -> pd.DataFrame | None:
+    """
+    SQL이 참조하는 이동번호가 모두 로컬 복제본에 있으면 DuckDB에서 조회 (REPLICA_EXECUTE_SQL)
+
+    이동번호 리터럴이 없거나 변환/실행에 실패하면 None — 호출 측에서 Oracle로 조회
+    """
+    if not REPLICA_CONFIG["execute_sql"]:
+        return None
+    move_ids = extract_move_ids(safe_sql)
+    if not move_ids or not all(replica.has_move(m) for m in move_ids):
+        return None
+    try:
+        df = replica.query_frame(safe_sql)
+    except Exception as e:
+        logger.info(f"복제본 조회 불가 — Oracle에서 조회: {e}")
+        return None
+    df = compact_frame(df)  # DuckDB 결과에는 NUMBER 정밀도 정보가 없으므로 값 기준 압축만
+    logger.info(f"복제본 조회: {len(df)}건 (이동번호 {', '.join(sorted(move_ids))})")
+    return df
+
+
 def _clean_sql(raw_sql: str) -> str:
     """LLM이 생성한 SQL에서 불필요한 텍스트를 정리"""
     sql = raw_sql.strip()
@@ -280,15 +525,9 @@ REPORT_PROMPT = """당신은 데이터 분석 보고서 작성 전문가입니
 - 마크다운 형식 사용"""
 
 
-def generate_report(question: str, sql: str, df: pd.DataFrame, reasoning: str = "", model_key: str = None) -> str:
-    """SQL 실행 결과를 분석하여 자연어 보고서를 생성"""
-    if df.empty:
-        return ""
-
-    # 1. SQL에서 테이블명 추출
-    tables_used = list(dict.fromkeys(re.findall(r'HRAI_CON\.(\w+)', sql, re.IGNORECASE)))
-
-    # 2. 결과 요약 정보 (LLM 컨텍스트 초과 방지를 위해 크기 제한)
+def _build_report_messages(question: str, sql: str, df: pd.DataFrame) -> list:
+    """보고서 생성용 LLM 메시지 구성 (프롬프트 인젝션 방지: 입력 길이 제한 + 구분자)"""
+    # 결과 요약 정보 (LLM 컨텍스트 초과 방지를 위해 크기 제한)
     result_preview = df.head(20).to_string(index=False)
     if len(result_preview) > 3000:
         result_preview = df.head(5).to_string(index=False)
@@ -296,7 +535,6 @@ def generate_report(question: str, sql: str, df: pd.DataFrame, reasoning: str =
         result_preview = result_preview[:3000]
     columns_str = ", ".join(df.columns.tolist())
 
-    # 3. 2차 LLM 호출로 결과 요약 생성 (프롬프트 인젝션 방지: 입력 길이 제한 + 구분자)
     safe_question = question[:500]
     user_prompt = f"""## 원래 질문
 <user_input>{safe_question}</user_input>
@@ -309,19 +547,18 @@ def generate_report(question: str, sql: str, df: pd.DataFrame, reasoning: str =
 
 위 내용을 바탕으로 결과 보고서를 작성하세요."""
 
-    try:
-        messages = [
-            SystemMessage(content=REPORT_PROMPT),
-            HumanMessage(content=user_prompt),
-        ]
-        active_report_llm = get_report_llm(model_key)
-        resp = active_report_llm.invoke(messages)
-        llm_summary = resp.content.strip()
-    except Exception as e:
-        logger.error(f"Report generation failed: {e}")
-        llm_summary = "(보고서 생성 중 오류가 발생했습니다)"
+    return [
+        SystemMessage(content=REPORT_PROMPT),
+        HumanMessage(content=user_prompt),
+    ]
+
+
+def _assemble_report(sql: str, df: pd.DataFrame, reasoning: str, llm_summary: str) -> str:
+    """SQL 분석 정보 + LLM 요약으로 최종 보고서 마크다운 조립"""
+    # SQL에서 테이블명 추출
+    tables_used = list(dict.fromkeys(re.findall(r'HRAI_CON\.(\w+)', sql, re.IGNORECASE)))
+    columns_str = ", ".join(df.columns.tolist())
 
-    # 4. 최종 보고서 조립
     report_parts = []
     report_parts.append("## SQL 분석\n")
     report_parts.append(f"- **사용된 테이블**: {', '.join(tables_used) if tables_used else '(파싱 불가)'}")
@@ -338,43 +575,98 @@ def generate_report(question: str, sql: str, df: pd.DataFrame, reasoning: str =
     return "\n".join(report_parts)
 
 
-def generate_sql(question: str, model_key: str = None) -> dict:
-    """자연어 질문을 SQL로만 변환 (실행하지 않음)
+def generate_report(question: str, sql: str, df: pd.DataFrame, reasoning: str = "", model_key: str = None) -> str:
+    """SQL 실행 결과를 분석하여 자연어 보고서를 생성"""
+    if df.empty:
+        return ""
 
-    Args:
-        question: 자연어 질문 (예: "직급별 인원 수를 구해줘")
-        model_key: 사용할 모델 키 (None이면 DEFAULT_MODEL_KEY 사용)
+    # 2차 LLM 호출로 결과 요약 생성
+    try:
+        messages = _build_report_messages(question, sql, df)
+        active_report_llm = get_report_llm(model_key)
+        resp = active_report_llm.invoke(messages)
+        llm_summary = resp.content.strip()
+    except Exception as e:
+        logger.error(f"Report generation failed: {e}")
+        llm_summary = "(보고서 생성 중 오류가 발생했습니다)"
 
-    Returns:
-        dict with keys: sql (str), reasoning (str), error (str or None)
-    """
-    generated_sql = ""
+    return _assemble_report(sql, df, reasoning, llm_summary)
+
+
+# SQL 생성 호출 지표 (TTFT, 프롬프트/캐시 적중 토큰)
+_llm_metrics = LLMMetrics()
+
+# 스트리밍 응답에 usage 포함 — 조기 종료해도 프롬프트 토큰 수를 받도록 청크마다 누적 usage 요청
+# (vLLM 전용 옵션, 캐시 적중 토큰 수는 마지막 usage 청크에만 포함됨 → 조기 종료한 요청은 None으로 기록)
+_STREAM_USAGE_BODY = {"stream_options": {"include_usage": True, "continuous_usage_stats": True}}
+
+
+def _record_llm_metrics(model_key: str, token_info: dict, timer: RequestTimer, response=None) -> dict:
+    """요청 1건의 TTFT/소요시간/usage 기록 (비스트리밍 호출은 TTFT 없이 전체 소요시간만)"""
+    usage = usage_from_message(response) if response is not None else timer.usage
+    if response is None and usage and not timer.complete:
+        # 중간 usage 청크의 캐시 토큰 0은 "적중 없음"이 아니라 "아직 모름" — 적중률 계산에서 제외
+        usage = {**usage, "cached": None}
+    return _llm_metrics.record(
+        model_key or DEFAULT_MODEL_KEY, token_info["prefix_digest"],
+        timer.ttft if response is None else None, timer.elapsed, usage,
+    )
+
+
+def get_llm_metrics(model_key: str = None) -> dict:
+    """최근 SQL 생성 호출의 TTFT p50/p95, 평균 프롬프트/캐시 토큰, 접두사 캐시 적중률(%)"""
+    return _llm_metrics.stats(model_key)
+
+
+def _lookup_sql_cache(question: str, model_key: str, use_cache: bool) -> tuple:
+    """SQL 캐시 조회 — (cache_key, 정규화 질문, 적중 결과 dict 또는 None) 반환"""
+    if not (_sql_cache and use_cache):
+        return None, "", None
+    cache_key, normalized = _sql_cache.make_key(question, model_key or DEFAULT_MODEL_KEY, _prompt_state["digest"])
+    cached = _sql_cache.get(cache_key)
+    if not cached:
+        return cache_key, normalized, None
+    logger.info(f"SQL 캐시 적중: '{normalized}' ({_sql_cache.stats()})")
+    return cache_key, normalized, {
+        "sql": cached["sql"],
+        "reasoning": cached.get("reasoning", ""),
+        "error": None,
+        "cached": True,
+    }
+
+
+def _response_reasoning(response) -> str:
+    """reasoning model 응답에서 사고과정 추출 (없으면 빈 문자열)"""
     reasoning = ""
+    if hasattr(response, "additional_kwargs"):
+        reasoning = response.additional_kwargs.get("reasoning_content", "")
+    if not reasoning and hasattr(response, "response_metadata"):
+        reasoning = response.response_metadata.get("reasoning_content", "")
+    return reasoning
 
-    # LLM 호출 (SQL 생성)
-    try:
-        active_llm = get_llm(model_key)
-        messages = [
-            SystemMessage(content=SYSTEM_PROMPT),
-            HumanMessage(content=question),
-        ]
-        response = active_llm.invoke(messages)
 
-        # reasoning model의 사고과정 캡처
-        if hasattr(response, "additional_kwargs"):
-            reasoning = response.additional_kwargs.get("reasoning_content", "")
-        if not reasoning and hasattr(response, "response_metadata"):
-            reasoning = response.response_metadata.get("reasoning_content", "")
+def _schema_unavailable() -> dict:
+    """스키마 없이 LLM을 호출하지 않도록 돌려주는 결과 dict (스키마 로드 전)"""
+    return {
+        "sql": "",
+        "reasoning": "",
+        "error": "DB 스키마 정보를 아직 불러오지 못했습니다. 잠시 후 다시 시도해 주세요.",
+    }
 
-        raw_sql = response.content
-        generated_sql = _clean_sql(raw_sql)
-    except Exception as e:
-        logger.error(f"LLM invocation failed: {e}")
-        return {
-            "sql": "",
-            "reasoning": reasoning,
-            "error": "LLM 서버 연결에 실패했습니다. 잠시 후 다시 시도해 주세요.",
-        }
+
+def _llm_failure(sql: str = "", reasoning: str = "") -> dict:
+    """LLM 호출 실패 결과 dict"""
+    return {
+        "sql": sql,
+        "reasoning": reasoning,
+        "error": "LLM 서버 연결에 실패했습니다. 잠시 후 다시 시도해 주세요.",
+    }
+
+
+def _finalize_sql(raw_sql: str, reasoning: str, cache_key: str, normalized: str, token_info: dict,
+                  llm_stats: dict = None) -> dict:
+    """LLM 응답을 정리/검증하여 generate_sql 결과 dict로 변환 (성공 시 캐시 저장)"""
+    generated_sql = _clean_sql(raw_sql)
 
     # 빈 응답 체크
     if not generated_sql:
@@ -392,47 +684,249 @@ def generate_sql(question: str, model_key: str = None) -> dict:
             "error": "안전하지 않은 SQL이 감지되었습니다. SELECT 문만 허용됩니다.",
         }
 
+    if cache_key:
+        _sql_cache.set(cache_key, {"sql": generated_sql, "reasoning": reasoning, "question": normalized})
+
     return {
         "sql": generated_sql,
         "reasoning": reasoning,
         "error": None,
+        "cached": False,
+        "prompt_tokens": token_info,
+        "llm": llm_stats,
+    }
+
+
+def generate_sql(question: str, model_key: str = None, use_cache: bool = True) -> dict:
+    """자연어 질문을 SQL로만 변환 (실행하지 않음)
+
+    Args:
+        question: 자연어 질문 (예: "직급별 인원 수를 구해줘")
+        model_key: 사용할 모델 키 (None이면 DEFAULT_MODEL_KEY 사용)
+        use_cache: False이면 캐시를 건너뛰고 항상 LLM 호출
+
+    Returns:
+        dict with keys: sql (str), reasoning (str), error (str or None), cached (bool),
+        prompt_tokens (dict: full/pruned/prefix/tables, LLM 호출 시에만),
+        llm (dict: ttft/latency/prompt_tokens/cached_tokens, LLM 호출 시에만)
+    """
+    reasoning = ""
+    if not schema_ready():
+        return _schema_unavailable()
+
+    # 캐시 조회 (정규화 질문 + 모델 + 이동번호 + 프롬프트 해시)
+    cache_key, normalized, cached = _lookup_sql_cache(question, model_key, use_cache)
+    if cached:
+        return cached
+
+    # 고정 접두사 + 질문 관련 스키마/질문(가변 접미사)으로 메시지 구성
+    messages, token_info = _build_messages(question)
+
+    # LLM 호출 (SQL 생성)
+    try:
+        active_llm = get_llm(model_key)
+        timer = RequestTimer()
+        response = active_llm.invoke(messages)
+        llm_stats = _record_llm_metrics(model_key, token_info, timer, response)
+        reasoning = _response_reasoning(response)  # reasoning model의 사고과정 캡처
+        raw_sql = response.content
+    except Exception as e:
+        logger.error(f"LLM invocation failed: {e}")
+        return _llm_failure(reasoning=reasoning)
+
+    return _finalize_sql(raw_sql, reasoning, cache_key, normalized, token_info, llm_stats)
+
+
+# SELECT/WITH 문을 담은 코드 펜스가 닫히면 SQL 생성이 끝난 것으로 보고 스트림을 조기 종료
+_CLOSED_SQL_FENCE_RE = re.compile(r"```(?:sql)?\s*(?:WITH|SELECT)\b.*?```", re.DOTALL | re.IGNORECASE)
+
+
+def _partial_sql(content: str) -> str:
+    """스트리밍 중인 응답에서 화면 표시용 SQL 부분만 추출 (여는 펜스 이후 텍스트)"""
+    fence = content.find("```")
+    if fence < 0:
+        return content.strip()
+    body = content[fence + 3:]
+    if body.lower().startswith("sql"):
+        body = body[3:]
+    return body.split("```", 1)[0].strip()
+
+
+class _SqlStream:
+    """
+    스트리밍 응답 누적 (동기/비동기 스트림 공용)
+
+    feed()는 화면 갱신 간격(min_interval)이 지났을 때만 중간 결과를 돌려주고,
+    SELECT 문의 코드 펜스가 닫히면 closed를 세워 호출 측이 스트림을 조기 종료하게 함
+    """
+
+    def __init__(self, min_interval: float):
+        self.min_interval = min_interval
+        self.content = ""
+        self.reasoning = ""
+        self.closed = False
+        self._last_yield = 0.0
+
+    def feed(self, chunk) -> dict | None:
+        """청크를 누적하고 중간 결과 dict 반환 (표시할 때가 아니거나 SQL이 완성되었으면 None)"""
+        if isinstance(chunk.content, str):
+            self.content += chunk.content
+        self.reasoning += chunk.additional_kwargs.get("reasoning_content", "") or ""
+        if _CLOSED_SQL_FENCE_RE.search(self.content):
+            self.closed = True
+            return None
+        now = time.monotonic()
+        if now - self._last_yield < self.min_interval:
+            return None
+        self._last_yield = now
+        return {"sql": _partial_sql(self.content), "reasoning": self.reasoning, "done": False}
+
+    def failure(self) -> dict:
+        """스트리밍 실패 결과 (그때까지 받은 부분 SQL 포함)"""
+        return {**_llm_failure(_partial_sql(self.content), self.reasoning), "done": True}
+
+
+def generate_sql_stream(question: str, model_key: str = None, use_cache: bool = True, min_interval: float = 0.1):
+    """generate_sql의 스트리밍 버전 — 토큰이 도착할 때마다 부분 SQL을 yield
+
+    완성된 SELECT 문의 코드 펜스가 닫히면 남은 디코딩(설명 문장 등)을 기다리지 않고
+    스트림을 닫아 vLLM 요청을 조기 종료함
+
+    Args:
+        question: 자연어 질문
+        model_key: 사용할 모델 키 (None이면 DEFAULT_MODEL_KEY 사용)
+        use_cache: False이면 캐시를 건너뛰고 항상 LLM 호출
+        min_interval: 중간 결과 yield 최소 간격 (초, UI 갱신 빈도 제한)
+
+    Yields:
+        중간: {"sql": 부분 SQL, "reasoning": 누적 추론, "done": False}
+        최종: generate_sql과 동일한 dict + "done": True
+    """
+    if not schema_ready():
+        yield {**_schema_unavailable(), "done": True}
+        return
+    cache_key, normalized, cached = _lookup_sql_cache(question, model_key, use_cache)
+    if cached:
+        yield {**cached, "done": True}
+        return
+
+    messages, token_info = _build_messages(question)
+    acc = _SqlStream(min_interval)
+    try:
+        active_llm = get_llm(model_key)
+        timer = RequestTimer()
+        stream = active_llm.stream(messages, extra_body=_STREAM_USAGE_BODY)
+        try:
+            for chunk in stream:
+                timer.observe(chunk)
+                update = acc.feed(chunk)
+                if acc.closed:
+                    break
+                if update:
+                    yield update
+            else:
+                timer.finish()
+        finally:
+            stream.close()
+        llm_stats = _record_llm_metrics(model_key, token_info, timer)
+    except Exception as e:
+        logger.error(f"LLM streaming failed: {e}")
+        yield acc.failure()
+        return
+
+    result = _finalize_sql(acc.content, acc.reasoning, cache_key, normalized, token_info, llm_stats)
+    yield {**result, "done": True}
+
+
+def _prepare_sql(sql_text: str) -> str:
+    """실행 전 SQL 정리 — 주석 제거, 최종 케이스 서브쿼리 치환 (DB 조회가 있을 수 있는 동기 함수)"""
+    sql_text = _strip_sql_comments(sql_text)
+    if CASE_RESOLVER_CONFIG["rewrite_sql"]:
+        # MAX(case_id) 서브쿼리를 최종 case_id 상수로 치환 (옵티마이저가 인덱스/파티션 접근 가능)
+        sql_text = rewrite_latest_case_sql(sql_text)
+    return sql_text
+
+
+def _unsafe_sql_result() -> dict:
+    return {
+        "result": pd.DataFrame(),
+        "error": "안전하지 않은 SQL이 감지되었습니다. SELECT 문만 허용됩니다.",
+    }
+
+
+def _execution_failure() -> dict:
+    return {
+        "result": pd.DataFrame(),
+        "error": "SQL 실행 중 오류가 발생했습니다. 질문을 다시 작성해 주세요.",
+    }
+
+
+def _cached_result(sql_text: str, use_cache: bool) -> dict | None:
+    """결과 캐시 조회 (동일 SQL 재실행 시 Oracle 조회 생략, 메모리만 조회)"""
+    if not (_result_cache and use_cache):
+        return None
+    cached_df = _result_cache.get(sql_text)
+    if cached_df is None:
+        return None
+    logger.info(f"결과 캐시 적중: {len(cached_df)}건 ({_result_cache.stats()})")
+    return {
+        "result": cached_df,
+        "error": None,
+        "cached": True,
+        "truncated": len(cached_df) >= MAX_RESULT_ROWS,
+    }
+
+
+def _limited_sql(sql_text: str) -> str:
+    """최대 MAX_RESULT_ROWS행 제한 SQL"""
+    return f"SELECT * FROM ({sql_text}) WHERE ROWNUM <= {MAX_RESULT_ROWS}"
+
+
+def _store_result(sql_text: str, df: pd.DataFrame) -> dict:
+    """조회 결과를 캐시에 저장하고 결과 dict 반환 (마감 여부 확인에 DB 조회가 있을 수 있는 동기 함수)"""
+    if _result_cache:
+        _result_cache.set(sql_text, df)
+    return {
+        "result": df,
+        "error": None,
+        "cached": False,
+        "truncated": len(df) >= MAX_RESULT_ROWS,
     }
 
 
-def execute_sql(sql_text: str) -> dict:
+def execute_sql(sql_text: str, use_cache: bool = True) -> dict:
     """SQL을 실행하여 결과 반환
 
     Args:
         sql_text: 실행할 SQL 문
+        use_cache: False이면 결과 캐시를 건너뛰고 항상 DB 조회
 
     Returns:
-        dict with keys: result (pd.DataFrame), error (str or None)
+        dict with keys: result (pd.DataFrame — category/downcast dtype 압축), error (str or None), cached (bool),
+        truncated (bool — MAX_RESULT_ROWS에 도달하여 뒤에 행이 더 있을 수 있음)
     """
     # 안전성 재검증 (사용자가 SQL을 편집했을 수 있음)
     if not _is_safe_sql(sql_text):
-        return {
-            "result": pd.DataFrame(),
-            "error": "안전하지 않은 SQL이 감지되었습니다. SELECT 문만 허용됩니다.",
-        }
+        return _unsafe_sql_result()
+
+    sql_text = _prepare_sql(sql_text)
+    cached = _cached_result(sql_text, use_cache)
+    if cached:
+        return cached
 
-    # SQL 실행 (최대 1000행 제한 + 30초 타임아웃)
+    # SQL 실행 (최대 1000행 제한 + 30초 타임아웃, 복제본에 있는 이동번호는 DuckDB 우선)
     try:
-        sql_text = _strip_sql_comments(sql_text)
-        safe_sql = f"SELECT * FROM ({sql_text}) WHERE ROWNUM <= 1000"
-        with engine.connect() as conn:
-            conn.connection.dbapi_connection.call_timeout = 30000
-            df = pd.read_sql(text(safe_sql), conn)
+        safe_sql = _limited_sql(sql_text)
+        df = _replica_frame(safe_sql)
+        if df is None:
+            with engine.connect() as conn:
+                # call_timeout은 공용 풀의 session_callback에서 설정됨
+                df = fetch_frame(conn.connection.dbapi_connection, safe_sql, compact=True)
     except Exception as e:
         logger.error(f"SQL execution failed: {e}")
-        return {
-            "result": pd.DataFrame(),
-            "error": "SQL 실행 중 오류가 발생했습니다. 질문을 다시 작성해 주세요.",
-        }
+        return _execution_failure()
 
-    return {
-        "result": df,
-        "error": None,
-    }
+    return _store_result(sql_text, df)
 
 
 def ask_hr(question: str, model_key: str = None) -> dict:
@@ -465,6 +959,311 @@ def ask_hr(question: str, model_key: str = None) -> dict:
     }
 
 
+# ===== 6. 비동기 경로 (asyncio) =====
+# Gradio 이벤트 루프에서 스레드 없이 실행 — 동시성은 백엔드별 세마포어와 Oracle 비동기 풀 크기로 제한
+_llm_semaphores = {}
+_async_pool = None
+_async_pool_lock = asyncio.Lock()
+
+
+def _llm_semaphore(model_key: str = None) -> asyncio.Semaphore:
+    """vLLM 백엔드(base_url)별 동시 요청 세마포어 (같은 서버를 쓰는 모델은 한도를 공유)"""
+    config = get_model_config(model_key or DEFAULT_MODEL_KEY)
+    sem = _llm_semaphores.get(config["base_url"])
+    if sem is None:
+        sem = _llm_semaphores.setdefault(config["base_url"], asyncio.Semaphore(config["max_concurrency"]))
+    return sem
+
+
+async def _get_async_pool():
+    """python-oracledb 비동기 연결 풀을 지연 생성"""
+    global _async_pool
+    async with _async_pool_lock:
+        if _async_pool is None:
+            _async_pool = oracledb.create_pool_async(
+                user=DB_CONFIG["user"],
+                password=DB_CONFIG["password"],
+                dsn=oracledb.makedsn(DB_CONFIG["host"], DB_CONFIG["port"], sid=DB_CONFIG["sid"]),
+                min=ASYNC_DB_CONFIG["pool_min"],
+                max=ASYNC_DB_CONFIG["pool_max"],
+                increment=1,
+            )
+        return _async_pool
+
+
+@contextlib.asynccontextmanager
+async def _async_connection():
+    """비동기 풀 연결 (call_timeout은 동기 공용 풀과 같은 DB_POOL_CONFIG 값)"""
+    pool = await _get_async_pool()
+    async with pool.acquire() as conn:
+        conn.call_timeout = DB_POOL_CONFIG["call_timeout_ms"]
+        yield conn
+
+
+async def agenerate_sql_stream(question: str, model_key: str = None, use_cache: bool = True, min_interval: float = 0.1):
+    """generate_sql_stream의 비동기 버전 (ChatOpenAI.astream, 백엔드 세마포어 적용)"""
+    if not schema_ready():
+        yield {**_schema_unavailable(), "done": True}
+        return
+    cache_key, normalized, cached = _lookup_sql_cache(question, model_key, use_cache)
+    if cached:
+        yield {**cached, "done": True}
+        return
+
+    messages, token_info = _build_messages(question)
+    acc = _SqlStream(min_interval)
+    try:
+        active_llm = get_llm(model_key)
+        async with _llm_semaphore(model_key):
+            timer = RequestTimer()
+            stream = active_llm.astream(messages, extra_body=_STREAM_USAGE_BODY)
+            try:
+                async for chunk in stream:
+                    timer.observe(chunk)
+                    update = acc.feed(chunk)
+                    if acc.closed:
+                        break
+                    if update:
+                        yield update
+                else:
+                    timer.finish()
+            finally:
+                await stream.aclose()
+        llm_stats = _record_llm_metrics(model_key, token_info, timer)
+    except Exception as e:
+        logger.error(f"LLM streaming failed: {e}")
+        yield acc.failure()
+        return
+
+    # 캐시 파일 기록은 이벤트 루프 밖에서
+    result = await asyncio.to_thread(_finalize_sql, acc.content, acc.reasoning, cache_key, normalized,
+                                     token_info, llm_stats)
+    yield {**result, "done": True}
+
+
+async def agenerate_sql(question: str, model_key: str = None, use_cache: bool = True) -> dict:
+    """generate_sql의 비동기 버전 (ChatOpenAI.ainvoke, 백엔드 세마포어 적용)"""
+    reasoning = ""
+    if not schema_ready():
+        return _schema_unavailable()
+    cache_key, normalized, cached = _lookup_sql_cache(question, model_key, use_cache)
+    if cached:
+        return cached
+
+    messages, token_info = _build_messages(question)
+    try:
+        active_llm = get_llm(model_key)
+        async with _llm_semaphore(model_key):
+            timer = RequestTimer()
+            response = await active_llm.ainvoke(messages)
+        llm_stats = _record_llm_metrics(model_key, token_info, timer, response)
+        reasoning = _response_reasoning(response)
+        raw_sql = response.content
+    except Exception as e:
+        logger.error(f"LLM invocation failed: {e}")
+        return _llm_failure(reasoning=reasoning)
+
+    return await asyncio.to_thread(_finalize_sql, raw_sql, reasoning, cache_key, normalized, token_info, llm_stats)
+
+
+async def aexecute_sql(sql_text: str, use_cache: bool = True) -> dict:
+    """execute_sql의 비동기 버전 (python-oracledb 비동기 연결 풀 사용, 동기 DB 조회 단계는 스레드에서)"""
+    if not _is_safe_sql(sql_text):
+        return _unsafe_sql_result()
+
+    sql_text = await asyncio.to_thread(_prepare_sql, sql_text)
+    cached = _cached_result(sql_text, use_cache)
+    if cached:
+        return cached
+
+    # SQL 실행 (최대 1000행 제한 + call_timeout)
+    try:
+        safe_sql = _limited_sql(sql_text)
+        df = await asyncio.to_thread(_replica_frame, safe_sql) if REPLICA_CONFIG["execute_sql"] else None
+        if df is None:
+            async with _async_connection() as conn:
+                df = await afetch_frame(conn, safe_sql, compact=True)
+    except Exception as e:
+        logger.error(f"SQL execution failed: {e}")
+        return _execution_failure()
+
+    return await asyncio.to_thread(_store_result, sql_text, df)
+
+
+async def agenerate_report(question: str, sql: str, df: pd.DataFrame, reasoning: str = "", model_key: str = None) -> str:
+    """generate_report의 비동기 버전 (ChatOpenAI.ainvoke, 백엔드 세마포어 적용)"""
+    if df.empty:
+        return ""
+
+    try:
+        messages = _build_report_messages(question, sql, df)
+        active_report_llm = get_report_llm(model_key)
+        async with _llm_semaphore(model_key):
+            resp = await active_report_llm.ainvoke(messages)
+        llm_summary = resp.content.strip()
+    except Exception as e:
+        logger.error(f"Report generation failed: {e}")
+        llm_summary = "(보고서 생성 중 오류가 발생했습니다)"
+
+    return _assemble_report(sql, df, reasoning, llm_summary)
+
+
+# ===== 7. 결과 페이지 탐색 =====
+# MAX_RESULT_ROWS 이내는 첫 조회 결과를 잘라서, 그 이후는 OFFSET/FETCH로 페이지 단위 조회
+# 첫 조회 DataFrame은 세션 State 대신 결과 저장소에 핸들 키로 보관 (화면에는 핸들만 전달)
+_result_store = ResultStore(
+    memory_bytes=RESULT_STORE_CONFIG["memory_bytes"],
+    disk_dir=RESULT_STORE_CONFIG["dir"],
+    disk_bytes=RESULT_STORE_CONFIG["disk_bytes"],
+    ttl=PAGING_CONFIG["handle_ttl_sec"],
+    sweep_interval=RESULT_STORE_CONFIG["sweep_sec"],
+)
+_result_pager = ResultPager(
+    _result_store,
+    page_size=PAGING_CONFIG["page_size"],
+    max_handles=PAGING_CONFIG["max_handles"],
+    ttl=PAGING_CONFIG["handle_ttl_sec"],
+)
+
+
+def open_result_pages(sql_text: str, df: pd.DataFrame, session: str = None) -> str:
+    """
+    실행 결과를 페이지 탐색용 핸들로 등록 (df는 execute_sql/aexecute_sql 결과)
+
+    session: 결과를 소유한 브라우저 세션 ID (세션별 사용량 집계/세션 종료 시 일괄 해제용)
+    """
+    sql_text = _strip_sql_comments(sql_text.strip())
+    return _result_pager.open(sql_text, df, truncated=len(df) >= MAX_RESULT_ROWS, session=session)
+
+
+def get_result_frame(handle: str) -> pd.DataFrame | None:
+    """결과 핸들의 첫 조회 DataFrame (최대 MAX_RESULT_ROWS행, 만료/삭제되었으면 None)"""
+    return _result_pager.frame(handle)
+
+
+def release_result(handle: str):
+    """결과 핸들 해제 (같은 세션에서 새 SQL을 실행하면 이전 결과는 더 이상 필요 없음)"""
+    _result_pager.release(handle)
+
+
+def release_session_results(session: str) -> int:
+    """브라우저 세션이 소유한 결과 핸들 일괄 해제 (해제한 핸들 수 반환)"""
+    handles = _result_store.release_session(session)
+    if handles:
+        logger.info(f"세션 결과 {handles}개 해제")
+    return handles
+
+
+def get_session_result_usage(session: str) -> dict:
+    """세션별 결과 저장소 사용량: {"handles", "memory_bytes", "disk_bytes"}"""
+    return _result_store.session_stats(session)
+
+
+def get_result_store_stats() -> dict:
+    """결과 저장소 전체 사용량 (메모리/디스크 계층 카운터, 세션별 사용량)"""
+    return _result_store.stats()
+
+
+async def afetch_page(handle: str, page: int) -> dict:
+    """
+    결과 핸들의 page번째 페이지 조회 (0부터)
+
+    Returns:
+        dict with keys: result (pd.DataFrame), page (int), page_size (int), has_next (bool),
+        total (int or None — 아직 세지 않았으면 None), ordered (bool — False면 첫 조회 결과 안에서만 이동),
+        error (str or None)
+    """
+    state = _result_pager.get(handle)
+    size = _result_pager.page_size
+    expired = {"result": pd.DataFrame(), "page": 0, "page_size": size, "has_next": False, "total": None,
+               "ordered": True, "error": "조회 결과가 만료되었습니다. SQL을 다시 실행해 주세요."}
+    if state is None:
+        return expired
+
+    page = max(0, page)
+    last_page = _result_pager.last_page(state)
+    if last_page is not None:
+        page = min(page, last_page)
+
+    df = await asyncio.to_thread(_result_pager.prefetched_page, state, page)  # 저장소 디스크 계층 읽기 포함
+    more = None
+    if df is None and not state["ordered"]:
+        # 정렬 없는 SQL은 다시 조회하면 행 순서가 달라질 수 있으므로 저장소에서 밀려났으면 재실행 안내
+        return {**expired, "total": state["total"], "ordered": False}
+    if df is None:
+        try:
+            async with _async_connection() as conn:
+                # 다음 페이지 존재 여부 판단을 위해 1행 더 조회
+                df = await afetch_frame(conn, page_sql(state["sql"]),
+                                        {"row_offset": page * size, "row_count": size + 1}, max_rows=size + 1)
+        except Exception as e:
+            logger.error(f"Page fetch failed: {e}")
+            return {"result": pd.DataFrame(), "page": state["page"], "page_size": size, "has_next": False,
+                    "total": state["total"], "ordered": True, "error": "페이지 조회 중 오류가 발생했습니다."}
+        more = len(df) > size
+        df = df.head(size)
+
+    state["page"] = page
+    return {
+        "result": df,
+        "page": page,
+        "page_size": size,
+        "has_next": _result_pager.has_next(state, page, more),
+        "total": state["total"],
+        "ordered": state["ordered"],
+        "error": None,
+    }
+
+
+async def acount_rows(handle: str) -> int | None:
+    """결과 핸들의 전체 건수 (처음 요청 시 COUNT(*)로 계산 후 보관, 실패/만료 시 None)"""
+    state = _result_pager.get(handle)
+    if state is None:
+        return None
+    if state["total"] is None:
+        try:
+            async with _async_connection() as conn:
+                with conn.cursor() as cursor:
+                    await cursor.execute(count_sql(state["sql"]))
+                    (state["total"],) = await cursor.fetchone()
+        except Exception as e:
+            logger.error(f"Row count failed: {e}")
+            return None
+    return state["total"]
+
+
+# ===== 8. 결과 전체 내보내기 =====
+def export_result(handle: str, fmt: str = "csv", on_progress=None) -> dict:
+    """
+    결과 핸들의 SQL을 행 상한 없이 다시 실행하여 파일로 내보내기
+
+    Args:
+        handle: open_result_pages()가 돌려준 결과 핸들
+        fmt: "csv" / "parquet" / "xlsx"
+        on_progress: callback(누적 행 수, 전체 건수 또는 None)
+
+    Returns:
+        dict with keys: path (str or None), rows (int), error (str or None)
+    """
+    state = _result_pager.get(handle) if handle else None
+    if state is None:
+        return {"path": None, "rows": 0, "error": "조회 결과가 만료되었습니다. SQL을 다시 실행해 주세요."}
+    sql_text = state["sql"]
+    # 안전성 재검증 (핸들에는 실행 당시 SQL이 보관되어 있지만 내보내기는 별도 경로로 실행)
+    if not _is_safe_sql(sql_text):
+        return {"path": None, "rows": 0, "error": "안전하지 않은 SQL이 감지되었습니다. SELECT 문만 허용됩니다."}
+    if CASE_RESOLVER_CONFIG["rewrite_sql"]:
+        sql_text = rewrite_latest_case_sql(sql_text)
+
+    progress = (lambda n: on_progress(n, state["total"])) if on_progress else None
+    try:
+        exported = export_query(sql_text, fmt, on_progress=progress)
+    except Exception as e:
+        logger.error(f"Result export failed: {e}")
+        return {"path": None, "rows": 0, "error": "내보내기 중 오류가 발생했습니다."}
+    return {"path": exported["path"], "rows": exported["rows"], "error": None}
+
+
 if __name__ == "__main__":
     # 간단한 테스트
     test_q = "move_item_master 테이블의 직급별(pos_grd_nm) 인원 수를 구해줘"
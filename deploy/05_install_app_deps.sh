@@ -28,6 +28,8 @@ echo ""
 
 echo "[3] 데이터 처리 패키지 설치..."
 pip install pandas
+# 선택: Arrow 조회 경로(FETCH_USE_ARROW), 분석용 로컬 복제본(REPLICA_ENABLED), Parquet/XLSX 내보내기
+pip install pyarrow duckdb openpyxl
 echo ""
 
 echo "[4] Gradio 웹 UI 설치..."
@@ -18,6 +18,8 @@ echo "[1] 서비스 파일 복사..."
 sudo cp "$SERVICES_SRC/vllm.service" /etc/systemd/system/
 sudo cp "$SERVICES_SRC/vllm-7b.service" /etc/systemd/system/
 sudo cp "$SERVICES_SRC/text2sql-ui.service" /etc/systemd/system/
+sudo cp "$SERVICES_SRC/text2sql-precompute.service" /etc/systemd/system/
+sudo cp "$SERVICES_SRC/text2sql-precompute.timer" /etc/systemd/system/
 echo "  완료"
 echo ""
 
@@ -31,6 +33,7 @@ echo ""
 echo "[3] 서비스 활성화..."
 sudo systemctl enable vllm
 sudo systemctl enable text2sql-ui
+sudo systemctl enable --now text2sql-precompute.timer   # 대시보드 집계 사전 계산 (15분 주기)
 echo "  완료"
 echo ""
 
@@ -47,6 +50,10 @@ echo ""
 echo "   # 웹 UI 시작:"
 echo "   sudo systemctl start text2sql-ui"
 echo ""
+echo "   # 대시보드 집계 사전 계산 즉시 실행 / 타이머 확인:"
+echo "   sudo systemctl start text2sql-precompute"
+echo "   systemctl list-timers text2sql-precompute.timer"
+echo ""
 echo "   # 상태 확인:"
 echo "   sudo systemctl status vllm"
 echo "   sudo systemctl status text2sql-ui"
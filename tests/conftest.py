@@ -0,0 +1,12 @@
+"""
+오프라인 단위 테스트 공통 설정
+app/ 모듈은 app 디렉터리를 작업 경로로 두고 실행되므로 (from config import ...) 같은 방식으로 import 가능하게 함
+DB/LLM 연결이 필요한 통합 테스트는 app/test_e2e.py
+실행: python -m pytest -q tests
+"""
+import os
+import sys
+
+APP_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app")
+if APP_DIR not in sys.path:
+    sys.path.insert(0, APP_DIR)
@@ -0,0 +1,49 @@
+"""case_resolver — 최종 케이스 서브쿼리 상수 치환"""
+import pytest
+
+import case_resolver
+from case_resolver import rewrite_latest_case_sql
+
+_LATEST = {"202401": 3, "202402": 7}
+
+
+@pytest.fixture(autouse=True)
+def latest_cases(monkeypatch):
+    """DB 조회 대신 고정된 최종 케이스 (없는 이동번호는 None)"""
+    monkeypatch.setattr(case_resolver, "latest_case_id", lambda mid: _LATEST.get(str(mid)))
+
+
+def test_rewrite_literal_move_id():
+    sql = ("SELECT * FROM HRAI_CON.move_case_item ci WHERE ci.ftr_move_std_id = 202401 "
+           "AND ci.case_id = (SELECT MAX(case_id) FROM HRAI_CON.move_case_master WHERE ftr_move_std_id = 202401)")
+    assert rewrite_latest_case_sql(sql) == (
+        "SELECT * FROM HRAI_CON.move_case_item ci WHERE ci.ftr_move_std_id = 202401 AND ci.case_id = 3")
+
+
+def test_rewrite_correlated_subquery_with_single_move():
+    sql = ("SELECT * FROM move_case_item m WHERE m.ftr_move_std_id = 202402 AND m.case_id = "
+           "(SELECT MAX(cm.case_id) FROM move_case_master cm WHERE cm.ftr_move_std_id = m.ftr_move_std_id)")
+    assert rewrite_latest_case_sql(sql).endswith("m.case_id = 7")
+
+
+@pytest.mark.parametrize("sql", [
+    # 여러 이동번호 — 행마다 최종 케이스가 다름
+    "SELECT * FROM move_case_item m WHERE m.ftr_move_std_id IN (202401, 202402) AND m.case_id = "
+    "(SELECT MAX(case_id) FROM move_case_master WHERE ftr_move_std_id = m.ftr_move_std_id)",
+    # 바인드 변수
+    "SELECT * FROM move_case_item WHERE case_id = "
+    "(SELECT MAX(case_id) FROM move_case_master WHERE ftr_move_std_id = :mid)",
+    # 케이스가 없는 이동번호
+    "SELECT * FROM move_case_item WHERE case_id = "
+    "(SELECT MAX(case_id) FROM move_case_master WHERE ftr_move_std_id = 209912)",
+])
+def test_rewrite_keeps_original(sql):
+    assert rewrite_latest_case_sql(sql) == sql
+
+
+def test_rewrite_keeps_original_on_lookup_failure(monkeypatch):
+    def fail(mid):
+        raise ConnectionError("DB 연결 실패")
+    monkeypatch.setattr(case_resolver, "latest_case_id", fail)
+    sql = "SELECT (SELECT MAX(case_id) FROM move_case_master WHERE ftr_move_std_id = 202401) FROM dual"
+    assert rewrite_latest_case_sql(sql) == sql
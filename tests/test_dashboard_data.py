@@ -0,0 +1,41 @@
+"""dashboard_data — 통합 집계 결과를 패널별 행으로 분리"""
+from dashboard_data import GID_JOB, GID_MUST, GID_REGION, GID_TOTAL, split_move_aggregates, split_penalty_facts
+
+
+def test_split_move_aggregates():
+    rows = [
+        # gid, lvl2_nm, job_type1, must_cat, total, moved, not_moved, stayed, unplaced
+        (GID_TOTAL, None, None, None, 100, 60, 40, 30, 10),
+        (GID_REGION, "부산", None, None, 40, 20, 20, None, None),
+        (GID_REGION, None, None, None, 10, 5, 5, None, None),
+        (GID_REGION, "강원", None, None, 50, 35, 15, None, None),
+        (GID_JOB, None, "사무", None, 30, 20, None, None, None),
+        (GID_JOB, None, None, None, 70, 40, None, None, None),
+        (GID_MUST, None, None, "이동필수", 5, 5, None, None, None),
+        (GID_MUST, None, None, "잔류필수", 8, 0, None, None, None),
+    ]
+    assert split_move_aggregates(rows) == {
+        "summary": (100, 60, 30, 10),
+        "region": [("강원", 50, 35, 15), ("부산", 40, 20, 20), ("(미지정)", 10, 5, 5)],
+        "job": [("(미지정)", 70, 40), ("사무", 30, 20)],
+        "must": [("이동필수", 5, 5), ("잔류필수", 8, 0)],
+    }
+
+
+def test_split_move_aggregates_empty():
+    assert split_move_aggregates([]) == {"summary": (0, 0, 0, 0), "region": [], "job": [], "must": []}
+
+
+def test_split_penalty_facts():
+    rows = [
+        # kind, name, vio_cnst_cnt, total_vio, unit_pen, total_pen
+        ("cnst", "거리", None, 3, 10, 30),
+        ("cnst", "직급", None, 5, 20, 100),
+        ("cnst", "기타", None, 1, None, None),
+        ("org", "서울사업소", 2, 4, None, 50),
+        ("org", "부산사업소", 1, 1, None, 70),
+    ]
+    assert split_penalty_facts(rows) == {
+        "cnst": [("기타", 1, None, None), ("직급", 5, 20, 100), ("거리", 3, 10, 30)],
+        "org": [("부산사업소", 1, 1, 70), ("서울사업소", 2, 4, 50)],
+    }
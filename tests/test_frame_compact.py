@@ -0,0 +1,52 @@
+"""frame_compact — 표시 값이 바뀌지 않는 dtype 압축"""
+import numpy as np
+import pandas as pd
+
+from frame_compact import compact_frame, compaction_report, format_report
+
+
+def _frame() -> pd.DataFrame:
+    return pd.DataFrame({
+        "org_nm": ["서울", "부산", "서울", "부산"] * 25,
+        "emp_no": [f"E{i:04d}" for i in range(100)],
+        "age": np.arange(100, dtype=np.int64),
+        "tenure": [np.nan if i % 7 == 0 else float(i) for i in range(100)],
+        "score": [i + 0.1 for i in range(100)],
+    })
+
+
+def test_compact_frame_dtypes():
+    df = _frame()
+    compact = compact_frame(df, integer_digits=[None, None, 3, 5, None])
+    assert isinstance(compact["org_nm"].dtype, pd.CategoricalDtype)
+    assert compact["emp_no"].dtype == df["emp_no"].dtype  # 고유값이 많은 문자열은 유지
+    assert compact["age"].dtype == np.int8
+    assert compact["tenure"].dtype == np.float32
+    assert compact["score"].dtype == np.float64  # 소수 자릿수가 있는 실수는 유지
+    assert df["age"].dtype == np.int64  # 원본은 변경하지 않음
+
+
+def test_compact_frame_keeps_display_strings():
+    df = _frame()
+    compact = compact_frame(df, integer_digits=[None, None, 3, 5, None])
+    assert compact.to_string(index=False) == df.to_string(index=False)
+
+
+def test_float32_only_for_declared_small_integers():
+    df = pd.DataFrame({"big": [12345678.0, np.nan], "undeclared": [1.0, np.nan]})
+    compact = compact_frame(df, integer_digits=[8, None])
+    assert (compact.dtypes == np.float64).all()
+
+
+def test_compaction_report():
+    df = _frame()
+    report = compaction_report(df, compact_frame(df))
+    assert report["after_bytes"] < report["before_bytes"]
+    assert report["ratio"] == report["after_bytes"] / report["before_bytes"]
+    assert [c["name"] for c in report["columns"]] == list(df.columns)
+    assert "컬럼 2/5개 변환" in format_report(report)
+
+
+def test_empty_frame_unchanged():
+    df = pd.DataFrame({"a": []})
+    assert compact_frame(df) is df
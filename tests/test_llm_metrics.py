@@ -0,0 +1,21 @@
+"""llm_metrics — 요청별 지표와 접두사 캐시 적중률"""
+from llm_metrics import LLMMetrics
+
+
+def test_hit_rate_excludes_requests_without_cached_tokens():
+    metrics = LLMMetrics()
+    metrics.record("m", "p", 0.1, 1.0, {"prompt": 1000, "cached": 800, "output": 10})
+    metrics.record("m", "p", 0.1, 1.0, {"prompt": 1000, "cached": None, "output": 10})  # 조기 종료 스트림
+    stats = metrics.stats()
+    assert stats["prefix_hit_rate"] == 80.0
+    assert stats["hit_rate_samples"] == 1
+    assert stats["prompt_tokens_avg"] == 1000 and stats["cached_tokens_avg"] == 800
+
+
+def test_hit_rate_unknown_without_samples():
+    metrics = LLMMetrics()
+    metrics.record("m", "p", 0.1, 1.0, {"prompt": 1000, "cached": None, "output": 10})
+    metrics.record("m", "p", None, 1.0, None)
+    stats = metrics.stats()
+    assert stats["prefix_hit_rate"] is None and stats["hit_rate_samples"] == 0
+    assert stats["count"] == 2
@@ -0,0 +1,84 @@
+"""replica — Oracle → DuckDB 방언 변환, 복제본 사용 여부(manifest)"""
+import datetime
+
+import pytest
+
+import replica
+from replica import UnsupportedSQL, to_duckdb_sql
+
+
+@pytest.mark.parametrize("oracle, duck", [
+    ("SELECT NVL(a, 0) FROM t;", "SELECT COALESCE(a, 0) FROM t"),
+    ("SELECT SYSDATE FROM DUAL", "SELECT CURRENT_TIMESTAMP"),
+    ("SELECT a FROM t MINUS SELECT a FROM u", "SELECT a FROM t EXCEPT SELECT a FROM u"),
+    ("SELECT a FROM t ORDER BY a FETCH FIRST 10 ROWS ONLY", "SELECT a FROM t ORDER BY a LIMIT 10"),
+    ("SELECT a FROM t ORDER BY a OFFSET 20 ROWS FETCH NEXT 10 ROWS ONLY",
+     "SELECT a FROM t ORDER BY a LIMIT 10 OFFSET 20"),
+    ("SELECT a FROM t WHERE ftr_move_std_id = :mid", "SELECT a FROM t WHERE ftr_move_std_id = $mid"),
+    ("SELECT * FROM (SELECT a FROM t) WHERE ROWNUM <= 100", "SELECT * FROM (SELECT a FROM t) LIMIT 100"),
+    ("SELECT a FROM t WHERE b = 1 AND ROWNUM < 5", "SELECT a FROM t WHERE b = 1 LIMIT 4"),
+    # 문자열 리터럴 내부는 변경하지 않음
+    ("SELECT 'NVL(:x) || SYSDATE' FROM t", "SELECT 'NVL(:x) || SYSDATE' FROM t"),
+    ("SELECT TO_CHAR(d, 'HH24:MI') FROM t", "SELECT TO_CHAR(d, 'HH24:MI') FROM t"),
+])
+def test_to_duckdb_sql(oracle, duck):
+    assert to_duckdb_sql(oracle) == duck
+
+
+@pytest.mark.parametrize("sql", [
+    "SELECT emp_nm || '(' || emp_no || ')' FROM t",  # NULL 연결 의미가 다름
+    "SELECT DECODE(a, 1, 'x') FROM t",
+    "SELECT a FROM t, u WHERE t.id = u.id(+)",
+    "SELECT a FROM t START WITH p IS NULL CONNECT BY PRIOR id = p",
+    "SELECT ROWID FROM t",
+    "SELECT ROWNUM, a FROM t",
+])
+def test_to_duckdb_sql_unsupported(sql):
+    with pytest.raises(UnsupportedSQL):
+        to_duckdb_sql(sql)
+
+
+# ===== 복제본 사용 여부 =====
+@pytest.fixture
+def manifest_dir(tmp_path, monkeypatch):
+    """복제본 활성화 + 임시 manifest (duckdb 설치 여부와 무관하게 manifest 판단만 확인)"""
+    monkeypatch.setitem(replica.REPLICA_CONFIG, "enabled", True)
+    monkeypatch.setitem(replica.REPLICA_CONFIG, "dir", str(tmp_path))
+    monkeypatch.setitem(replica.CHANGE_PROBE_CONFIG, "enabled", True)
+    monkeypatch.setattr(replica, "duckdb", object())
+    now = datetime.datetime.now().isoformat(timespec="seconds")
+    old = (datetime.datetime.now() - datetime.timedelta(days=1)).isoformat(timespec="seconds")
+    replica._update_manifest(lambda m: m["moves"].update({
+        "202401": {"extracted_at": old, "closed": True, "tables": {}},
+        "202402": {"extracted_at": now, "closed": False, "tables": {}},
+        "202403": {"extracted_at": old, "closed": False, "tables": {}},
+    }))
+    return tmp_path
+
+
+def test_has_move(manifest_dir):
+    assert replica.has_move(202401)  # 마감 — 추출 시각 무관
+    assert replica.has_move("202402")  # 진행 중 — max_age_sec 이내
+    assert not replica.has_move(202403)  # 진행 중 — 오래됨
+    assert not replica.has_move(209912)
+
+
+def test_open_moves_need_change_probe(manifest_dir, monkeypatch):
+    monkeypatch.setitem(replica.CHANGE_PROBE_CONFIG, "enabled", False)
+    assert replica.has_move(202401)
+    assert not replica.has_move(202402)
+
+
+def test_forget_move_on_change(manifest_dir):
+    replica.forget_move("202402", {"move_case_item"})
+    assert not replica.has_move(202402)
+    assert "202402" not in replica._read_manifest()["moves"]
+    replica.forget_move("202402")  # 이미 제외된 이동번호는 파일을 다시 쓰지 않음
+    assert replica.has_move(202401)
+
+
+def test_manifest_reread_only_when_file_changes(manifest_dir):
+    first = replica.load_manifest()
+    assert replica.load_manifest() is first
+    replica._update_manifest(lambda m: m["moves"].pop("202401"))
+    assert "202401" not in replica.load_manifest()["moves"]
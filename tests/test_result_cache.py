@@ -0,0 +1,97 @@
+"""result_cache — SQL 지문, 이동번호 추출, 이동번호 단위 무효화"""
+import time
+
+import pandas as pd
+import pytest
+
+import result_cache
+from result_cache import ResultCache, extract_move_ids, sql_fingerprint
+
+
+@pytest.fixture(autouse=True)
+def open_moves(monkeypatch):
+    """마감 여부 조회(DB) 대신 모든 이동번호를 미마감으로"""
+    monkeypatch.setattr(result_cache, "get_close_status", lambda ids: {mid: False for mid in ids})
+
+
+def _frame(n: int = 3) -> pd.DataFrame:
+    return pd.DataFrame({"a": range(n)})
+
+
+# ===== 지문/이동번호 =====
+def test_fingerprint_ignores_whitespace_and_case_outside_literals():
+    assert sql_fingerprint("select a\n  from t where x = 1") == sql_fingerprint("SELECT a FROM t WHERE x=1")
+    assert sql_fingerprint("SELECT a FROM t WHERE n = 'a b'") != sql_fingerprint("SELECT a FROM t WHERE n = 'A B'")
+
+
+def test_extract_move_ids():
+    sql = "SELECT * FROM t WHERE ftr_move_std_id = 202401 OR FTR_MOVE_STD_ID IN (202402, 0202403)"
+    assert extract_move_ids(sql) == {"202401", "202402", "202403"}
+    assert extract_move_ids("SELECT * FROM t") == set()
+
+
+# ===== 캐시 =====
+def test_get_returns_copy():
+    cache = ResultCache()
+    cache.set("SELECT a FROM t WHERE ftr_move_std_id = 1", _frame())
+    df = cache.get("SELECT a FROM t WHERE ftr_move_std_id = 1")
+    df.loc[0, "a"] = 99
+    assert cache.get("SELECT a FROM t WHERE ftr_move_std_id = 1").loc[0, "a"] == 0
+
+
+def test_invalidate_move_removes_matching_and_unscoped_results():
+    cache = ResultCache()
+    cache.set("SELECT a FROM t WHERE ftr_move_std_id = 1", _frame())
+    cache.set("SELECT a FROM t WHERE ftr_move_std_id = 2", _frame())
+    cache.set("SELECT MAX(ftr_move_std_id) FROM t", _frame())  # 이동번호 미지정 → 모든 무효화 대상
+    assert cache.invalidate_move(1) == 2
+    assert cache.get("SELECT a FROM t WHERE ftr_move_std_id = 1") is None
+    assert cache.get("SELECT MAX(ftr_move_std_id) FROM t") is None
+    assert cache.get("SELECT a FROM t WHERE ftr_move_std_id = 2") is not None
+    assert cache.index_size() == 1
+
+
+def test_move_id_in_string_literal_is_not_indexed():
+    cache = ResultCache()
+    cache.set("SELECT a FROM t WHERE note = 'ftr_move_std_id = 7'", _frame())
+    assert cache.invalidate_move(7) == 1  # 이동번호 미지정 결과로 색인됨
+
+
+def test_evicted_keys_leave_index():
+    cache = ResultCache(max_entries=2)
+    for mid in range(10):
+        cache.set(f"SELECT a FROM t WHERE ftr_move_std_id = {mid}", _frame())
+    assert cache.index_size() == 2
+
+
+def test_expired_keys_leave_index():
+    cache = ResultCache(open_ttl=0.05)
+    cache.set("SELECT a FROM t WHERE ftr_move_std_id = 1", _frame())
+    time.sleep(0.06)
+    assert cache.get("SELECT a FROM t WHERE ftr_move_std_id = 1") is None
+    assert cache.index_size() == 0
+
+
+def test_closed_moves_never_expire(monkeypatch):
+    monkeypatch.setattr(result_cache, "get_close_status", lambda ids: {mid: True for mid in ids})
+    cache = ResultCache(open_ttl=0.05)
+    cache.set("SELECT a FROM t WHERE ftr_move_std_id = 1", _frame())
+    time.sleep(0.06)
+    assert cache.get("SELECT a FROM t WHERE ftr_move_std_id = 1") is not None
+
+
+def test_set_stores_copy():
+    cache = ResultCache()
+    df = _frame()
+    cache.set("SELECT a FROM t WHERE ftr_move_std_id = 1", df)
+    df.loc[0, "a"] = 99  # 호출 측이 돌려받은 DataFrame을 수정해도 캐시 항목은 그대로
+    assert cache.get("SELECT a FROM t WHERE ftr_move_std_id = 1").loc[0, "a"] == 0
+
+
+def test_oversized_result_is_not_indexed():
+    cache = ResultCache(max_bytes=_frame(3).memory_usage(deep=True).sum() * 2)
+    sql = "SELECT a FROM t WHERE ftr_move_std_id = 1"
+    cache.set(sql, _frame(3))
+    cache.set(sql, _frame(10_000))
+    assert cache.get(sql) is None
+    assert cache.index_size() == 0
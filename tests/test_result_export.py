@@ -0,0 +1,84 @@
+"""result_export — 형식별 기록기와 내보내기 파일 정리"""
+import datetime
+import os
+import time
+
+import oracledb
+import pytest
+
+import result_export
+from result_export import _CsvWriter, _csv_formatter, gc_exports
+
+# cursor.description 항목: (name, type_code, display_size, internal_size, precision, scale, null_ok)
+DESCRIPTION = [
+    ("EMP_NO", oracledb.DB_TYPE_VARCHAR, None, None, None, None, True),
+    ("AGE", oracledb.DB_TYPE_NUMBER, None, None, 3, 0, True),
+    ("SCORE", oracledb.DB_TYPE_NUMBER, None, None, 5, 2, True),
+    ("HIRE_YMD", oracledb.DB_TYPE_DATE, None, None, None, None, True),
+    ("비고", oracledb.DB_TYPE_VARCHAR, None, None, None, None, True),
+]
+ROWS = [
+    ("E001", 12, 80.5, datetime.datetime(2020, 3, 1), "a,b"),
+    ("E002", 12.0, 90.0, None, None),  # 드라이버가 float로 준 정수값
+    ("E003", None, None, datetime.datetime(2021, 1, 2, 9, 30), '"인용"'),
+]
+
+
+def test_csv_formatter():
+    age, score, hire = (_csv_formatter(d) for d in DESCRIPTION[1:4])
+    assert [age(12), age(12.0), age(None)] == ["12", "12", ""]
+    assert [score(80.5), score(90.0)] == ["80.5", "90"]
+    assert hire(datetime.datetime(2020, 3, 1)) == "2020-03-01 00:00:00"
+
+
+def test_csv_writer_is_consistent_across_batches(tmp_path):
+    path = tmp_path / "out.csv"
+    writer = _CsvWriter(str(path), DESCRIPTION)
+    writer.write(ROWS[:1])
+    writer.write(ROWS[1:])  # NULL이 섞인 배치도 정수 컬럼 형식이 같아야 함
+    writer.close()
+    assert path.read_bytes().startswith(b"\xef\xbb\xbf")
+    assert path.read_text(encoding="utf-8-sig") == (
+        "emp_no,age,score,hire_ymd,비고\n"
+        'E001,12,80.5,2020-03-01 00:00:00,"a,b"\n'
+        "E002,12,90,,\n"
+        'E003,,,2021-01-02 09:30:00,"""인용"""\n'
+    )
+
+
+def test_parquet_writer(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = tmp_path / "out.parquet"
+    writer = result_export._ParquetWriter(str(path), DESCRIPTION)
+    writer.write(ROWS[:1])
+    writer.write(ROWS[1:])
+    writer.close()
+    table = pq.read_table(path)
+    assert table.column_names == ["emp_no", "age", "score", "hire_ymd", "비고"]
+    assert str(table.schema.field("age").type) == "int64"
+    assert table.column("age").to_pylist() == [12, 12, None]
+
+
+def test_xlsx_writer(tmp_path, monkeypatch):
+    openpyxl = pytest.importorskip("openpyxl")
+    monkeypatch.setattr(result_export, "_XLSX_MAX_ROWS", 3)  # 시트당 헤더 + 2행
+    path = tmp_path / "out.xlsx"
+    writer = result_export._XlsxWriter(str(path), DESCRIPTION)
+    writer.write(ROWS)
+    writer.close()
+    book = openpyxl.load_workbook(path, read_only=True)
+    assert book.sheetnames == ["결과", "결과_2"]
+    assert [c.value for c in next(book["결과_2"].iter_rows())] == ["emp_no", "age", "score", "hire_ymd", "비고"]
+
+
+def test_gc_exports(tmp_path, monkeypatch):
+    monkeypatch.setitem(result_export.EXPORT_CONFIG, "dir", str(tmp_path))
+    now = time.time()
+    for name, size, age in [("query_result_old.csv", 10, 7200), ("query_result_a.csv", 30, 20),
+                            ("query_result_b.csv", 30, 10), ("other.csv", 100, 7200)]:
+        path = tmp_path / name
+        path.write_bytes(b"x" * size)
+        os.utime(path, (now - age, now - age))
+    result = gc_exports(max_age_sec=3600, quota_bytes=40)
+    assert result == {"removed": 2, "freed": 40, "kept": 1, "bytes": 30}
+    assert sorted(os.listdir(tmp_path)) == ["other.csv", "query_result_b.csv"]
@@ -0,0 +1,52 @@
+"""result_pager — 맨 바깥 ORDER BY 판별과 페이지 이동 범위"""
+import pandas as pd
+import pytest
+
+from result_pager import ResultPager, has_top_level_order_by
+from result_store import ResultStore
+
+
+@pytest.mark.parametrize("sql, expected", [
+    ("SELECT * FROM EMP ORDER BY EMP_NO", True),
+    ("select a from t order  by a desc", True),
+    ("SELECT a FROM t UNION ALL SELECT a FROM u ORDER BY 1", True),
+    ("SELECT * FROM (SELECT * FROM EMP ORDER BY EMP_NO)", False),
+    ("SELECT EMP_NO, ROW_NUMBER() OVER (ORDER BY SAL) RN FROM EMP", False),
+    ("SELECT * FROM EMP WHERE NOTE = 'x) ORDER BY y'", False),
+    ('SELECT "ORDER BY" FROM EMP', False),
+    ("SELECT LEVEL FROM DUAL CONNECT BY LEVEL < 5 ORDER SIBLINGS BY LEVEL", True),
+    ("SELECT * FROM EMP", False),
+])
+def test_has_top_level_order_by(sql, expected):
+    assert has_top_level_order_by(sql) is expected
+
+
+@pytest.fixture
+def pager(tmp_path):
+    store = ResultStore(memory_bytes=10 * 1024 * 1024, disk_dir=str(tmp_path / "spill"),
+                        disk_bytes=10 * 1024 * 1024, sweep_interval=0)
+    return ResultPager(store, page_size=10)
+
+
+def _frame(rows: int) -> pd.DataFrame:
+    return pd.DataFrame({"a": range(rows)})
+
+
+def test_ordered_truncated_result_pages_past_prefetch(pager):
+    state = pager.get(pager.open("SELECT a FROM t ORDER BY a", _frame(25), truncated=True))
+
+    assert state["ordered"]
+    assert pager.last_page(state) is None
+    assert pager.prefetched_page(state, 1)["a"].tolist() == list(range(10, 20))
+    assert pager.prefetched_page(state, 2) is None  # DB 페이지 조회 필요
+    assert pager.has_next(state, 2, more=True)
+
+
+def test_unordered_truncated_result_stays_within_prefetch(pager):
+    state = pager.get(pager.open("SELECT a FROM t", _frame(25), truncated=True))
+
+    assert not state["ordered"]
+    assert pager.last_page(state) == 2
+    assert pager.prefetched_page(state, 2)["a"].tolist() == list(range(20, 25))
+    assert pager.has_next(state, 1, more=None)
+    assert not pager.has_next(state, 2, more=True)
@@ -0,0 +1,106 @@
+"""result_store — 메모리/디스크 2단계 결과 저장소"""
+import os
+import threading
+
+import pandas as pd
+import pytest
+
+from frame_compact import frame_nbytes
+from result_store import ResultStore
+
+_HANDLES = [f"{i:032x}" for i in range(4)]
+
+
+def _frame(seed: int) -> pd.DataFrame:
+    return pd.DataFrame({"a": [seed * 1000 + i for i in range(200)], "b": [f"v{i}" for i in range(200)]})
+
+
+@pytest.fixture
+def store(tmp_path):
+    """결과 1건만 메모리에 들어가는 저장소"""
+    return ResultStore(memory_bytes=int(frame_nbytes(_frame(0)) * 1.5), disk_dir=str(tmp_path / "spill"),
+                       disk_bytes=10 * 1024 * 1024, sweep_interval=0)
+
+
+def _spill_files(store) -> set:
+    return set(os.listdir(store.disk_dir)) if os.path.isdir(store.disk_dir) else set()
+
+
+def test_spill_and_promote(store):
+    store.put(_HANDLES[0], _frame(0), session="s1")
+    store.put(_HANDLES[1], _frame(1), session="s1")
+    assert _spill_files(store) == {f"{_HANDLES[0]}.pkl"}
+    # 디스크 결과를 조회하면 메모리로 올라오고, 밀려난 결과가 디스크로 내려감
+    assert store.get(_HANDLES[0])["a"].tolist() == _frame(0)["a"].tolist()
+    assert _spill_files(store) == {f"{_HANDLES[1]}.pkl"}
+    assert store.get(_HANDLES[1])["a"].tolist() == _frame(1)["a"].tolist()
+
+
+def test_release_removes_memory_and_disk(store):
+    store.put(_HANDLES[0], _frame(0), session="s1")
+    store.put(_HANDLES[1], _frame(1), session="s1")
+    store.release(_HANDLES[0])
+    store.release(_HANDLES[1])
+    assert store.get(_HANDLES[0]) is None and store.get(_HANDLES[1]) is None
+    assert _spill_files(store) == set()
+
+
+def test_release_session_and_stats(store):
+    store.put(_HANDLES[0], _frame(0), session="s1")
+    store.put(_HANDLES[1], _frame(1), session="s1")
+    store.put(_HANDLES[2], _frame(2), session="s2")
+    stats = store.session_stats("s1")
+    assert stats["handles"] == 2 and stats["disk_bytes"] > 0
+    assert store.release_session("s1") == 2
+    assert store.session_stats("s1")["handles"] == 0
+    assert store.get(_HANDLES[2]) is not None
+
+
+def test_sweep_keeps_foreign_files(tmp_path):
+    disk_dir = tmp_path / "spill"
+    disk_dir.mkdir()
+    (disk_dir / f"{_HANDLES[3]}.pkl").write_bytes(b"stale")  # 이전 실행이 남긴 결과
+    (disk_dir / "notes.txt").write_text("keep")
+    (disk_dir / "backup.pkl").write_bytes(b"keep")
+    (disk_dir / f"{_HANDLES[3]}.pkl.0123abcd.tmp").write_bytes(b"partial")  # 기록 중 종료된 임시 파일
+    ResultStore(memory_bytes=1024, disk_dir=str(disk_dir), disk_bytes=1024, sweep_interval=0)
+    assert set(os.listdir(disk_dir)) == {"notes.txt", "backup.pkl"}
+
+
+def test_periodic_sweep_keeps_live_and_in_flight_files(store):
+    store.put(_HANDLES[0], _frame(0), session="s1")
+    store.put(_HANDLES[1], _frame(1), session="s1")  # _HANDLES[0]이 디스크로
+    in_flight = f"{_HANDLES[2]}.pkl.0123abcd.tmp"
+    with open(os.path.join(store.disk_dir, in_flight), "wb") as f:
+        f.write(b"writing")
+    store._sweep_disk()
+    assert _spill_files(store) == {f"{_HANDLES[0]}.pkl", in_flight}
+    assert store.get(_HANDLES[0]) is not None
+
+
+def test_concurrent_get_and_sweep_never_lose_results(tmp_path):
+    store = ResultStore(memory_bytes=frame_nbytes(_frame(0)) * 3, disk_dir=str(tmp_path / "spill"),
+                        disk_bytes=10 * 1024 * 1024, sweep_interval=0)
+    handles = [f"{i:032x}" for i in range(12)]
+    for i, handle in enumerate(handles):
+        store.put(handle, _frame(i), session="s1")
+    missing, stop = [], threading.Event()
+
+    def sweeper():
+        while not stop.is_set():
+            store._sweep_disk()
+
+    def reader(part):
+        for _ in range(30):
+            missing.extend(h for h in handles[part::3] if store.get(h) is None)
+
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(3)]
+    sweep = threading.Thread(target=sweeper)
+    sweep.start()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    stop.set()
+    sweep.join()
+    assert missing == []
@@ -0,0 +1,82 @@
+"""schema_linker — 질문 기반 테이블/컬럼 가지치기"""
+from schema_linker import SchemaLinker, estimate_tokens, split_table_info
+
+
+def _table(name: str, columns: list[str], sample: bool = True) -> str:
+    cols = ",\n".join(f"\t{c} VARCHAR2(20)" for c in columns)
+    block = f"CREATE TABLE {name} (\n{cols}\n)"
+    if sample:
+        block += f"\n\n/*\n1 rows from {name} table:\n" + "\t".join(columns) + "\n" + \
+                 "\t".join(f"v_{c}" for c in columns) + "\n*/"
+    return block
+
+
+_WIDE_COLUMNS = ["ftr_move_std_id", "emp_id", "emp_nm", "age"] + [f"extra_col{i}" for i in range(10)]
+TABLE_INFO = "\n\n".join([
+    _table("ftr_move_std", ["ftr_move_std_id", "std_nm"]),
+    _table("move_item_master", _WIDE_COLUMNS),
+    _table("move_org_master", ["ftr_move_std_id", "org_id", "org_nm"]),
+    _table("move_case_master", ["ftr_move_std_id", "case_id"]),
+    _table("move_case_item", ["ftr_move_std_id", "case_id", "emp_id", "new_org_id"]),
+    _table("move_case_penalty_info", ["ftr_move_std_id", "case_id", "cnst_nm", "penalty_sum"]),
+])
+PROMPT_TEXT = """
+## 테이블
+- ftr_move_std: 이동기준 마스터 (ftr_move_std_id=이동번호 PK, std_nm=이동기준명)
+- move_item_master: 이동대상 직원 (emp_nm=직원명, age=나이)
+- move_org_master: 조직 정보 (org_nm=조직명)
+- move_case_master: 케이스 목록 (case_id=케이스ID)
+- move_case_item: 배치 결과 — 직원별 (new_org_id=새조직ID)
+- move_case_penalty_info: 감점 결과 (cnst_nm=제약조건명, penalty_sum=감점합계)
+
+## 주요 JOIN 패턴
+- move_case_item.emp_id = move_item_master.emp_id
+
+## 규칙
+"""
+
+
+def _linker(**kwargs) -> SchemaLinker:
+    return SchemaLinker(TABLE_INFO, PROMPT_TEXT, **kwargs)
+
+
+def test_split_table_info():
+    assert list(split_table_info(TABLE_INFO)) == [
+        "ftr_move_std", "move_item_master", "move_org_master", "move_case_master", "move_case_item",
+        "move_case_penalty_info",
+    ]
+
+
+def test_prune_selects_matching_tables_with_case_master_and_always_keep():
+    pruned, tables = _linker().prune("제약조건별 감점합계 알려줘")
+    assert tables == ["ftr_move_std", "move_case_master", "move_case_penalty_info"]
+    assert "CREATE TABLE move_org_master" not in pruned
+
+
+def test_prune_adds_join_partner_regardless_of_score():
+    linker = _linker()
+    assert linker.score_tables("새조직ID별 인원")["move_item_master"] == 0
+    pruned, tables = linker.prune("새조직ID별 인원")
+    assert "move_case_item" in tables and "move_item_master" in tables
+    assert "emp_id" in pruned[pruned.index("CREATE TABLE move_item_master"):]  # 조인 키 유지
+
+
+def test_prune_without_match_keeps_all_tables():
+    pruned, tables = _linker().prune("안녕하세요")
+    assert tables == list(split_table_info(TABLE_INFO))
+    assert pruned == "\n\n".join(split_table_info(TABLE_INFO).values())
+
+
+def test_prune_columns_of_wide_table():
+    pruned, _ = _linker(max_columns=5).prune("직원명 목록")
+    block = pruned[pruned.index("CREATE TABLE move_item_master"):]
+    block = block[:block.index("*/")]
+    assert "emp_nm" in block and "emp_id" in block and "ftr_move_std_id" in block
+    assert "extra_col3" not in block
+    # 샘플 행도 같은 컬럼만 남김
+    assert "v_extra_col3" not in block and "v_emp_nm" in block
+
+
+def test_estimate_tokens():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("SELECT 1 FROM dual") > 0
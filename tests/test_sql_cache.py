@@ -0,0 +1,83 @@
+"""sql_cache — 질문 정규화와 LRU/TTL 캐시"""
+import time
+
+import pytest
+
+from sql_cache import LRUTTLCache, normalize_question, split_move_hint
+
+
+# ===== 질문 정규화 =====
+@pytest.mark.parametrize("a, b", [
+    ("직급별 인원수를 구해줘", "직급별 인원수 보여주세요"),
+    ("직급별 인원수를 구해줘!", "직급별   인원수를 구해줘"),
+    ("ＡＢＣ 부서의 인원", "abc 부서 인원"),
+    ("점수 ≥ 80", "점수 >= 80"),
+    ("x <> 1", "x != 1"),
+])
+def test_normalize_same_meaning_shares_key(a, b):
+    assert normalize_question(a) == normalize_question(b)
+
+
+@pytest.mark.parametrize("a, b", [
+    ("점수 >= 80 인 직원", "점수 <= 80 인 직원"),
+    ("점수 > 80 인 직원", "점수 80 인 직원"),
+    ("감점 -5 이하", "감점 5 이하"),
+    ("연봉 1000만 이상", "연봉 1000 이상"),
+    ("평점 4.5", "평점 4 5"),
+    ("비율 10% 이상", "비율 10 이상"),
+])
+def test_normalize_keeps_meaningful_symbols(a, b):
+    assert normalize_question(a) != normalize_question(b)
+
+
+def test_normalize_keeps_unit_after_digit():
+    assert normalize_question("연봉 1000만 이상") == "연봉 1000만 이상"
+    assert normalize_question("평점 4.5 이상인 직원만") == "평점 4.5 이상인 직원"
+
+
+def test_split_move_hint():
+    move, body = split_move_hint("[이동번호(FTR_MOVE_STD_ID)=202401 조건 필수] 직급별 인원")
+    assert (move, body) == ("202401", "직급별 인원")
+    assert split_move_hint("직급별 인원") == ("", "직급별 인원")
+
+
+# ===== LRU/TTL 캐시 =====
+def test_lru_evicts_least_recently_used():
+    cache = LRUTTLCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # a를 최근 사용으로
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_expires_entries():
+    cache = LRUTTLCache(ttl=0.05)
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    time.sleep(0.06)
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_byte_budget_and_on_evict():
+    evicted = []
+    cache = LRUTTLCache(max_bytes=10, sizeof=len, on_evict=lambda k, v: evicted.append(k))
+    cache.set("a", "xxxx")
+    cache.set("b", "xxxx")
+    cache.set("c", "xxxx")
+    assert evicted == ["a"]
+    assert cache.stats()["bytes"] == 8
+    assert cache.set("big", "x" * 11) is False  # 상한보다 큰 값은 저장하지 않음
+    assert cache.get("big") is None
+
+
+def test_snapshot_restore_roundtrip():
+    cache = LRUTTLCache()
+    cache.set("a", 1)
+    cache.set("b", 2, ttl=60)
+    other = LRUTTLCache()
+    other.restore(cache.snapshot())
+    assert other.get("a") == 1 and other.get("b") == 2
@@ -0,0 +1,48 @@
+"""table_render — 열 단위 렌더러 출력이 기존 iterrows() 렌더러와 같은지, 그리드 데이터"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from bench_render import cnst_frame, legacy_cnst_df_to_html, legacy_df_to_html, result_frame
+from table_render import render_cnst_table, render_result_grid, render_result_table, result_grid_payload
+
+
+@pytest.mark.parametrize("df", [
+    result_frame(40, 12),
+    pd.DataFrame({"n": [1, 2, 3], "x": [1.5, np.nan, 3.0]}),  # 숫자만 — 공통 dtype float64
+    pd.DataFrame({"d": pd.to_datetime(["2024-01-01", None])}),
+    pd.DataFrame({"t": ["<b>", "a&b", "x\x00y"]}),  # 이스케이프, 구분자 문자 포함
+])
+def test_render_result_table_matches_legacy(df):
+    assert render_result_table(df) == legacy_df_to_html(df)
+
+
+def test_render_result_table_truncates():
+    df = pd.DataFrame({"a": range(20)})
+    html = render_result_table(df, max_display=5)
+    assert html.count("<tr style=") == 5
+    assert "전체 20건 중 5건 표시" in html
+
+
+def test_render_empty():
+    assert "조회 결과가 없습니다" in render_result_table(pd.DataFrame())
+    assert "조회 결과가 없습니다" in render_result_grid(None)
+    assert "데이터 없음" in render_cnst_table(pd.DataFrame())
+
+
+@pytest.mark.parametrize("kwargs", [
+    {},
+    {"title": "제약조건", "badge_col": "사용여부", "rank_col": True},
+])
+def test_render_cnst_table_matches_legacy(kwargs):
+    df = cnst_frame(30)
+    assert render_cnst_table(df, **kwargs) == legacy_cnst_df_to_html(df, **kwargs)
+
+
+def test_result_grid_payload():
+    df = pd.DataFrame({"name": ["a", None, "c"], "n": [1, 2, 3], "flag": [True, False, True]})
+    payload = result_grid_payload(df, max_display=2)
+    assert payload["columns"] == ["name", "n", "flag"]
+    assert payload["numeric"] == [False, True, False]
+    assert payload["rows"] == [["a", "1", "True"], [None, "2", "False"]]
+    assert (payload["total"], payload["shown"]) == (3, 2)